@@ -34,7 +34,7 @@ from openfermioncirq.primitives.bogoliubov_transform import bogoliubov_transform
 
 from openfermioncirq.primitives.swap_network import swap_network
 
-from openfermioncirq.trotter import simulate_trotter
+from openfermioncirq.trotter import TrotterCircuitTemplate, simulate_trotter
 
 from openfermioncirq.variational import (
     HamiltonianObjective,
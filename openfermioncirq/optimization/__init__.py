@@ -14,15 +14,27 @@
 
 from openfermioncirq.optimization.algorithm import (
     OptimizationAlgorithm,
-    OptimizationParams)
+    OptimizationParams,
+    register_algorithm,
+    registered_algorithm)
 
 from openfermioncirq.optimization.black_box import (
     BlackBox,
+    BudgetExhausted,
+    OptimizationProgress,
     StatefulBlackBox)
 
 from openfermioncirq.optimization.result import (
+    BUDGET_EXHAUSTED,
     OptimizationResult,
-    OptimizationTrialResult)
+    OptimizationTrialResult,
+    SKIPPED)
+
+from openfermioncirq.optimization.bayesian import (
+    GaussianProcessOptimization)
+
+from openfermioncirq.optimization.multi_fidelity import (
+    MultiFidelityPatternSearch)
 
 from openfermioncirq.optimization.scipy import (
     COBYLA,
@@ -12,7 +12,7 @@
 
 """Defines the interface for black box optimization algorithms."""
 
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Type
 
 import numpy
 
@@ -75,6 +75,43 @@ class OptimizationAlgorithm(metaclass=abc.ABCMeta):
         """A name for the optimization algorithm."""
         return type(self).__name__
 
+    def _init_kwargs(self) -> Dict[str, Any]:
+        """Arguments to pass to __init__ when re-loading the algorithm.
+
+        Subclasses that override __init__ may need to override this method for
+        saving and loading to work properly. The values must be serializable
+        to JSON.
+        """
+        return {'options': self.options}
+
+
+_ALGORITHM_REGISTRY = {}  # type: Dict[str, Type[OptimizationAlgorithm]]
+
+
+def register_algorithm(cls: Type[OptimizationAlgorithm]
+                       ) -> Type[OptimizationAlgorithm]:
+    """Register an algorithm class so that it can be saved by name.
+
+    Algorithms are saved by the name of their class together with the output
+    of their `_init_kwargs` method, so a registered class can be moved to
+    another module without invalidating saved files. This function can be
+    used as a class decorator.
+    """
+    _ALGORITHM_REGISTRY[cls.__name__] = cls
+    return cls
+
+
+def registered_algorithm(name: str) -> Type[OptimizationAlgorithm]:
+    """Look up a registered algorithm class by name.
+
+    Raises:
+        KeyError: No algorithm class with the given name was registered.
+    """
+    if name not in _ALGORITHM_REGISTRY:
+        raise KeyError('No optimization algorithm named {} is registered. '
+                       'Use register_algorithm to register it.'.format(name))
+    return _ALGORITHM_REGISTRY[name]
+
 
 class OptimizationParams:
     """Parameters for an optimization run.
@@ -88,15 +125,30 @@ class OptimizationParams:
         cost_of_evaluate: A cost value associated with the `evaluate`
             method of the BlackBox to be optimized. For use with black boxes
             with a noise and cost model.
+        max_evaluations: An optional limit on the number of evaluations of
+            the objective function.
+        max_cost: An optional limit on the total cost spent on evaluations.
+        max_seconds: An optional limit, in seconds, on the wall-clock time
+            of the run.
+
+    The limits are enforced by the BlackBox, so they apply to every
+    algorithm. A run that exhausts its budget returns the best point found so
+    far with status BUDGET_EXHAUSTED.
     """
 
     def __init__(self,
                  algorithm: OptimizationAlgorithm,
                  initial_guess: Optional[numpy.ndarray]=None,
                  initial_guess_array: Optional[numpy.ndarray]=None,
-                 cost_of_evaluate: Optional[float]=None) -> None:
+                 cost_of_evaluate: Optional[float]=None,
+                 max_evaluations: Optional[int]=None,
+                 max_cost: Optional[float]=None,
+                 max_seconds: Optional[float]=None) -> None:
         """Construct a parameters object by setting its attributes."""
         self.algorithm = algorithm
         self.initial_guess = initial_guess
         self.initial_guess_array = initial_guess_array
         self.cost_of_evaluate = cost_of_evaluate
+        self.max_evaluations = max_evaluations
+        self.max_cost = max_cost
+        self.max_seconds = max_seconds
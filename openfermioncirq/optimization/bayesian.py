@@ -0,0 +1,310 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Bayesian optimization with a Gaussian process surrogate model."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy
+import scipy.linalg
+import scipy.optimize
+import scipy.stats
+
+from openfermioncirq.optimization.algorithm import (
+        OptimizationAlgorithm,
+        register_algorithm)
+from openfermioncirq.optimization.black_box import BlackBox
+from openfermioncirq.optimization.result import OptimizationResult
+
+
+@register_algorithm
+class GaussianProcessOptimization(OptimizationAlgorithm):
+    """Bayesian optimization with a Gaussian process surrogate.
+
+    The objective function is modeled by a Gaussian process with a Matern
+    5/2 kernel whose hyperparameters are fit to the evaluations made so far
+    by maximizing the marginal likelihood. The variance of the evaluation
+    noise is derived from the `noise_bounds` of the black box at
+    `cost_of_evaluate`. New points are chosen by maximizing the expected
+    improvement over the lowest predicted value among the evaluated points.
+    This needs far fewer evaluations than local methods on problems with
+    few parameters, at the price of more classical computation per
+    evaluation.
+
+    The search is restricted to the bounds of the black box. If it has
+    none, a box of half-width `radius` around the initial guess is used.
+
+    Points are proposed in batches of `batch_size`. Later points of a batch
+    are chosen as if the earlier ones had evaluated to their predicted
+    values, so the points of a batch do not depend on each other's results
+    and can be evaluated in parallel. `optimize` evaluates them in turn;
+    use `suggest` to evaluate batches elsewhere.
+
+    The options are:
+        max_evaluations: The number of evaluations to make. It is reduced to
+            the number of evaluations left in the evaluation and cost
+            budgets of the black box if these allow fewer. Defaults to
+            those budgets, or to 30 if the black box has neither.
+        num_initial_points: The number of points, including the initial
+            guesses, evaluated before the model is used. Defaults to twice
+            the dimension plus one. Initial guesses that appear more than
+            once are evaluated once.
+        batch_size: The number of points proposed at a time.
+        radius: The half-width of the search box if the black box has no
+            bounds.
+        confidence: The confidence level passed to `noise_bounds`.
+        num_candidates: The number of random points from which the
+            maximization of the expected improvement starts.
+    """
+
+    def default_options(self) -> Dict[str, Any]:
+        return {'max_evaluations': None,
+                'num_initial_points': None,
+                'batch_size': 1,
+                'radius': 1.0,
+                'confidence': 0.95,
+                'num_candidates': 1000}
+
+    def optimize(self,
+                 black_box: BlackBox,
+                 initial_guess: Optional[numpy.ndarray]=None,
+                 initial_guess_array: Optional[numpy.ndarray]=None
+                 ) -> OptimizationResult:
+        options = self.default_options()
+        options.update(self.options)
+        random = numpy.random if black_box.rng is None else black_box.rng
+        dimension = black_box.dimension
+
+        center = (numpy.zeros(dimension) if initial_guess is None
+                  else numpy.asarray(initial_guess, dtype=float))
+        bounds = black_box.bounds
+        if bounds is None:
+            bounds = [(c - options['radius'], c + options['radius'])
+                      for c in center]
+
+        noise_variance = 0.0
+        if black_box.cost_of_evaluate is not None:
+            noise_variance = _noise_variance(black_box,
+                                             black_box.cost_of_evaluate,
+                                             options['confidence'])
+
+        # Start with the initial guesses and random points
+        initial_points = []  # type: List[numpy.ndarray]
+        if initial_guess is not None:
+            initial_points.append(center)
+        if initial_guess_array is not None:
+            for x in numpy.asarray(initial_guess_array, dtype=float):
+                if not any(numpy.array_equal(x, point)
+                           for point in initial_points):
+                    initial_points.append(x)
+        num_initial_points = options['num_initial_points']
+        if num_initial_points is None:
+            num_initial_points = 2 * dimension + 1
+        low, high = numpy.array(bounds, dtype=float).T
+        while len(initial_points) < num_initial_points:
+            initial_points.append(random.uniform(low, high))
+
+        max_evaluations = options['max_evaluations']
+        remaining_evaluations = black_box.remaining_evaluations()
+        if max_evaluations is None:
+            max_evaluations = (30 if remaining_evaluations is None
+                               else remaining_evaluations)
+        elif remaining_evaluations is not None:
+            max_evaluations = min(max_evaluations, remaining_evaluations)
+        # An exhausted budget is reported by the black box
+        max_evaluations = max(max_evaluations, 1)
+        points = []  # type: List[numpy.ndarray]
+        values = []  # type: List[float]
+        for x in initial_points[:max_evaluations]:
+            points.append(x)
+            values.append(black_box.evaluate(x))
+
+        while len(points) < max_evaluations:
+            batch_size = min(options['batch_size'],
+                             max_evaluations - len(points))
+            batch = self.suggest(points, values, bounds, noise_variance,
+                                 batch_size, random)
+            for x in batch:
+                points.append(x)
+                values.append(black_box.evaluate(x))
+
+        # Report the evaluated point with the lowest predicted value
+        if noise_variance > 0:
+            model = _GaussianProcess(bounds)
+            model.fit(numpy.array(points), numpy.array(values),
+                      noise_variance)
+            best = int(numpy.argmin(model.predict(numpy.array(points))[0]))
+        else:
+            best = int(numpy.argmin(values))
+        return OptimizationResult(optimal_value=values[best],
+                                  optimal_parameters=points[best],
+                                  num_evaluations=len(points))
+
+    def suggest(self,
+                points: Sequence[numpy.ndarray],
+                values: Sequence[float],
+                bounds: Sequence[Tuple[float, float]],
+                noise_variance: float=0.0,
+                batch_size: int=1,
+                random: Any=numpy.random) -> List[numpy.ndarray]:
+        """Propose a batch of points to evaluate next.
+
+        Args:
+            points: The points evaluated so far.
+            values: The values of the points evaluated so far.
+            bounds: The bounds of the search box.
+            noise_variance: The variance of the evaluation noise.
+            batch_size: The number of points to propose.
+            random: The numpy.random.Generator or RandomState, or the
+                numpy.random module, used to draw candidate points.
+        """
+        options = self.default_options()
+        options.update(self.options)
+        model = _GaussianProcess(bounds)
+        model.fit(numpy.array(points), numpy.array(values), noise_variance)
+
+        batch = []  # type: List[numpy.ndarray]
+        for _ in range(batch_size):
+            x = model.maximize_expected_improvement(
+                    options['num_candidates'], random)
+            batch.append(x)
+            # Believe the prediction so that the next point goes elsewhere
+            model.condition(x, model.predict(x[numpy.newaxis])[0][0])
+        return batch
+
+
+class _GaussianProcess:
+    """A Gaussian process with a Matern 5/2 kernel on a box.
+
+    Inputs are scaled to the unit cube and outputs are standardized before
+    fitting.
+    """
+
+    def __init__(self, bounds: Sequence[Tuple[float, float]]) -> None:
+        self.low, self.high = numpy.array(bounds, dtype=float).T
+        self.scale = numpy.where(self.high > self.low,
+                                 self.high - self.low, 1.0)
+
+    def fit(self,
+            points: numpy.ndarray,
+            values: numpy.ndarray,
+            noise_variance: float) -> None:
+        self.y_mean = numpy.mean(values)
+        self.y_std = numpy.std(values) or 1.0
+        self.noise = noise_variance / self.y_std**2 + 1e-8
+        self.x = self._unit(points)
+        self.y = (values - self.y_mean) / self.y_std
+
+        dimension = self.x.shape[1]
+        results = [
+                scipy.optimize.minimize(
+                    self._negative_log_likelihood,
+                    numpy.log([1.0] + [length_scale] * dimension),
+                    method='L-BFGS-B',
+                    bounds=[(numpy.log(1e-2), numpy.log(1e2))] +
+                           [(numpy.log(1e-2), numpy.log(1e1))] * dimension)
+                for length_scale in (0.2, 0.5)]
+        self.log_params = min(results, key=lambda result: result.fun).x
+        self._factorize()
+
+    def condition(self, point: numpy.ndarray, value: float) -> None:
+        """Add an observation without refitting the hyperparameters."""
+        self.x = numpy.vstack([self.x, self._unit(point[numpy.newaxis])])
+        self.y = numpy.append(self.y, (value - self.y_mean) / self.y_std)
+        self._factorize()
+
+    def predict(self, points: numpy.ndarray
+                ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """The mean and standard deviation of the model at some points."""
+        k = self._kernel(self._unit(points), self.x, self.log_params)
+        mean = k.dot(self.alpha)
+        v = scipy.linalg.solve_triangular(self.cholesky, k.T, lower=True)
+        variance = numpy.exp(self.log_params[0]) - numpy.sum(v**2, axis=0)
+        std = numpy.sqrt(numpy.maximum(variance, 1e-12))
+        return self.y_mean + self.y_std * mean, self.y_std * std
+
+    def maximize_expected_improvement(self,
+                                      num_candidates: int,
+                                      random: Any) -> numpy.ndarray:
+        candidates = self.low + self.scale * random.uniform(
+                size=(num_candidates, len(self.low)))
+        improvement = self._expected_improvement(candidates)
+
+        # Polish the most promising candidates with a local optimizer
+        best_x = candidates[numpy.argmax(improvement)]
+        best_improvement = numpy.max(improvement)
+        for start in candidates[numpy.argsort(improvement)[-3:]]:
+            result = scipy.optimize.minimize(
+                    lambda x: -self._expected_improvement(
+                        x[numpy.newaxis])[0],
+                    start,
+                    method='L-BFGS-B',
+                    bounds=list(zip(self.low, self.high)))
+            if -result.fun > best_improvement:
+                best_x, best_improvement = result.x, -result.fun
+        return numpy.clip(best_x, self.low, self.high)
+
+    def _expected_improvement(self, points: numpy.ndarray) -> numpy.ndarray:
+        mean, std = self.predict(points)
+        z = (self.incumbent - mean) / std
+        return ((self.incumbent - mean) * scipy.stats.norm.cdf(z) +
+                std * scipy.stats.norm.pdf(z))
+
+    def _factorize(self) -> None:
+        k = self._kernel(self.x, self.x, self.log_params)
+        k[numpy.diag_indices_from(k)] += self.noise
+        self.cholesky = numpy.linalg.cholesky(k)
+        self.alpha = scipy.linalg.cho_solve((self.cholesky, True), self.y)
+        # The lowest mean at the observed points, which is their value minus
+        # the noise term of the factorized kernel
+        self.incumbent = self.y_mean + self.y_std * numpy.min(
+                self.y - self.noise * self.alpha)
+
+    def _negative_log_likelihood(self, log_params: numpy.ndarray) -> float:
+        k = self._kernel(self.x, self.x, log_params)
+        k[numpy.diag_indices_from(k)] += self.noise
+        try:
+            cholesky = numpy.linalg.cholesky(k)
+        except numpy.linalg.LinAlgError:
+            return 1e10
+        alpha = scipy.linalg.cho_solve((cholesky, True), self.y)
+        return (0.5 * self.y.dot(alpha) +
+                numpy.sum(numpy.log(numpy.diag(cholesky))))
+
+    def _unit(self, points: numpy.ndarray) -> numpy.ndarray:
+        return (points - self.low) / self.scale
+
+    @staticmethod
+    def _kernel(a: numpy.ndarray,
+                b: numpy.ndarray,
+                log_params: numpy.ndarray) -> numpy.ndarray:
+        signal_variance = numpy.exp(log_params[0])
+        length_scales = numpy.exp(log_params[1:])
+        difference = (a[:, numpy.newaxis, :] - b[numpy.newaxis, :, :]
+                      ) / length_scales
+        r = numpy.sqrt(5 * numpy.sum(difference**2, axis=-1))
+        return signal_variance * (1 + r + r**2 / 3) * numpy.exp(-r)
+
+
+def _noise_variance(black_box: BlackBox,
+                    cost: float,
+                    confidence: float) -> float:
+    """The noise variance implied by the noise bounds of a black box.
+
+    The bounds are taken to be a symmetric confidence interval of a normal
+    distribution. Returns 0 if the bounds are not finite.
+    """
+    low, high = black_box.noise_bounds(cost, confidence)
+    if not numpy.isfinite(high - low):
+        return 0.0
+    z = scipy.stats.norm.ppf(0.5 + 0.5 * confidence)
+    return ((high - low) / (2 * z))**2
@@ -0,0 +1,145 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Optional, Sequence, Tuple
+
+import numpy
+import scipy.stats
+
+from openfermioncirq.optimization import (
+        COBYLA,
+        GaussianProcessOptimization,
+        StatefulBlackBox)
+from openfermioncirq.testing import ExampleBlackBox, ExampleStatefulBlackBox
+
+
+class BoundedBlackBox(ExampleStatefulBlackBox):
+    """A shifted quadratic on a box."""
+
+    @property
+    def bounds(self) -> Optional[Sequence[Tuple[float, float]]]:
+        return [(-1.0, 2.0), (-2.0, 1.0)]
+
+    def _evaluate(self,
+                  x: numpy.ndarray) -> float:
+        return numpy.sum((x - numpy.array([0.7, -0.4]))**2)
+
+
+class ShotNoiseBlackBox(ExampleBlackBox, StatefulBlackBox):
+    """A quadratic with Gaussian noise of variance 1 / cost."""
+
+    def _evaluate_with_cost(self,
+                            x: numpy.ndarray,
+                            cost: float) -> float:
+        return self._evaluate(x) + self.rng.normal(scale=cost**-0.5)
+
+    def noise_bounds(self,
+                     cost: float,
+                     confidence: Optional[float]=None
+                     ) -> Tuple[float, float]:
+        z = scipy.stats.norm.ppf(0.5 + 0.5 * (confidence or 0.99))
+        return -z * cost**-0.5, z * cost**-0.5
+
+
+def test_gaussian_process_optimization_uses_few_evaluations():
+    algorithm = GaussianProcessOptimization(options={'max_evaluations': 20})
+    black_box = BoundedBlackBox(rng=numpy.random.RandomState(7))
+    result = algorithm.optimize(black_box, numpy.array([1.5, 0.5]))
+
+    assert result.num_evaluations == black_box.num_evaluations == 20
+    assert result.optimal_value < 1e-2
+    for (low, high), x in zip(black_box.bounds,
+                              result.optimal_parameters):
+        assert low <= x <= high
+
+    # COBYLA needs more evaluations to get as close
+    cobyla_black_box = BoundedBlackBox()
+    COBYLA.optimize(cobyla_black_box, numpy.array([1.5, 0.5]))
+    cobyla_values = [value for value, _, _
+                     in cobyla_black_box.function_values]
+    assert next(i for i, value in enumerate(cobyla_values)
+                if value <= result.optimal_value) + 1 > 20
+
+
+def test_gaussian_process_optimization_with_noise():
+    algorithm = GaussianProcessOptimization(options={'max_evaluations': 25})
+    black_box = ShotNoiseBlackBox(cost_of_evaluate=100.0,
+                                  rng=numpy.random.RandomState(3))
+    result = algorithm.optimize(black_box, numpy.array([0.5, -0.5]))
+
+    assert result.num_evaluations == 25
+    assert numpy.linalg.norm(result.optimal_parameters) < 0.3
+
+
+def test_gaussian_process_optimization_suggests_batches():
+    algorithm = GaussianProcessOptimization()
+    bounds = [(-1.0, 1.0), (-1.0, 1.0)]
+    rng = numpy.random.RandomState(11)
+    points = [rng.uniform(-1, 1, 2) for _ in range(6)]
+    values = [numpy.sum(x**2) for x in points]
+
+    batch = algorithm.suggest(points, values, bounds, batch_size=4,
+                              random=rng)
+
+    assert len(batch) == 4
+    for x in batch:
+        assert numpy.all(x >= -1.0) and numpy.all(x <= 1.0)
+    for i in range(4):
+        for j in range(i):
+            assert numpy.linalg.norm(batch[i] - batch[j]) > 1e-3
+
+
+def test_gaussian_process_optimization_in_batches_without_bounds():
+    algorithm = GaussianProcessOptimization(options={'max_evaluations': 12,
+                                                     'num_initial_points': 4,
+                                                     'batch_size': 3,
+                                                     'radius': 0.5})
+    black_box = ExampleStatefulBlackBox(rng=numpy.random.RandomState(5))
+    result = algorithm.optimize(
+            black_box,
+            initial_guess_array=numpy.array([[0.1, 0.2], [-0.2, 0.1]]))
+
+    assert result.num_evaluations == 12
+    assert numpy.all(numpy.abs(result.optimal_parameters) <= 0.5)
+    assert result.optimal_value < 0.05
+
+
+def test_gaussian_process_optimization_uses_black_box_budget():
+    algorithm = GaussianProcessOptimization(options={'num_initial_points': 3})
+    black_box = BoundedBlackBox(max_evaluations=8,
+                                rng=numpy.random.RandomState(13))
+    result = algorithm.optimize(black_box, numpy.array([0.0, 0.0]))
+    assert result.num_evaluations == black_box.num_evaluations == 8
+
+    # The option cannot exceed the budget
+    algorithm = GaussianProcessOptimization(options={'max_evaluations': 20,
+                                                     'num_initial_points': 3})
+    black_box = BoundedBlackBox(cost_of_evaluate=2.0,
+                                max_cost=15.0,
+                                rng=numpy.random.RandomState(13))
+    result = algorithm.optimize(black_box, numpy.array([0.0, 0.0]))
+    assert result.num_evaluations == black_box.num_evaluations == 7
+
+
+def test_gaussian_process_optimization_evaluates_initial_guess_once():
+    algorithm = GaussianProcessOptimization(options={'max_evaluations': 4,
+                                                     'num_initial_points': 4})
+    black_box = BoundedBlackBox(save_x_vals=True,
+                                rng=numpy.random.RandomState(17))
+    initial_guess = numpy.array([0.5, 0.5])
+    algorithm.optimize(black_box,
+                       initial_guess,
+                       numpy.array([initial_guess, [1.0, -1.0]]))
+
+    evaluated = [tuple(x) for _, _, x in black_box.function_values]
+    assert evaluated[:2] == [(0.5, 0.5), (1.0, -1.0)]
+    assert len(set(evaluated)) == 4
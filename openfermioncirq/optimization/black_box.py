@@ -12,7 +12,7 @@
 
 """Defines the interface for a black box objective function."""
 
-from typing import Optional, Sequence, TYPE_CHECKING, Tuple
+from typing import Callable, Optional, Sequence, TYPE_CHECKING, Tuple
 
 import time
 
@@ -25,6 +25,34 @@ if TYPE_CHECKING:
     from typing import List
 
 
+class BudgetExhausted(Exception):
+    """Raised by a BlackBox when a query would exceed its budget.
+
+    The exception carries the best point found before the budget ran out, so
+    that whoever catches it can still report a result.
+
+    Attributes:
+        optimal_value: The lowest function value returned by the black box
+            so far, or infinity if no evaluations were made.
+        optimal_parameters: The input that produced `optimal_value`, or None
+            if no evaluations were made.
+        num_evaluations: The number of evaluations made by the black box.
+        cost_spent: The total cost spent on evaluations.
+    """
+
+    def __init__(self,
+                 message: str,
+                 optimal_value: float,
+                 optimal_parameters: Optional[numpy.ndarray],
+                 num_evaluations: int,
+                 cost_spent: float) -> None:
+        super().__init__(message)
+        self.optimal_value = optimal_value
+        self.optimal_parameters = optimal_parameters
+        self.num_evaluations = num_evaluations
+        self.cost_spent = cost_spent
+
+
 class BlackBox(metaclass=abc.ABCMeta):
     """A black box objective function.
 
@@ -48,18 +76,47 @@ class BlackBox(metaclass=abc.ABCMeta):
             should be equal to the dimension of the black box.
         cost_of_evaluate: If specified, then calls to `evaluate` will be
             redirected to `evaluate_with_cost` with the specified cost.
+        max_evaluations: An optional limit on the number of evaluations.
+        max_cost: An optional limit on the total cost of evaluations.
+        max_seconds: An optional limit on the wall-clock time, in seconds,
+            measured from the first query to the black box.
+        rng: An optional numpy.random.Generator, or a RandomState with numpy
+            older than 1.17. Algorithms and noise models should draw random
+            numbers from it, or from numpy's global random state if it is
+            None.
+
+    When a query would exceed one of the limits, the black box raises
+    BudgetExhausted instead of evaluating the objective function.
     """
 
     def __init__(self,
                  cost_of_evaluate: Optional[float]=None,
+                 max_evaluations: Optional[int]=None,
+                 max_cost: Optional[float]=None,
+                 max_seconds: Optional[float]=None,
+                 rng: Optional['numpy.random.Generator']=None,
                  **kwargs) -> None:
         """
         Args:
             cost_of_evaluate: An optional cost associated with the
                 `evaluate` method. If specified, the `evaluate` method
                 will defer to `evaluate_with_cost` with the specified cost.
+            max_evaluations: An optional limit on the number of evaluations.
+            max_cost: An optional limit on the total cost of evaluations.
+            max_seconds: An optional limit on the wall-clock time, in
+                seconds, measured from the first query to the black box.
+            rng: An optional random number generator for the optimization.
         """
         self.cost_of_evaluate = cost_of_evaluate
+        self.max_evaluations = max_evaluations
+        self.max_cost = max_cost
+        self.max_seconds = max_seconds
+        self.rng = rng
+        self._budget_evaluations = 0
+        self._budget_cost = 0.0
+        self._budget_start_time = None  # type: Optional[float]
+        self._best_value = numpy.inf
+        self._best_parameters = None  # type: Optional[numpy.ndarray]
 
     @abc.abstractproperty
     def dimension(self) -> int:
@@ -100,7 +157,10 @@ class BlackBox(metaclass=abc.ABCMeta):
         """Evaluate the objective function."""
         if self.cost_of_evaluate is not None:
             return self.evaluate_with_cost(x, self.cost_of_evaluate)
-        return self._evaluate(x)
+        self._check_budget(0.0)
+        val = self._evaluate(x)
+        self._update_budget(x, val, 0.0)
+        return val
 
     def evaluate_with_cost(self,
                            x: numpy.ndarray,
@@ -110,7 +170,65 @@ class BlackBox(metaclass=abc.ABCMeta):
         This is used to model situations in which it is possible to reduce the
         magnitude of the noise at some cost.
         """
-        return self._evaluate_with_cost(x, cost)
+        self._check_budget(cost)
+        val = self._evaluate_with_cost(x, cost)
+        self._update_budget(x, val, cost)
+        return val
+
+    def remaining_evaluations(self) -> Optional[int]:
+        """The number of evaluations left in the evaluation and cost budgets.
+
+        Evaluations are assumed to have cost `cost_of_evaluate`. Returns None
+        if neither budget limits the number of evaluations. The time budget
+        is not taken into account.
+        """
+        remaining = None  # type: Optional[int]
+        if self.max_evaluations is not None:
+            remaining = max(self.max_evaluations - self._budget_evaluations,
+                            0)
+        if self.max_cost is not None and self.cost_of_evaluate:
+            affordable = max(int((self.max_cost - self._budget_cost) //
+                                 self.cost_of_evaluate), 0)
+            remaining = (affordable if remaining is None
+                         else min(remaining, affordable))
+        return remaining
+
+    def _check_budget(self, cost: float) -> None:
+        """Raise BudgetExhausted if a query with the given cost exceeds a limit.
+        """
+        if self._budget_start_time is None:
+            self._budget_start_time = time.time()
+
+        reason = None
+        if (self.max_evaluations is not None and
+                self._budget_evaluations >= self.max_evaluations):
+            reason = 'Evaluation budget of {} exhausted.'.format(
+                    self.max_evaluations)
+        elif (self.max_cost is not None and
+                self._budget_cost + cost > self.max_cost):
+            reason = 'Cost budget of {} exhausted.'.format(self.max_cost)
+        elif (self.max_seconds is not None and
+                time.time() - self._budget_start_time > self.max_seconds):
+            reason = 'Time budget of {} seconds exhausted.'.format(
+                    self.max_seconds)
+
+        if reason is not None:
+            raise BudgetExhausted(reason,
+                                  self._best_value,
+                                  self._best_parameters,
+                                  self._budget_evaluations,
+                                  self._budget_cost)
+
+    def _update_budget(self,
+                       x: numpy.ndarray,
+                       val: float,
+                       cost: float) -> None:
+        """Record an evaluation against the budget and the best point."""
+        self._budget_evaluations += 1
+        self._budget_cost += cost
+        if val < self._best_value:
+            self._best_value = val
+            self._best_parameters = numpy.array(x, copy=True)
 
     def noise_bounds(self,
                      cost: float,
@@ -133,6 +251,38 @@ class BlackBox(metaclass=abc.ABCMeta):
         return -numpy.inf, numpy.inf
 
 
+class OptimizationProgress:
+    """A snapshot of the progress of an optimization.
+
+    Reported periodically by a StatefulBlackBox with a progress callback.
+
+    Attributes:
+        num_evaluations: The number of evaluations made so far.
+        optimal_value: The lowest function value returned so far.
+        cost_spent: The total cost spent on evaluations so far.
+        evaluations_per_second: The number of evaluations divided by the
+            time elapsed since the first query.
+        evaluation_time: The total time spent evaluating the objective
+            function, e.g., in a simulator.
+        wait_time: The total time spent between queries, i.e., in the
+            optimizer.
+    """
+
+    def __init__(self,
+                 num_evaluations: int,
+                 optimal_value: float,
+                 cost_spent: float,
+                 evaluations_per_second: float,
+                 evaluation_time: float,
+                 wait_time: float) -> None:
+        self.num_evaluations = num_evaluations
+        self.optimal_value = optimal_value
+        self.cost_spent = cost_spent
+        self.evaluations_per_second = evaluations_per_second
+        self.evaluation_time = evaluation_time
+        self.wait_time = wait_time
+
+
 class StatefulBlackBox(BlackBox):
     """A black box function with memory of evaluations.
 
@@ -155,10 +305,15 @@ class StatefulBlackBox(BlackBox):
         wait_times: A list of floats. The i-th float float represents the time
             elapsed between the i-th and (i+1)-th times that the black box
             was queried. Time is recorded using ``time.time()``.
+        evaluation_time: The total time spent evaluating the objective
+            function.
     """
 
     def __init__(self,
                  save_x_vals: bool=False,
+                 progress_callback: Optional[
+                     Callable[[OptimizationProgress], None]]=None,
+                 progress_interval: int=1,
                  **kwargs) -> None:
         """
         Args:
@@ -167,17 +322,25 @@ class StatefulBlackBox(BlackBox):
                 black box to consume a lot more memory. This does not affect
                 whether the function values (y values) are saved (they are
                 saved no matter what).
+            progress_callback: An optional function that is called with an
+                OptimizationProgress every `progress_interval` evaluations.
+            progress_interval: The number of evaluations between calls to
+                `progress_callback`.
         """
         self.function_values = [] \
             # type: List[Tuple[float, Optional[float], Optional[numpy.ndarray]]]
         self.cost_spent = 0.0
         self.wait_times = []  # type: List[float]
+        self.evaluation_time = 0.0
+        self._wait_time = 0.0
         self._save_x_vals = save_x_vals
         self._time_of_last_query = None  # type: Optional[float]
+        self._progress_callback = progress_callback
+        self._progress_interval = progress_interval
         super().__init__(**kwargs)
 
     @property
-    def num_evaluations(self) -> float:
+    def num_evaluations(self) -> int:
         """The number of times the objective function has been evaluated."""
         return len(self.function_values)
 
@@ -188,27 +351,58 @@ class StatefulBlackBox(BlackBox):
         if self.cost_of_evaluate is not None:
             return self.evaluate_with_cost(x, self.cost_of_evaluate)
 
+        self._check_budget(0.0)
+        query_time = time.time()
         if self._time_of_last_query is not None:
-            self.wait_times.append(time.time() - self._time_of_last_query)
+            self.wait_times.append(query_time - self._time_of_last_query)
+            self._wait_time += self.wait_times[-1]
 
         val = self._evaluate(x)
+        self._time_of_last_query = time.time()
+        self.evaluation_time += self._time_of_last_query - query_time
         self.function_values.append(
                 (val, None, x if self._save_x_vals else None)
         )
-        self._time_of_last_query = time.time()
+        self._update_budget(x, val, 0.0)
+        self._maybe_report_progress()
         return val
 
     def evaluate_with_cost(self,
                            x: numpy.ndarray,
                            cost: float) -> float:
         """Evaluate the objective function with a cost and update state."""
+        self._check_budget(cost)
+        query_time = time.time()
         if self._time_of_last_query is not None:
-            self.wait_times.append(time.time() - self._time_of_last_query)
+            self.wait_times.append(query_time - self._time_of_last_query)
+            self._wait_time += self.wait_times[-1]
 
         val = self._evaluate_with_cost(x, cost)
+        self._time_of_last_query = time.time()
+        self.evaluation_time += self._time_of_last_query - query_time
         self.function_values.append(
                 (val, cost, x if self._save_x_vals else None)
         )
+        self._update_budget(x, val, cost)
         self.cost_spent += cost
-        self._time_of_last_query = time.time()
+        self._maybe_report_progress()
         return val
+
+    def progress(self) -> OptimizationProgress:
+        """The current progress of the optimization."""
+        elapsed = 0.0
+        if self._budget_start_time is not None:
+            elapsed = time.time() - self._budget_start_time
+        return OptimizationProgress(
+                num_evaluations=self.num_evaluations,
+                optimal_value=self._best_value,
+                cost_spent=self.cost_spent,
+                evaluations_per_second=(
+                    self.num_evaluations / elapsed if elapsed > 0 else 0.0),
+                evaluation_time=self.evaluation_time,
+                wait_time=self._wait_time)
+
+    def _maybe_report_progress(self) -> None:
+        if (self._progress_callback is not None and
+                self.num_evaluations % self._progress_interval == 0):
+            self._progress_callback(self.progress())
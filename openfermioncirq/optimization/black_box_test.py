@@ -10,10 +10,15 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import time
+
 import numpy
 import pytest
 
-from openfermioncirq.optimization.black_box import BlackBox, StatefulBlackBox
+from openfermioncirq.optimization.black_box import (
+        BlackBox,
+        BudgetExhausted,
+        StatefulBlackBox)
 from openfermioncirq.testing import (
         ExampleBlackBox,
         ExampleBlackBoxNoisy,
@@ -92,6 +97,61 @@ def test_stateful_black_box_save_x_vals():
     assert isinstance(x, numpy.ndarray)
 
 
+def test_black_box_max_evaluations():
+    black_box = ExampleBlackBox(max_evaluations=2)
+    _ = black_box.evaluate(numpy.array([1.0, 2.0]))
+    _ = black_box.evaluate(numpy.array([0.5, 0.0]))
+    with pytest.raises(BudgetExhausted) as exc_info:
+        _ = black_box.evaluate(numpy.array([0.0, 0.0]))
+
+    assert exc_info.value.optimal_value == 0.25
+    numpy.testing.assert_allclose(exc_info.value.optimal_parameters,
+                                  numpy.array([0.5, 0.0]))
+    assert exc_info.value.num_evaluations == 2
+    assert exc_info.value.cost_spent == 0.0
+
+
+def test_black_box_max_cost():
+    black_box = ExampleStatefulBlackBox(max_cost=2.5)
+    _ = black_box.evaluate_with_cost(numpy.array([1.0, 2.0]), 1.0)
+    _ = black_box.evaluate_with_cost(numpy.array([1.0, 1.0]), 1.0)
+    with pytest.raises(BudgetExhausted) as exc_info:
+        _ = black_box.evaluate_with_cost(numpy.array([0.0, 0.0]), 1.0)
+
+    assert exc_info.value.optimal_value == 2.0
+    assert exc_info.value.cost_spent == 2.0
+    assert black_box.num_evaluations == 2
+
+
+def test_black_box_max_seconds():
+    black_box = ExampleBlackBox(max_seconds=0.05)
+    _ = black_box.evaluate(numpy.array([1.0, 2.0]))
+    time.sleep(0.1)
+    with pytest.raises(BudgetExhausted) as exc_info:
+        _ = black_box.evaluate(numpy.array([1.0, 2.0]))
+
+    assert exc_info.value.num_evaluations == 1
+
+
+def test_stateful_black_box_progress_callback():
+    reports = []
+    black_box = ExampleStatefulBlackBox(progress_callback=reports.append,
+                                        progress_interval=2)
+    _ = black_box.evaluate(numpy.array([1.0, 2.0]))
+    _ = black_box.evaluate(numpy.array([1.0, 0.0]))
+    _ = black_box.evaluate_with_cost(numpy.array([2.0, 0.0]), 1.5)
+    _ = black_box.evaluate_with_cost(numpy.array([3.0, 0.0]), 1.5)
+
+    assert [r.num_evaluations for r in reports] == [2, 4]
+    assert [r.optimal_value for r in reports] == [1.0, 1.0]
+    assert [r.cost_spent for r in reports] == [0.0, 3.0]
+    for report in reports:
+        assert report.evaluations_per_second >= 0.0
+        assert 0.0 <= report.evaluation_time <= black_box.evaluation_time
+        assert report.wait_time >= 0.0
+    assert reports[-1].wait_time == sum(black_box.wait_times)
+
+
 def test_black_box_is_abstract_must_implement():
     class Missing1(BlackBox):
         @property
@@ -0,0 +1,155 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""A pattern search that adapts the cost of evaluations to its step size."""
+
+from typing import Any, Dict, List, Optional
+
+import numpy
+
+from openfermioncirq.optimization.algorithm import (
+        OptimizationAlgorithm,
+        register_algorithm)
+from openfermioncirq.optimization.black_box import BlackBox
+from openfermioncirq.optimization.result import OptimizationResult
+
+
+@register_algorithm
+class MultiFidelityPatternSearch(OptimizationAlgorithm):
+    """A compass search that raises the cost of evaluations as it converges.
+
+    The algorithm polls the points at a distance `step` from the current
+    point along each coordinate axis, using `evaluate_with_cost`, and moves
+    to the first point that improves on the current value by more than the
+    width of the noise interval given by `noise_bounds`. When the polled
+    points are all worse than the current point by more than that width,
+    the step is shrunk. Otherwise the poll was inconclusive, so the cost is
+    raised and the current point re-evaluated at the new cost; the step is
+    only shrunk if the cost cannot be raised further. Far from the optimum
+    the differences between function values are large and cheap, noisy
+    evaluations suffice. The cost rises as the step shrinks and the
+    differences become comparable to the noise, so the final precision is
+    set by `min_step` and `max_cost_per_evaluation`.
+
+    If the black box has no finite noise bounds, the noise is treated as
+    zero and the cost stays at its initial value.
+
+    The options are:
+        initial_step: The initial step size.
+        min_step: The step size below which the search stops.
+        shrink: The factor by which the step is multiplied after a poll
+            without improvement.
+        initial_cost: The cost of the first evaluations.
+        max_cost_per_evaluation: An optional limit on the cost of a single
+            evaluation.
+        cost_growth: The factor by which the cost is multiplied when it is
+            raised.
+        confidence: The confidence level passed to `noise_bounds`.
+        max_iterations: The maximum number of polls.
+    """
+
+    def default_options(self) -> Dict[str, Any]:
+        return {'initial_step': 0.1,
+                'min_step': 1e-4,
+                'shrink': 0.5,
+                'initial_cost': 1.0,
+                'max_cost_per_evaluation': None,
+                'cost_growth': 2.0,
+                'confidence': 0.95,
+                'max_iterations': 1000}
+
+    def optimize(self,
+                 black_box: BlackBox,
+                 initial_guess: Optional[numpy.ndarray]=None,
+                 initial_guess_array: Optional[numpy.ndarray]=None
+                 ) -> OptimizationResult:
+        if initial_guess is None:
+            raise ValueError('The chosen optimization algorithm requires an '
+                             'initial guess.')
+        options = self.default_options()
+        options.update(self.options)
+        max_cost = options['max_cost_per_evaluation']
+        bounds = black_box.bounds
+
+        cost = float(options['initial_cost'])
+        step = float(options['initial_step'])
+        x = numpy.array(initial_guess, dtype=float)
+        num_evaluations = 1
+        cost_spent = cost
+        fx = black_box.evaluate_with_cost(x, cost)
+
+        iteration = 0
+        while (step >= options['min_step'] and
+                iteration < options['max_iterations']):
+            iteration += 1
+            width = _noise_width(black_box, cost, options['confidence'])
+            differences = []  # type: List[float]
+            improved = False
+            for i in range(len(x)):
+                for sign in (1, -1):
+                    y = x.copy()
+                    y[i] += sign * step
+                    if bounds is not None:
+                        y[i] = numpy.clip(y[i], *bounds[i])
+                    if y[i] == x[i]:
+                        continue
+                    fy = black_box.evaluate_with_cost(y, cost)
+                    num_evaluations += 1
+                    cost_spent += cost
+                    differences.append(fy - fx)
+                    if fy < fx - width:
+                        x, fx = y, fy
+                        improved = True
+                        break
+            if improved:
+                continue
+
+            if all(difference > width for difference in differences):
+                # The polled points are resolved to be worse
+                step *= options['shrink']
+                continue
+            # The poll was inconclusive, so resolve smaller differences
+            new_cost = cost * options['cost_growth']
+            if max_cost is not None:
+                new_cost = min(new_cost, max_cost)
+            if (new_cost > cost and _noise_width(
+                    black_box, new_cost, options['confidence']) < width):
+                cost = new_cost
+                fx = black_box.evaluate_with_cost(x, cost)
+                num_evaluations += 1
+                cost_spent += cost
+            else:
+                step *= options['shrink']
+
+        converged = step < options['min_step']
+        return OptimizationResult(
+                optimal_value=fx,
+                optimal_parameters=x,
+                num_evaluations=num_evaluations,
+                cost_spent=cost_spent,
+                status=0 if converged else 1,
+                message='{} after {} polls with a final cost per evaluation '
+                        'of {} and an average cost of {}.'.format(
+                            'Converged' if converged
+                            else 'Reached the maximum number of iterations',
+                            iteration,
+                            cost,
+                            cost_spent / num_evaluations))
+
+
+def _noise_width(black_box: BlackBox,
+                 cost: float,
+                 confidence: float) -> float:
+    """The width of the noise interval, or 0 if it is unbounded."""
+    low, high = black_box.noise_bounds(cost, confidence)
+    width = high - low
+    return width if numpy.isfinite(width) else 0.0
@@ -0,0 +1,85 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Optional, Tuple
+
+import numpy
+import pytest
+import scipy.stats
+
+from openfermioncirq.optimization import (
+        MultiFidelityPatternSearch,
+        StatefulBlackBox)
+from openfermioncirq.testing import ExampleBlackBox, ExampleStatefulBlackBox
+
+
+class ShotNoiseBlackBox(ExampleBlackBox, StatefulBlackBox):
+    """A quadratic with Gaussian noise of variance 1 / cost."""
+
+    def _evaluate_with_cost(self,
+                            x: numpy.ndarray,
+                            cost: float) -> float:
+        return self._evaluate(x) + self.rng.normal(scale=cost**-0.5)
+
+    def noise_bounds(self,
+                     cost: float,
+                     confidence: Optional[float]=None
+                     ) -> Tuple[float, float]:
+        z = scipy.stats.norm.ppf(0.5 + 0.5 * (confidence or 0.99))
+        return -z * cost**-0.5, z * cost**-0.5
+
+
+def test_multi_fidelity_pattern_search_raises_cost_as_it_converges():
+    algorithm = MultiFidelityPatternSearch(options={'initial_step': 0.5,
+                                                    'min_step': 0.01})
+    black_box = ShotNoiseBlackBox(rng=numpy.random.RandomState(42))
+    result = algorithm.optimize(black_box, numpy.array([2.0, -1.5]))
+
+    assert result.status == 0
+    assert numpy.linalg.norm(result.optimal_parameters) < 0.05
+    assert result.num_evaluations == black_box.num_evaluations
+    assert result.cost_spent == black_box.cost_spent
+    costs = [cost for _, cost, _ in black_box.function_values]
+    assert costs == sorted(costs)
+    assert costs[0] == 1.0
+    assert costs[-1] > 1000.0
+
+    # Spending the final cost on every evaluation is much more expensive
+    fixed_cost = MultiFidelityPatternSearch(options={
+        'initial_step': 0.5,
+        'min_step': 0.01,
+        'initial_cost': costs[-1],
+        'max_cost_per_evaluation': costs[-1]})
+    fixed_black_box = ShotNoiseBlackBox(rng=numpy.random.RandomState(42))
+    fixed_result = fixed_cost.optimize(fixed_black_box,
+                                       numpy.array([2.0, -1.5]))
+    assert result.cost_spent < 0.5 * fixed_result.cost_spent
+
+
+def test_multi_fidelity_pattern_search_without_noise_model():
+    algorithm = MultiFidelityPatternSearch(options={'max_iterations': 5})
+    black_box = ExampleStatefulBlackBox()
+    result = algorithm.optimize(black_box, numpy.array([0.35, 0.0]))
+
+    assert result.status == 1
+    assert result.optimal_value < 0.35**2
+    assert {cost for _, cost, _ in black_box.function_values} == {1.0}
+
+    result = MultiFidelityPatternSearch().optimize(black_box,
+                                                   numpy.array([0.35, 0.0]))
+    assert result.status == 0
+    assert result.optimal_value < 1e-6
+
+
+def test_multi_fidelity_pattern_search_requires_initial_guess():
+    with pytest.raises(ValueError):
+        MultiFidelityPatternSearch().optimize(ExampleBlackBox())
@@ -12,16 +12,26 @@
 
 """Classes for storing the results of running an optimization algorithm."""
 
-from typing import Iterable, List, Optional, TYPE_CHECKING, Tuple
+from typing import Iterable, List, Optional, TYPE_CHECKING, Tuple, Union
 
 import numpy
-import pandas
 
 if TYPE_CHECKING:
     # pylint: disable=unused-import
+    import pandas
     from openfermioncirq.optimization.algorithm import OptimizationParams
 
 
+BUDGET_EXHAUSTED = 'budget exhausted'
+"""Status of a result whose run was stopped by an evaluation budget."""
+
+SKIPPED = 'skipped'
+"""Status of a result whose run was skipped because a target was reached.
+
+Skipped results have an optimal value of NaN and no optimal parameters.
+"""
+
+
 class OptimizationResult:
     """A result from optimizing a black-box objective function.
 
@@ -45,7 +55,9 @@ class OptimizationResult:
             was queried. Time is recorded using ``time.time()``.
         time: The time, in seconds, it took to obtain the result.
         seed: A random number generator seed used to produce the result.
-        status: A status flag set by the optimizer.
+        status: A status flag set by the optimizer. If the run was stopped
+            because a budget ran out, this is BUDGET_EXHAUSTED. If the run
+            was skipped, this is SKIPPED.
         message: A message returned by the optimizer.
     """
 
@@ -60,7 +72,7 @@ class OptimizationResult:
                  wait_times: Optional[List[float]]=None,
                  time: Optional[int]=None,
                  seed: Optional[int]=None,
-                 status: Optional[int]=None,
+                 status: Optional[Union[int, str]]=None,
                  message: Optional[str]=None) -> None:
         self.optimal_value = optimal_value
         self.optimal_parameters = optimal_parameters
@@ -77,6 +89,11 @@ class OptimizationResult:
 class OptimizationTrialResult:
     """The results from multiple repetitions of an optimization run.
 
+    The numeric data of the repetitions is stored in columnar numpy arrays
+    that grow geometrically, so appending results takes amortized constant
+    time. The pandas DataFrame is only built when `data_frame` is accessed,
+    and is cached until more results are added.
+
     Attributes:
         data_frame: A pandas DataFrame storing the results of each repetition
             of the optimization run. It has the following columns:
@@ -100,46 +117,95 @@ class OptimizationTrialResult:
             optimal value.
     """
 
+    NUMERIC_COLUMNS = ('optimal_value', 'num_evaluations', 'cost_spent', 'time')
+
     def __init__(self,
                  results: Iterable[OptimizationResult],
                  params: 'OptimizationParams') -> None:
-        self.results = list(results)
+        self.results = []  # type: List[OptimizationResult]
         self.params = params
-        self.data_frame = pandas.DataFrame(
-                {'optimal_value': result.optimal_value,
-                 'optimal_parameters': result.optimal_parameters,
-                 'num_evaluations': result.num_evaluations,
-                 'cost_spent': result.cost_spent,
-                 'time': result.time,
-                 'seed': result.seed,
-                 'status': result.status,
-                 'message': result.message}
-                for result in results)
+        self._buffer = numpy.empty((len(self.NUMERIC_COLUMNS), 0))
+        self._data_frame = None  # type: Optional[pandas.DataFrame]
+        self.extend(results)
+
+    @property
+    def data_frame(self) -> 'pandas.DataFrame':
+        if self._data_frame is None:
+            import pandas
+            self._data_frame = pandas.DataFrame(
+                    {'optimal_value': result.optimal_value,
+                     'optimal_parameters': result.optimal_parameters,
+                     'num_evaluations': result.num_evaluations,
+                     'cost_spent': result.cost_spent,
+                     'time': result.time,
+                     'seed': result.seed,
+                     'status': result.status,
+                     'message': result.message}
+                    for result in self.results)
+        return self._data_frame
 
     @property
     def repetitions(self) -> int:
-        return len(self.data_frame)
+        return len(self.results)
 
     @property
     def optimal_value(self) -> float:
-        return self.data_frame['optimal_value'].min()
+        values = self.column('optimal_value')
+        if numpy.all(numpy.isnan(values)):
+            return numpy.nan
+        return numpy.nanmin(values)
 
     @property
-    def optimal_parameters(self) -> numpy.ndarray:
-        return self.data_frame['optimal_parameters'][
-                self.data_frame['optimal_value'].idxmin()]
+    def optimal_parameters(self) -> Optional[numpy.ndarray]:
+        values = self.column('optimal_value')
+        if numpy.all(numpy.isnan(values)):
+            return None
+        return self.results[int(numpy.nanargmin(values))].optimal_parameters
+
+    def column(self, name: str) -> numpy.ndarray:
+        """The values of a numeric column as an array.
+
+        Missing values are NaN. The returned array is a read-only view that
+        is invalidated when results are added.
+
+        Args:
+            name: One of the names in NUMERIC_COLUMNS.
+        """
+        view = self._buffer[self.NUMERIC_COLUMNS.index(name),
+                            :len(self.results)]
+        view.flags.writeable = False
+        return view
 
     def extend(self,
                results: Iterable[OptimizationResult]) -> None:
-        new_data_frame = pandas.DataFrame(
-                {'optimal_value': result.optimal_value,
-                 'optimal_parameters': result.optimal_parameters,
-                 'num_evaluations': result.num_evaluations,
-                 'cost_spent': result.cost_spent,
-                 'time': result.time,
-                 'seed': result.seed,
-                 'status': result.status,
-                 'message': result.message}
-                for result in results)
-        self.data_frame = pandas.concat([self.data_frame, new_data_frame])
+        results = list(results)
+        size = len(self.results)
+        new_size = size + len(results)
+        capacity = self._buffer.shape[1]
+        if new_size > capacity:
+            buffer = numpy.empty((len(self.NUMERIC_COLUMNS),
+                                  max(new_size, 2 * capacity)))
+            buffer[:, :size] = self._buffer[:, :size]
+            self._buffer = buffer
+        for i, result in enumerate(results, size):
+            self._buffer[:, i] = [_float_or_nan(getattr(result, name))
+                                  for name in self.NUMERIC_COLUMNS]
         self.results.extend(results)
+        self._data_frame = None
+
+    def __getstate__(self):
+        # The DataFrame is a cache, so there is no need to save it
+        state = self.__dict__.copy()
+        state['_data_frame'] = None
+        return state
+
+    def __setstate__(self, state):
+        if 'data_frame' in state:
+            # Trial results saved before the columnar storage was added
+            self.__init__(state['results'], state['params'])
+        else:
+            self.__dict__.update(state)
+
+
+def _float_or_nan(value: Optional[float]) -> float:
+    return numpy.nan if value is None else value
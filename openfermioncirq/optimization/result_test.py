@@ -10,6 +10,8 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import pickle
+
 import numpy
 
 from openfermioncirq.optimization import (
@@ -136,3 +138,62 @@ def test_optimization_trial_result_data_methods():
     assert trial.optimal_value == 4.7
     numpy.testing.assert_allclose(trial.optimal_parameters,
                                   numpy.array([1.7, 2.1]))
+
+
+def test_optimization_trial_result_extend_one_at_a_time():
+    trial = OptimizationTrialResult(
+            [], params=OptimizationParams(ExampleAlgorithm()))
+    for i in range(10):
+        trial.extend([OptimizationResult(
+                optimal_value=float(10 - i) if i != 3 else None,
+                optimal_parameters=numpy.array([i, i]),
+                num_evaluations=i)])
+
+    assert trial.repetitions == 10
+    assert trial.optimal_value == 1.0
+    numpy.testing.assert_allclose(trial.optimal_parameters,
+                                  numpy.array([9, 9]))
+    numpy.testing.assert_allclose(trial.column('num_evaluations'),
+                                  numpy.arange(10))
+    assert numpy.isnan(trial.column('optimal_value')[3])
+    assert numpy.isnan(trial.column('cost_spent')).all()
+
+    data_frame = trial.data_frame
+    assert len(data_frame) == 10
+    assert list(data_frame.index) == list(range(10))
+    assert trial.data_frame is data_frame
+
+    trial.extend([OptimizationResult(optimal_value=0.5,
+                                     optimal_parameters=numpy.array([0, 1]))])
+    assert trial.data_frame is not data_frame
+    assert len(trial.data_frame) == 11
+    assert trial.optimal_value == 0.5
+
+
+def test_optimization_trial_result_all_nan():
+    trial = OptimizationTrialResult(
+            [OptimizationResult(optimal_value=numpy.nan,
+                                optimal_parameters=None)],
+            params=OptimizationParams(ExampleAlgorithm()))
+    assert numpy.isnan(trial.optimal_value)
+    assert trial.optimal_parameters is None
+
+
+def test_optimization_trial_result_pickle():
+    result = OptimizationResult(optimal_value=1.5,
+                                optimal_parameters=numpy.array([1.0, 2.0]))
+    params = OptimizationParams(ExampleAlgorithm())
+    trial = OptimizationTrialResult([result], params=params)
+    _ = trial.data_frame
+
+    loaded = pickle.loads(pickle.dumps(trial))
+    assert loaded.repetitions == 1
+    assert loaded.optimal_value == 1.5
+
+    # State saved by versions that stored the DataFrame eagerly
+    old = OptimizationTrialResult.__new__(OptimizationTrialResult)
+    old.__setstate__({'results': [result],
+                      'params': params,
+                      'data_frame': trial.data_frame})
+    assert old.repetitions == 1
+    assert old.optimal_value == 1.5
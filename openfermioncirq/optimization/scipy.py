@@ -12,16 +12,18 @@
 
 """A wrapper around the local optimization routines implemented in Scipy."""
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 import numpy
 import scipy.optimize
 
 from openfermioncirq.optimization import (BlackBox,
                                           OptimizationResult,
-                                          OptimizationAlgorithm)
+                                          OptimizationAlgorithm,
+                                          register_algorithm)
 
 
+@register_algorithm
 class ScipyOptimizationAlgorithm(OptimizationAlgorithm):
     """An optimization algorithm from the scipy.optimize module."""
 
@@ -67,6 +69,11 @@ class ScipyOptimizationAlgorithm(OptimizationAlgorithm):
     def name(self) -> str:
         return self.kwargs.get('method', 'ScipyOptimizationAlgorithm')
 
+    def _init_kwargs(self) -> Dict[str, Any]:
+        return {'options': self.options,
+                'kwargs': self.kwargs,
+                'uses_bounds': self.uses_bounds}
+
 
 COBYLA = ScipyOptimizationAlgorithm(
         kwargs={'method': 'COBYLA'},
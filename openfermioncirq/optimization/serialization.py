@@ -0,0 +1,219 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Conversion of optimization results to JSON metadata and numpy arrays.
+
+The functions in this module split an object into a JSON-serializable
+dictionary and a set of named numpy arrays. Arrays are added to (or read
+from) a mapping that is shared between all objects being saved, using a
+prefix to keep their names apart. This allows many objects to be stored in
+a single `.npz` file without using pickle.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy
+
+from openfermioncirq.optimization.algorithm import (
+        OptimizationAlgorithm,
+        OptimizationParams,
+        registered_algorithm)
+from openfermioncirq.optimization.result import (
+        OptimizationResult,
+        OptimizationTrialResult)
+
+
+def algorithm_to_json(algorithm: OptimizationAlgorithm) -> Dict[str, Any]:
+    """Describe an algorithm by its registered name and init arguments."""
+    return {'name': type(algorithm).__name__,
+            'kwargs': algorithm._init_kwargs()}
+
+
+def algorithm_from_json(data: Dict[str, Any]) -> OptimizationAlgorithm:
+    """Recreate an algorithm saved with `algorithm_to_json`."""
+    return registered_algorithm(data['name'])(**data['kwargs'])
+
+
+def params_to_json(params: OptimizationParams,
+                   arrays: Dict[str, numpy.ndarray],
+                   prefix: str) -> Dict[str, Any]:
+    """Convert OptimizationParams to JSON, storing initial guesses in arrays.
+    """
+    for name in ('initial_guess', 'initial_guess_array'):
+        value = getattr(params, name)
+        if value is not None:
+            arrays[prefix + name] = numpy.asarray(value)
+    return {'algorithm': algorithm_to_json(params.algorithm),
+            'cost_of_evaluate': params.cost_of_evaluate,
+            'max_evaluations': params.max_evaluations,
+            'max_cost': params.max_cost,
+            'max_seconds': params.max_seconds}
+
+
+def params_from_json(data: Dict[str, Any],
+                     arrays: Mapping[str, numpy.ndarray],
+                     prefix: str) -> OptimizationParams:
+    """Recreate OptimizationParams saved with `params_to_json`."""
+    return OptimizationParams(
+            algorithm=algorithm_from_json(data['algorithm']),
+            initial_guess=_get(arrays, prefix + 'initial_guess'),
+            initial_guess_array=_get(arrays, prefix + 'initial_guess_array'),
+            cost_of_evaluate=data['cost_of_evaluate'],
+            max_evaluations=data['max_evaluations'],
+            max_cost=data['max_cost'],
+            max_seconds=data['max_seconds'])
+
+
+def trial_result_to_json(trial: OptimizationTrialResult,
+                         arrays: Dict[str, numpy.ndarray],
+                         prefix: str) -> Dict[str, Any]:
+    """Convert an OptimizationTrialResult to JSON and arrays.
+
+    The numeric columns, optimal parameters, seeds, function values and
+    wait times are stored as arrays. Ragged per-repetition data is
+    concatenated and stored together with the length of each part, where a
+    length of -1 stands for None.
+    """
+    results = trial.results
+    arrays[prefix + 'numeric'] = numpy.array(
+            [trial.column(name)
+             for name in OptimizationTrialResult.NUMERIC_COLUMNS])
+    arrays[prefix + 'seed'] = numpy.array(
+            [-1 if r.seed is None else r.seed for r in results],
+            dtype=numpy.int64)
+    _store_rows(arrays, prefix + 'optimal_parameters',
+                [r.optimal_parameters for r in results])
+
+    _store_ragged(arrays, prefix + 'wait_times',
+                  [r.wait_times for r in results])
+    _store_ragged(arrays, prefix + 'function_values',
+                  [None if r.function_values is None
+                   else [val for val, _, _ in r.function_values]
+                   for r in results])
+    _store_ragged(arrays, prefix + 'function_costs',
+                  [None if r.function_values is None
+                   else [numpy.nan if cost is None else cost
+                         for _, cost, _ in r.function_values]
+                   for r in results])
+    _store_rows(arrays, prefix + 'function_points',
+                [x for r in results for _, _, x in r.function_values or ()])
+
+    return {'params': params_to_json(trial.params, arrays, prefix + 'params_'),
+            'status': [_json_scalar(r.status) for r in results],
+            'message': [_json_scalar(r.message) for r in results]}
+
+
+def trial_result_from_json(data: Dict[str, Any],
+                           arrays: Mapping[str, numpy.ndarray],
+                           prefix: str) -> OptimizationTrialResult:
+    """Recreate an OptimizationTrialResult saved with `trial_result_to_json`.
+    """
+    numeric = dict(zip(OptimizationTrialResult.NUMERIC_COLUMNS,
+                       arrays[prefix + 'numeric']))
+    seeds = arrays[prefix + 'seed']
+    optimal_parameters = _load_rows(arrays, prefix + 'optimal_parameters')
+    wait_times = _load_ragged(arrays, prefix + 'wait_times')
+    function_values = _load_ragged(arrays, prefix + 'function_values')
+    function_costs = _load_ragged(arrays, prefix + 'function_costs')
+    function_points = iter(_load_rows(arrays, prefix + 'function_points'))
+
+    results = []
+    for i in range(len(seeds)):
+        values = None
+        if function_values[i] is not None:
+            values = [(val,
+                       None if numpy.isnan(cost) else cost,
+                       next(function_points))
+                      for val, cost in zip(function_values[i],
+                                           function_costs[i])]
+        num_evaluations = _none_if_nan(numeric['num_evaluations'][i])
+        results.append(OptimizationResult(
+                optimal_value=float(numeric['optimal_value'][i]),
+                optimal_parameters=optimal_parameters[i],
+                num_evaluations=None if num_evaluations is None
+                                else int(num_evaluations),
+                cost_spent=_none_if_nan(numeric['cost_spent'][i]),
+                function_values=values,
+                wait_times=wait_times[i],
+                time=_none_if_nan(numeric['time'][i]),
+                seed=None if seeds[i] == -1 else int(seeds[i]),
+                status=data['status'][i],
+                message=data['message'][i]))
+
+    return OptimizationTrialResult(
+            results,
+            params_from_json(data['params'], arrays, prefix + 'params_'))
+
+
+def _get(arrays: Mapping[str, numpy.ndarray],
+         name: str) -> Optional[numpy.ndarray]:
+    return arrays[name] if name in arrays else None
+
+
+def _store_rows(arrays: Dict[str, numpy.ndarray],
+                name: str,
+                rows: List[Optional[numpy.ndarray]]) -> None:
+    """Store equal-length rows, some of which may be None, as a 2d array."""
+    present = numpy.array([row is not None for row in rows], dtype=bool)
+    width = max([0] + [len(row) for row in rows if row is not None])
+    stacked = numpy.full((len(rows), width), numpy.nan)
+    for i, row in enumerate(rows):
+        if row is not None:
+            stacked[i] = row
+    arrays[name] = stacked
+    arrays[name + '_present'] = present
+
+
+def _load_rows(arrays: Mapping[str, numpy.ndarray],
+               name: str) -> List[Optional[numpy.ndarray]]:
+    stacked = arrays[name]
+    present = arrays[name + '_present']
+    return [row if is_present else None
+            for row, is_present in zip(stacked, present)]
+
+
+def _store_ragged(arrays: Dict[str, numpy.ndarray],
+                  name: str,
+                  parts: List[Optional[List[float]]]) -> None:
+    """Store a list of float lists, some of which may be None."""
+    arrays[name] = numpy.array(
+            [value for part in parts for value in part or ()], dtype=float)
+    arrays[name + '_lengths'] = numpy.array(
+            [-1 if part is None else len(part) for part in parts],
+            dtype=numpy.int64)
+
+
+def _load_ragged(arrays: Mapping[str, numpy.ndarray],
+                 name: str) -> List[Optional[List[float]]]:
+    values = arrays[name]
+    parts = []  # type: List[Optional[List[float]]]
+    start = 0
+    for length in arrays[name + '_lengths']:
+        if length == -1:
+            parts.append(None)
+        else:
+            parts.append(values[start:start + length].tolist())
+            start += length
+    return parts
+
+
+def _none_if_nan(value: float) -> Optional[float]:
+    return None if numpy.isnan(value) else float(value)
+
+
+def _json_scalar(value: Any) -> Any:
+    """Convert numpy scalars and bytes to types supported by JSON."""
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, numpy.generic):
+        return value.item()
+    return value
@@ -0,0 +1,125 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import pytest
+
+from openfermioncirq.optimization import (
+        COBYLA,
+        OptimizationAlgorithm,
+        OptimizationParams,
+        OptimizationResult,
+        OptimizationTrialResult,
+        ScipyOptimizationAlgorithm)
+from openfermioncirq.optimization.serialization import (
+        algorithm_from_json,
+        algorithm_to_json,
+        trial_result_from_json,
+        trial_result_to_json)
+from openfermioncirq.testing import ExampleAlgorithm
+
+
+def test_algorithm_json_round_trip():
+    algorithm = ScipyOptimizationAlgorithm(kwargs={'method': 'COBYLA'},
+                                           options={'maxiter': 2},
+                                           uses_bounds=False)
+    loaded = algorithm_from_json(algorithm_to_json(algorithm))
+    assert isinstance(loaded, ScipyOptimizationAlgorithm)
+    assert loaded.kwargs == {'method': 'COBYLA'}
+    assert loaded.options == {'maxiter': 2}
+    assert loaded.uses_bounds is False
+
+    loaded = algorithm_from_json(algorithm_to_json(ExampleAlgorithm()))
+    assert isinstance(loaded, ExampleAlgorithm)
+
+
+def test_algorithm_json_unregistered_raises_error():
+    class Unregistered(OptimizationAlgorithm):
+        def optimize(self, black_box, initial_guess=None,
+                     initial_guess_array=None):
+            pass  # coverage: ignore
+
+    with pytest.raises(KeyError):
+        _ = algorithm_from_json(algorithm_to_json(Unregistered()))
+
+
+def test_trial_result_round_trip():
+    results = [
+        OptimizationResult(
+            optimal_value=1.5,
+            optimal_parameters=numpy.array([0.1, 0.2]),
+            num_evaluations=2,
+            cost_spent=3.0,
+            function_values=[(2.0, 1.0, numpy.array([0.0, 0.0])),
+                             (1.5, 2.0, numpy.array([0.1, 0.2]))],
+            wait_times=[0.01],
+            time=0.5,
+            seed=7,
+            status=numpy.int64(1),
+            message=b'done'),
+        OptimizationResult(
+            optimal_value=2.5,
+            optimal_parameters=numpy.array([0.3, 0.4]),
+            function_values=[(2.5, None, None)],
+            wait_times=[],
+            seed=8,
+            status='budget exhausted',
+            message='Evaluation budget of 1 exhausted.'),
+        OptimizationResult(
+            optimal_value=numpy.nan,
+            optimal_parameters=None,
+            seed=9,
+            status='skipped'),
+    ]
+    params = OptimizationParams(COBYLA,
+                                initial_guess=numpy.array([1.0, 2.0]),
+                                cost_of_evaluate=0.5,
+                                max_evaluations=10)
+    trial = OptimizationTrialResult(results, params)
+
+    arrays = {}
+    data = trial_result_to_json(trial, arrays, 'x_')
+    assert all(isinstance(value, numpy.ndarray) for value in arrays.values())
+    loaded = trial_result_from_json(data, arrays, 'x_')
+
+    assert loaded.repetitions == 3
+    assert loaded.optimal_value == 1.5
+    assert loaded.params.algorithm.name == 'COBYLA'
+    numpy.testing.assert_allclose(loaded.params.initial_guess, [1.0, 2.0])
+    assert loaded.params.initial_guess_array is None
+    assert loaded.params.cost_of_evaluate == 0.5
+    assert loaded.params.max_evaluations == 10
+
+    first, second, third = loaded.results
+    numpy.testing.assert_allclose(first.optimal_parameters, [0.1, 0.2])
+    assert first.num_evaluations == 2
+    assert first.cost_spent == 3.0
+    assert [(val, cost) for val, cost, _ in first.function_values] == [
+            (2.0, 1.0), (1.5, 2.0)]
+    numpy.testing.assert_allclose(first.function_values[1][2], [0.1, 0.2])
+    assert first.wait_times == [0.01]
+    assert first.time == 0.5
+    assert first.seed == 7
+    assert first.status == 1
+    assert first.message == 'done'
+
+    assert second.num_evaluations is None
+    assert second.function_values == [(2.5, None, None)]
+    assert second.wait_times == []
+    assert second.status == 'budget exhausted'
+
+    assert numpy.isnan(third.optimal_value)
+    assert third.optimal_parameters is None
+    assert third.function_values is None
+    assert third.wait_times is None
+    assert third.status == 'skipped'
+    assert third.message is None
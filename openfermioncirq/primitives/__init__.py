@@ -14,8 +14,12 @@
 
 from openfermioncirq.primitives.bogoliubov_transform import bogoliubov_transform
 
+from openfermioncirq.primitives.moments import pack_moments
+
 from openfermioncirq.primitives.state_preparation import (
     prepare_gaussian_state,
     prepare_slater_determinant)
 
-from openfermioncirq.primitives.swap_network import swap_network
+from openfermioncirq.primitives.swap_network import (
+    swap_network,
+    swap_network_schedule)
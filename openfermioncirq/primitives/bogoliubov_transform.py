@@ -13,7 +13,11 @@
 """The Bogoliubov transformation."""
 
 from typing import (
-        Iterable, List, Optional, Sequence, Tuple, Union, cast)
+        Any, Callable, Generic, Hashable, Iterable, List, Optional, Sequence,
+        Tuple, TypeVar, Union, cast)
+
+import collections
+import threading
 
 import numpy
 
@@ -26,6 +30,65 @@ from openfermion.ops._givens_rotations import (
 from openfermioncirq import YXXY
 
 
+# A circuit description together with the phases to apply beforehand
+_Decomposition = Tuple[Optional[Tuple[float, ...]], Tuple[Any, ...]]
+
+_T = TypeVar('_T')
+
+
+class _DecompositionCache(Generic[_T]):
+    """A bounded cache of decompositions.
+
+    The Bogoliubov transformations key their Givens rotation decompositions
+    by the content of the transformation matrix and the initially occupied
+    orbitals. The least recently used entry is evicted once `maxsize`
+    entries are stored. The cache may be shared by several threads;
+    decompositions are computed outside of the lock, so two threads missing
+    on the same key may both compute it.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict() \
+            # type: collections.OrderedDict
+        self._lock = threading.Lock()
+
+    def get(self,
+            key: Hashable,
+            compute: Callable[[], _T]) -> _T:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                # Reinsert the entry to mark it as the most recently used
+                value = self._entries.pop(key)
+                self._entries[key] = value
+                return value
+            self.misses += 1
+        value = compute()
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_DECOMPOSITION_CACHE = _DecompositionCache(
+        maxsize=128)  # type: _DecompositionCache[_Decomposition]
+
+
 def bogoliubov_transform(
         qubits: Sequence[cirq.QubitId],
         transformation_matrix: numpy.ndarray,
@@ -82,6 +145,10 @@ def bogoliubov_transform(
             qubits that are set to one (indexing starts from 0). For
             example, the list [2, 3] represents qubits 2 and 3 being set to one.
             Default is 0, the all zeros state.
+
+    The Givens rotation decomposition of the transformation matrix is
+    cached, so repeated transformations with the same matrix and initial
+    state only pay for emitting the operations.
     """
     n_qubits = len(qubits)
     shape = transformation_matrix.shape
@@ -115,43 +182,90 @@ def _occupied_orbitals(computational_basis_state: int, n_qubits) -> List[int]:
     return [j for j in range(len(bitstring)) if bitstring[j] == '1']
 
 
+def _cache_key(kind: str,
+               transformation_matrix: numpy.ndarray,
+               initially_occupied_orbitals: Optional[Sequence[int]]
+               ) -> Hashable:
+    return (kind,
+            transformation_matrix.shape,
+            transformation_matrix.dtype.str,
+            transformation_matrix.tobytes(),
+            None if initially_occupied_orbitals is None
+            else tuple(initially_occupied_orbitals))
+
+
 def _slater_basis_change(qubits: Sequence[cirq.QubitId],
                          transformation_matrix: numpy.ndarray,
                          initially_occupied_orbitals: Optional[Sequence[int]]
                          ) -> cirq.OP_TREE:
     n_qubits = len(qubits)
 
+    phases, circuit_description = _DECOMPOSITION_CACHE.get(
+            _cache_key('slater',
+                       transformation_matrix,
+                       initially_occupied_orbitals),
+            lambda: _slater_decomposition(transformation_matrix,
+                                          initially_occupied_orbitals))
+
     if initially_occupied_orbitals is None:
-        decomposition, diagonal = givens_decomposition_square(
-                transformation_matrix)
-        circuit_description = list(reversed(decomposition))
         # The initial state is not a computational basis state so the
         # phases left on the diagonal in the decomposition matter
-        yield (cirq.RotZGate(rads=numpy.angle(diagonal[j])).on(qubits[j])
+        phases = cast(Tuple[float, ...], phases)
+        yield (cirq.RotZGate(rads=phases[j]).on(qubits[j])
                for j in range(n_qubits))
     else:
-        initially_occupied_orbitals = cast(
-                Sequence[int], initially_occupied_orbitals)
-        transformation_matrix = transformation_matrix[
-                list(initially_occupied_orbitals)]
         n_occupied = len(initially_occupied_orbitals)
         # Flip bits so that the first n_occupied are 1 and the rest 0
         initially_occupied_orbitals_set = set(initially_occupied_orbitals)
         yield (cirq.X(qubits[j]) for j in range(n_qubits)
                if (j < n_occupied) != (j in initially_occupied_orbitals_set))
-        circuit_description = slater_determinant_preparation_circuit(
-                transformation_matrix)
 
     yield _ops_from_givens_rotations_circuit_description(
             qubits, circuit_description)
 
 
+def _slater_decomposition(transformation_matrix: numpy.ndarray,
+                          initially_occupied_orbitals: Optional[Sequence[int]]
+                          ) -> _Decomposition:
+    if initially_occupied_orbitals is None:
+        decomposition, diagonal = givens_decomposition_square(
+                transformation_matrix)
+        return (tuple(numpy.angle(diagonal)),
+                tuple(reversed(decomposition)))
+    return (None,
+            tuple(slater_determinant_preparation_circuit(
+                transformation_matrix[list(initially_occupied_orbitals)])))
+
+
 def _gaussian_basis_change(qubits: Sequence[cirq.QubitId],
                            transformation_matrix: numpy.ndarray,
                            initially_occupied_orbitals: Optional[Sequence[int]]
                            ) -> cirq.OP_TREE:
     n_qubits = len(qubits)
 
+    phases, circuit_description = _DECOMPOSITION_CACHE.get(
+            _cache_key('gaussian',
+                       transformation_matrix,
+                       initially_occupied_orbitals),
+            lambda: _gaussian_decomposition(transformation_matrix,
+                                            initially_occupied_orbitals))
+
+    if phases is not None:
+        # The initial state is not a computational basis state so the
+        # phases left on the diagonal in the Givens decomposition matter
+        yield (cirq.RotZGate(rads=phases[j]).on(qubits[j])
+               for j in range(n_qubits))
+
+    yield _ops_from_givens_rotations_circuit_description(
+            qubits, circuit_description)
+
+
+def _gaussian_decomposition(
+        transformation_matrix: numpy.ndarray,
+        initially_occupied_orbitals: Optional[Sequence[int]]
+        ) -> _Decomposition:
+    n_qubits = transformation_matrix.shape[0]
+
     # Rearrange the transformation matrix because the OpenFermion routine
     # expects it to describe annihilation operators rather than creation
     # operators
@@ -166,18 +280,11 @@ def _gaussian_basis_change(qubits: Sequence[cirq.QubitId],
     if (initially_occupied_orbitals is not None and
             len(initially_occupied_orbitals) == 0):
         # Starting with the vacuum state yields additional symmetry
-        circuit_description = list(reversed(decomposition))
-    else:
-        if initially_occupied_orbitals is None:
-            # The initial state is not a computational basis state so the
-            # phases left on the diagonal in the Givens decomposition matter
-            yield (cirq.RotZGate(rads=
-                       numpy.angle(left_diagonal[j])).on(qubits[j])
-                   for j in range(n_qubits))
-        circuit_description = list(reversed(decomposition + left_decomposition))
-
-    yield _ops_from_givens_rotations_circuit_description(
-            qubits, circuit_description)
+        return None, tuple(reversed(decomposition))
+    phases = None
+    if initially_occupied_orbitals is None:
+        phases = tuple(numpy.angle(left_diagonal))
+    return phases, tuple(reversed(decomposition + left_decomposition))
 
 
 def _ops_from_givens_rotations_circuit_description(
@@ -10,7 +10,9 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from typing import Container
+from typing import Any, Container, Dict
+
+import threading
 
 import numpy
 import pytest
@@ -22,6 +24,8 @@ from openfermion.utils import (
         random_quadratic_hamiltonian, random_unitary_matrix)
 
 from openfermioncirq import bogoliubov_transform
+from openfermioncirq.primitives.bogoliubov_transform import (
+        _DECOMPOSITION_CACHE, _DecompositionCache)
 
 
 def fourier_transform_matrix(n_modes):
@@ -199,3 +203,77 @@ def test_bogoliubov_transform_bad_shape_raises_error():
     with pytest.raises(ValueError):
         _ = next(bogoliubov_transform(cirq.LineQubit.range(4),
                                       numpy.zeros((4, 7))))
+
+
+@pytest.mark.parametrize('n_qubits, gaussian, initial_state', [
+    (4, True, None),
+    (4, False, [1, 2]),
+    (4, False, 5),
+    (3, True, []),
+])
+def test_bogoliubov_transform_reuses_decomposition(n_qubits,
+                                                  gaussian,
+                                                  initial_state):
+    if gaussian:
+        quad_ham = random_quadratic_hamiltonian(
+                n_qubits, real=True, conserves_particle_number=False,
+                seed=12579)
+        transformation_matrix = quad_ham.diagonalizing_bogoliubov_transform()
+    else:
+        transformation_matrix = random_unitary_matrix(n_qubits, seed=46781)
+    qubits = cirq.LineQubit.range(n_qubits)
+    cache = _DECOMPOSITION_CACHE
+    cache.clear()
+
+    circuit1 = cirq.Circuit.from_ops(bogoliubov_transform(
+        qubits, transformation_matrix, initial_state=initial_state))
+    circuit2 = cirq.Circuit.from_ops(bogoliubov_transform(
+        qubits, transformation_matrix.copy(), initial_state=initial_state))
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert circuit1 == circuit2
+
+    # A different initial state needs its own decomposition
+    _ = cirq.Circuit.from_ops(bogoliubov_transform(
+        qubits, transformation_matrix, initial_state=[0]))
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_bogoliubov_transform_decomposition_cache_is_bounded():
+    cache = _DecompositionCache(maxsize=2)
+    values = {}  # type: Dict[str, Any]
+
+    def compute(key):
+        return lambda: values.setdefault(key, (None, (key,)))
+
+    cache.get('a', compute('a'))
+    cache.get('b', compute('b'))
+    cache.get('a', compute('a'))
+    cache.get('c', compute('c'))
+
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+    # 'b' was the least recently used entry
+    cache.get('b', compute('b'))
+    assert cache.misses == 4
+    cache.get('a', compute('a'))
+    assert cache.misses == 5
+
+
+def test_bogoliubov_transform_decomposition_cache_is_thread_safe():
+    cache = _DecompositionCache(maxsize=4)
+
+    def work(start):
+        for i in range(200):
+            key = (start + i) % 10
+            assert cache.get(key, lambda: (None, (key,))) == (None, (key,))
+
+    threads = [threading.Thread(target=work, args=(start,))
+               for start in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 4
+    assert cache.hits + cache.misses == 8 * 200
@@ -0,0 +1,53 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Packing operations into moments."""
+
+from typing import Dict, List
+
+import cirq
+
+
+def pack_moments(op_tree: cirq.OP_TREE) -> List[cirq.Moment]:
+    """Pack operations into moments as early as possible.
+
+    Each operation is placed in the moment right after the last moment that
+    acts on any of its qubits. This gives the same moments as appending the
+    operations to an empty circuit with `cirq.InsertStrategy.EARLIEST`, but
+    keeps track of the last moment used by each qubit instead of searching
+    the moments for every operation, so it takes linear time.
+
+    Example:
+
+    .. code-block:: python
+
+        circuit = cirq.Circuit(pack_moments(swap_network(qubits)))
+
+    Args:
+        op_tree: The operations to pack.
+
+    Returns:
+        The list of moments.
+    """
+    moment_operations = []  # type: List[List[cirq.Operation]]
+    # The index of the first moment that is free for each qubit
+    frontier = {}  # type: Dict[cirq.QubitId, int]
+
+    for op in cirq.flatten_op_tree(op_tree):
+        index = max([0] + [frontier.get(qubit, 0) for qubit in op.qubits])
+        if index == len(moment_operations):
+            moment_operations.append([])
+        moment_operations[index].append(op)
+        for qubit in op.qubits:
+            frontier[qubit] = index + 1
+
+    return [cirq.Moment(operations) for operations in moment_operations]
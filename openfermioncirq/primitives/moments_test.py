@@ -0,0 +1,56 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import pytest
+
+import cirq
+from openfermion.utils import random_unitary_matrix
+
+from openfermioncirq import XXYY, bogoliubov_transform, swap_network
+from openfermioncirq.primitives import pack_moments
+
+
+def test_pack_moments():
+    a, b, c = cirq.LineQubit.range(3)
+
+    moments = pack_moments([cirq.X(a), [cirq.CZ(a, b), cirq.Y(c)], cirq.Z(b),
+                            cirq.X(c), cirq.CZ(b, c), cirq.H(a)])
+
+    assert moments == [
+            cirq.Moment([cirq.X(a), cirq.Y(c)]),
+            cirq.Moment([cirq.CZ(a, b), cirq.X(c)]),
+            cirq.Moment([cirq.Z(b), cirq.H(a)]),
+            cirq.Moment([cirq.CZ(b, c)])]
+
+
+def test_pack_moments_empty():
+    assert pack_moments([]) == []
+
+
+@pytest.mark.parametrize('op_tree_factory', [
+    lambda qubits: swap_network(
+        qubits, lambda p, q, a, b: XXYY(a, b) if abs(p - q) == 1
+                                   else cirq.CZ(a, b)),
+    lambda qubits: swap_network(qubits, fermionic=True, offset=True),
+    lambda qubits: [cirq.X(qubits[0]), swap_network(qubits[1:]),
+                    swap_network(qubits[::-1])],
+    lambda qubits: bogoliubov_transform(
+        qubits, random_unitary_matrix(len(qubits), seed=2817)),
+])
+@pytest.mark.parametrize('n_qubits', [1, 2, 5])
+def test_pack_moments_matches_earliest(op_tree_factory, n_qubits):
+    qubits = cirq.LineQubit.range(n_qubits)
+    operations = list(cirq.flatten_op_tree(op_tree_factory(qubits)))
+
+    assert (cirq.Circuit(pack_moments(operations)) ==
+            cirq.Circuit.from_ops(operations,
+                                  strategy=cirq.InsertStrategy.EARLIEST))
@@ -12,7 +12,9 @@
 
 """The linear swap network."""
 
-from typing import Callable, Sequence
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy
 
 import cirq
 
@@ -120,16 +122,56 @@ def swap_network(qubits: Sequence[cirq.QubitId],
         offset: If True, then qubit 0 will participate in odd-numbered layers
             instead of even-numbered layers.
     """
-    n_qubits = len(qubits)
-    order = list(range(n_qubits))
     swap_gate = FSWAP if fermionic else cirq.SWAP
+    for _, i, j, p, q in swap_network_schedule(len(qubits), offset).tolist():
+        yield operation(p, q, qubits[i], qubits[j])
+        yield swap_gate(qubits[i], qubits[j])
+
+
+# Schedules computed so far, keyed by the number of qubits and the offset
+_SCHEDULE_CACHE = {}  # type: Dict[Tuple[int, bool], numpy.ndarray]
+_SCHEDULE_CACHE_SIZE = 64
+
+
+def swap_network_schedule(n_qubits: int, offset: bool=False) -> numpy.ndarray:
+    """The interactions of a swap network, in the order they are applied.
+
+    Each row of the returned array describes the interaction of one pair of
+    adjacent qubits and has the form ``(layer, i, j, p, q)``, where i and
+    j = i + 1 are the positions of the qubits, p and q are the indices of
+    the qubits or fermionic modes they hold before they are swapped, and
+    layer is the index of the layer of the network. The rows are sorted by
+    layer and then by position. Every pair of indices appears exactly once.
 
+    The schedule is computed once for each number of qubits and offset and
+    shared between calls, so the returned array is read-only.
+
+    Args:
+        n_qubits: The number of qubits in the swap network.
+        offset: If True, then qubit 0 will participate in odd-numbered layers
+            instead of even-numbered layers.
+    """
+    key = (n_qubits, bool(offset))
+    schedule = _SCHEDULE_CACHE.get(key)
+    if schedule is None:
+        schedule = _compute_swap_network_schedule(n_qubits, offset)
+        if len(_SCHEDULE_CACHE) >= _SCHEDULE_CACHE_SIZE:
+            _SCHEDULE_CACHE.clear()
+        _SCHEDULE_CACHE[key] = schedule
+    return schedule
+
+
+def _compute_swap_network_schedule(n_qubits: int,
+                                   offset: bool) -> numpy.ndarray:
+    order = list(range(n_qubits))
+    rows = []
     for layer_num in range(n_qubits):
         lowest_active_qubit = (layer_num + offset) % 2
-        active_pairs = ((i, i + 1)
-                        for i in range(lowest_active_qubit, n_qubits - 1, 2))
-        for i, j in active_pairs:
+        for i in range(lowest_active_qubit, n_qubits - 1, 2):
+            j = i + 1
             p, q = order[i], order[j]
-            yield operation(p, q, qubits[i], qubits[j])
-            yield swap_gate(qubits[i], qubits[j])
+            rows.append((layer_num, i, j, p, q))
             order[i], order[j] = q, p
+    schedule = numpy.array(rows, dtype=int).reshape((len(rows), 5))
+    schedule.flags.writeable = False
+    return schedule
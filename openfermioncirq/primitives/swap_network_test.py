@@ -10,9 +10,14 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import itertools
+
+import pytest
+
 import cirq
 
 from openfermioncirq import XXYY, swap_network
+from openfermioncirq.primitives import swap_network_schedule
 
 
 def test_swap_network():
@@ -94,3 +99,33 @@ XXYY─XXYY XXYY─XXYY
 │ ×─× ×─×
 │ │ │ │ │
 """.strip()
+
+
+@pytest.mark.parametrize('n_qubits', range(7))
+@pytest.mark.parametrize('offset', [False, True])
+def test_swap_network_schedule(n_qubits, offset):
+    schedule = swap_network_schedule(n_qubits, offset)
+
+    assert schedule.shape == (n_qubits * (n_qubits - 1) // 2, 5)
+    assert swap_network_schedule(n_qubits, offset) is schedule
+    with pytest.raises(ValueError):
+        schedule[0:1, 0] = 1
+
+    # Every pair of indices interacts once
+    assert sorted(tuple(sorted((p, q))) for _, _, _, p, q in schedule
+                  ) == list(itertools.combinations(range(n_qubits), 2))
+
+    # The rows match the operations of the swap network
+    qubits = cirq.LineQubit.range(n_qubits)
+    interactions = []
+    _ = list(cirq.flatten_op_tree(swap_network(
+        qubits,
+        lambda p, q, a, b: interactions.append((a.x, b.x, p, q)) or (),
+        offset=offset)))
+    assert [tuple(row[1:]) for row in schedule.tolist()] == interactions
+
+    # Layers are in order and each layer acts on disjoint pairs
+    for layer in set(schedule[:, 0]):
+        positions = schedule[schedule[:, 0] == layer, 1:3].ravel()
+        assert len(set(positions)) == len(positions)
+    assert list(schedule[:, 0]) == sorted(schedule[:, 0])
@@ -18,13 +18,16 @@ import numpy
 
 import cirq
 
-from openfermioncirq.optimization.algorithm import OptimizationAlgorithm
+from openfermioncirq.optimization.algorithm import (
+        OptimizationAlgorithm,
+        register_algorithm)
 from openfermioncirq.optimization.black_box import BlackBox, StatefulBlackBox
 from openfermioncirq.optimization.result import OptimizationResult
 from openfermioncirq.variational.ansatz import VariationalAnsatz
 from openfermioncirq.variational.objective import VariationalObjective
 
 
+@register_algorithm
 class ExampleAlgorithm(OptimizationAlgorithm):
     """Evaluates 5 random points and returns the best answer found."""
 
@@ -35,8 +38,9 @@ class ExampleAlgorithm(OptimizationAlgorithm):
                  ) -> OptimizationResult:
         opt = numpy.inf
         opt_params = None
+        random = numpy.random if black_box.rng is None else black_box.rng
         for _ in range(5):
-            guess = numpy.random.randn(black_box.dimension)
+            guess = random.standard_normal(black_box.dimension)
             val = black_box.evaluate(guess)
             if val < opt:
                 opt = val
@@ -71,7 +75,8 @@ class ExampleBlackBoxNoisy(ExampleBlackBox):
     def _evaluate_with_cost(self,
                             x: numpy.ndarray,
                             cost: float) -> float:
-        return numpy.sum(x**2) + numpy.random.randn() / cost
+        random = numpy.random if self.rng is None else self.rng
+        return numpy.sum(x**2) + random.standard_normal() / cost
 
 
 class ExampleStatefulBlackBox(ExampleBlackBox, StatefulBlackBox):
@@ -127,6 +132,12 @@ class ExampleVariationalObjectiveNoisy(ExampleVariationalObjective):
     """
 
     def noise(self, cost: Optional[float]=None) -> float:
+        return self.noise_with_rng(cost)
+
+    def noise_with_rng(self,
+                       cost: Optional[float]=None,
+                       rng: Optional['numpy.random.Generator']=None) -> float:
         if cost is None:
             return 0.0  # coverage: ignore
-        return numpy.random.randn() / cost
+        random = numpy.random if rng is None else rng
+        return random.standard_normal() / cost
@@ -12,7 +12,13 @@
 
 """Hamiltonian simulation via Trotter-Suzuki product formulas."""
 
-from openfermioncirq.trotter.simulate_trotter import simulate_trotter
+from openfermioncirq.trotter.simulate_trotter import (
+    TrotterCircuitTemplate,
+    count_trotter_resources,
+    simulate_trotter,
+    trotter_qubit_permutation)
+
+from openfermioncirq.trotter.numeric import simulate_trotter_state
 
 from openfermioncirq.trotter.algorithms import (
     LINEAR_SWAP_NETWORK,
@@ -22,6 +28,12 @@ from openfermioncirq.trotter.algorithms import (
     SPLIT_OPERATOR,
     SplitOperatorTrotterAlgorithm)
 
+from openfermioncirq.trotter.resources import TrotterResources
+
 from openfermioncirq.trotter.trotter_algorithm import (
     TrotterStep,
     TrotterAlgorithm)
+
+from openfermioncirq.trotter.trotter_error import (
+    trotter_error_bound,
+    trotter_steps_for_error)
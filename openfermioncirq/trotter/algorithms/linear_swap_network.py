@@ -25,6 +25,9 @@ from openfermioncirq import (
         YXXYGate,
         swap_network)
 
+from openfermioncirq.trotter.resources import (
+        TrotterResources,
+        swap_network_resources)
 from openfermioncirq.trotter.trotter_algorithm import (
         Hamiltonian,
         TrotterStep,
@@ -102,6 +105,13 @@ class SymmetricLinearSwapNetworkTrotterStep(TrotterStep):
         yield swap_network(qubits, one_and_two_body_interaction_reverse_order,
                 fermionic=True, offset=True)
 
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        return (2 * swap_network_resources(
+                    n_qubits, _interaction_resources(False), fermionic=True) +
+                TrotterResources.gates('RotZGate', 1, n_qubits))
+
 
 class ControlledSymmetricLinearSwapNetworkTrotterStep(TrotterStep):
 
@@ -156,6 +166,15 @@ class ControlledSymmetricLinearSwapNetworkTrotterStep(TrotterStep):
         yield cirq.RotZGate(rads=
                 -self.hamiltonian.constant * time).on(control_qubit)
 
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        return (2 * swap_network_resources(
+                    n_qubits, _interaction_resources(True), fermionic=True) +
+                TrotterResources.gates('Rot11Gate', 2, n_qubits) +
+                TrotterResources.gates('RotZGate', 1))
+
+
 class AsymmetricLinearSwapNetworkTrotterStep(TrotterStep):
 
     def trotter_step(
@@ -201,6 +220,22 @@ class AsymmetricLinearSwapNetworkTrotterStep(TrotterStep):
         if n_steps & 1 and not omit_final_swaps:
             yield swap_network(qubits, fermionic=True)
 
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        return (swap_network_resources(
+                    n_qubits, _interaction_resources(False), fermionic=True) +
+                TrotterResources.gates('RotZGate', 1, n_qubits))
+
+    def finish_resources(self,
+                         n_qubits: int,
+                         n_steps: int,
+                         controlled: bool=False,
+                         omit_final_swaps: bool=False) -> TrotterResources:
+        if n_steps & 1 and not omit_final_swaps:
+            return swap_network_resources(n_qubits, fermionic=True)
+        return TrotterResources()
+
 
 class ControlledAsymmetricLinearSwapNetworkTrotterStep(TrotterStep):
 
@@ -254,3 +289,31 @@ class ControlledAsymmetricLinearSwapNetworkTrotterStep(TrotterStep):
         # If the number of Trotter steps is odd, possibly swap qubits back
         if n_steps & 1 and not omit_final_swaps:
             yield swap_network(qubits, fermionic=True)
+
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        return (swap_network_resources(
+                    n_qubits, _interaction_resources(True), fermionic=True) +
+                TrotterResources.gates('Rot11Gate', 2, n_qubits) +
+                TrotterResources.gates('RotZGate', 1))
+
+    def finish_resources(self,
+                         n_qubits: int,
+                         n_steps: int,
+                         controlled: bool=False,
+                         omit_final_swaps: bool=False) -> TrotterResources:
+        if n_steps & 1 and not omit_final_swaps:
+            return swap_network_resources(n_qubits, fermionic=True)
+        return TrotterResources()
+
+
+def _interaction_resources(controlled: bool) -> TrotterResources:
+    """The resources of the interaction of a pair of modes."""
+    if controlled:
+        return (TrotterResources.gates('ControlledXXYYGate', 3) +
+                TrotterResources.gates('ControlledYXXYGate', 3) +
+                TrotterResources.gates('Rot111Gate', 3))
+    return (TrotterResources.gates('XXYYGate', 2) +
+            TrotterResources.gates('YXXYGate', 2) +
+            TrotterResources.gates('Rot11Gate', 2))
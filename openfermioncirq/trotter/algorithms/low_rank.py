@@ -12,30 +12,34 @@
 
 """A Trotter algorithm using the low rank decomposition strategy."""
 
-from typing import Optional, Sequence, TYPE_CHECKING, Tuple
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy
 
 import cirq
 from openfermion.ops import InteractionOperator
-from openfermion.utils import (low_rank_two_body_decomposition,
-                               prepare_one_body_squared_evolution)
+from openfermion.ops._givens_rotations import givens_decomposition_square
+from openfermion.utils import low_rank_two_body_decomposition
 
 from openfermioncirq import (
         ControlledXXYYGate,
         Rot111Gate,
         XXYYGate,
+        YXXY,
         bogoliubov_transform,
         swap_network)
+from openfermioncirq.primitives.bogoliubov_transform import (
+        _DecompositionCache)
+from openfermioncirq.trotter.resources import (
+        TrotterResources,
+        bogoliubov_transform_resources,
+        swap_network_resources)
 from openfermioncirq.trotter.trotter_algorithm import (
         Hamiltonian,
         TrotterStep,
         TrotterAlgorithm)
 
-if TYPE_CHECKING:
-    # pylint: disable=unused-import
-    from typing import List
-
 
 class LowRankTrotterAlgorithm(TrotterAlgorithm):
     """A Trotter algorithm using the low rank decomposition strategy.
@@ -61,6 +65,10 @@ class LowRankTrotterAlgorithm(TrotterAlgorithm):
     or it is chosen so that
     :math:`\sum_{l=0}^{L-1} (\sum_{pq} |g_{lpq}|)^2 |\lambda_l| < x`
     where x is a truncation threshold specified by user.
+    The basis changes between consecutive components are merged into one.
+    If `optimize` is True, the uncontrolled Trotter step also orders the
+    components to reduce the number of Givens rotations of the merged basis
+    changes, as described in `OptimizedAsymmetricLowRankTrotterStep`.
     """
 
     supported_types = {InteractionOperator}
@@ -68,7 +76,9 @@ class LowRankTrotterAlgorithm(TrotterAlgorithm):
     def __init__(self,
                  truncation_threshold: Optional[float]=1e-8,
                  final_rank: Optional[int]=None,
-                 spin_basis=True) -> None:
+                 spin_basis=True,
+                 optimize: bool=False,
+                 angle_tolerance: float=1e-8) -> None:
         """
         Args:
             truncation_threshold: The value of x from the docstring of
@@ -77,12 +87,29 @@ class LowRankTrotterAlgorithm(TrotterAlgorithm):
                 truncate.
             spin_basis: Whether the Hamiltonian is given in the spin orbital
                 (rather than spatial orbital) basis.
+            optimize: Whether to use `OptimizedAsymmetricLowRankTrotterStep`
+                for uncontrolled Trotter steps.
+            angle_tolerance: The rotation angle below which gates are
+                omitted by the optimized Trotter step. The angles of most
+                gates scale with the evolution time, so circuits for
+                different times may have different gates;
+                `TrotterCircuitTemplate` therefore builds its circuit with
+                no gates omitted.
         """
         self.truncation_threshold = truncation_threshold
         self.final_rank = final_rank
         self.spin_basis = spin_basis
+        self.optimize = optimize
+        self.angle_tolerance = angle_tolerance
 
     def asymmetric(self, hamiltonian: Hamiltonian) -> Optional[TrotterStep]:
+        if self.optimize:
+            return OptimizedAsymmetricLowRankTrotterStep(
+                    hamiltonian,
+                    self.truncation_threshold,
+                    self.final_rank,
+                    self.spin_basis,
+                    self.angle_tolerance)
         return AsymmetricLowRankTrotterStep(
                 hamiltonian,
                 self.truncation_threshold,
@@ -97,11 +124,159 @@ class LowRankTrotterAlgorithm(TrotterAlgorithm):
                 self.final_rank,
                 self.spin_basis)
 
+    def with_time_independent_structure(self) -> TrotterAlgorithm:
+        if not self.optimize or self.angle_tolerance == 0:
+            return self
+        return LowRankTrotterAlgorithm(self.truncation_threshold,
+                                       self.final_rank,
+                                       self.spin_basis,
+                                       self.optimize,
+                                       angle_tolerance=0.0)
+
 
 LOW_RANK = LowRankTrotterAlgorithm()
 
 
+class _LowRankDecomposition:
+    """The untruncated low rank decomposition of a two-body tensor.
+
+    The components are sorted by decreasing weight, as in
+    `low_rank_two_body_decomposition`, so a truncated decomposition consists
+    of the first components. The squared one-body operators act identically
+    on both spins, so only their matrices in the spin up orbitals are
+    stored.
+
+    Attributes:
+        eigenvalues: The coefficient of each squared one-body operator.
+        one_body_correction: The one-body terms from reordering the two-body
+            operator.
+        truncation_errors: The truncation error of keeping the first k + 1
+            components is at index k.
+    """
+
+    def __init__(self,
+                 two_body_tensor: numpy.ndarray,
+                 spin_basis: bool) -> None:
+        n_orbitals = len(two_body_tensor) // 2 if spin_basis else len(
+                two_body_tensor)
+        self.eigenvalues, one_body_squares, self.one_body_correction, _ = (
+            low_rank_two_body_decomposition(
+                two_body_tensor,
+                final_rank=n_orbitals**2,
+                spin_basis=spin_basis))
+
+        # The weights and errors are computed as in the decomposition, so
+        # thresholds select the same rank
+        weights = numpy.array([
+                abs(eigenvalue) * numpy.sum(numpy.absolute(square))**2
+                for eigenvalue, square in zip(self.eigenvalues,
+                                              one_body_squares)])
+        cumulative_weights = numpy.cumsum(weights)
+        self.truncation_errors = cumulative_weights[-1] - cumulative_weights
+        self._orbital_squares = numpy.array(one_body_squares[:, ::2, ::2])
+
+        for array in (self.eigenvalues, self.one_body_correction,
+                      self.truncation_errors, self._orbital_squares):
+            array.flags.writeable = False
+
+        # The diagonalized components, which are extended as needed because
+        # the negligible components need not be Hermitian
+        n_modes = one_body_squares.shape[1]
+        self._one_body_eigenvalues = numpy.zeros((0, n_modes))
+        self._basis_change_matrices = numpy.zeros((0, n_modes, n_modes))
+
+    def rank(self,
+             truncation_threshold: Optional[float]=1e-8,
+             final_rank: Optional[int]=None) -> int:
+        """The number of components kept by a truncation."""
+        if final_rank is not None:
+            return final_rank
+        return 1 + int(numpy.argmax(
+                self.truncation_errors <= truncation_threshold))
+
+    def truncation_error(self, rank: int) -> float:
+        """The truncation error of keeping the given number of components."""
+        return float(self.truncation_errors[min(rank, len(self.eigenvalues))
+                                            - 1])
+
+    def one_body_squares(self, rank: int) -> numpy.ndarray:
+        """The matrices of the first squared one-body operators, in the
+        spin-orbital basis as returned by `low_rank_two_body_decomposition`.
+        """
+        return _add_spin(self._orbital_squares[:rank])
+
+    def diagonalize(self, rank: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Diagonalize the first components, as in
+        `prepare_one_body_squared_evolution`.
+
+        Returns:
+            The eigenvalues of each of the first `rank` matrices in
+            `one_body_squares`, and the basis transformations that
+            diagonalize them.
+
+        Raises:
+            ValueError: One of the matrices is not Hermitian.
+        """
+        n_diagonalized = len(self._one_body_eigenvalues)
+        if rank > n_diagonalized:
+            # The squares act identically on both spins, so all of them are
+            # diagonalized at once in the spin up orbitals
+            matrices = self._orbital_squares[n_diagonalized:rank]
+            if not numpy.allclose(
+                    matrices, numpy.conjugate(matrices.transpose(0, 2, 1))):
+                raise ValueError('one_body_matrix is not Hermitian.')
+            values, vectors = numpy.linalg.eigh(matrices)
+            self._one_body_eigenvalues = numpy.concatenate(
+                    [self._one_body_eigenvalues,
+                     numpy.repeat(values, 2, axis=1)])
+            self._basis_change_matrices = numpy.concatenate(
+                    [self._basis_change_matrices,
+                     _add_spin(numpy.conjugate(vectors.transpose(0, 2, 1)))])
+            self._one_body_eigenvalues.flags.writeable = False
+            self._basis_change_matrices.flags.writeable = False
+        return (self._one_body_eigenvalues[:rank],
+                self._basis_change_matrices[:rank])
+
+
+def _add_spin(matrices: numpy.ndarray) -> numpy.ndarray:
+    """The Kronecker products of matrices with the 2 x 2 identity."""
+    n_matrices, n_rows, n_columns = matrices.shape
+    return numpy.einsum('jab,cd->jacbd', matrices, numpy.eye(2)).reshape(
+            n_matrices, 2 * n_rows, 2 * n_columns)
+
+
+def _low_rank_decomposition(two_body_tensor: numpy.ndarray,
+                            spin_basis: bool=True) -> _LowRankDecomposition:
+    """The untruncated low rank decomposition of a two-body tensor.
+
+    The last few decompositions are cached by a digest of the content of
+    the tensor.
+    """
+    two_body_tensor = numpy.ascontiguousarray(two_body_tensor)
+    key = (hashlib.sha1(two_body_tensor).digest(),
+           two_body_tensor.shape,
+           two_body_tensor.dtype.str,
+           spin_basis)
+    return _LOW_RANK_DECOMPOSITION_CACHE.get(
+            key, lambda: _LowRankDecomposition(two_body_tensor, spin_basis))
+
+
+_LOW_RANK_DECOMPOSITION_CACHE = _DecompositionCache(
+        maxsize=2)  # type: _DecompositionCache[_LowRankDecomposition]
+
+
 class LowRankTrotterStep(TrotterStep):
+    """A low rank Trotter step.
+
+    The untruncated decomposition of the two-body tensor is cached, so
+    creating steps for the same Hamiltonian with different truncations, for
+    instance to compare their accuracy and cost, only decomposes it once.
+
+    Attributes:
+        truncation_error: The bound on the error of the truncated two-body
+            operator, the value of the sum in the docstring of
+            `LowRankTrotterAlgorithm` over the discarded components.
+    """
 
     def __init__(self,
                  hamiltonian: InteractionOperator,
@@ -112,29 +287,84 @@ class LowRankTrotterStep(TrotterStep):
         self.truncation_threshold = truncation_threshold
         self.final_rank = final_rank
 
-        # Perform the low rank decomposition of two-body operator.
-        self.eigenvalues, self.one_body_squares, one_body_correction, _ = (
-            low_rank_two_body_decomposition(
-                hamiltonian.two_body_tensor,
-                truncation_threshold=self.truncation_threshold,
-                final_rank=self.final_rank,
-                spin_basis=spin_basis))
+        # Truncate the low rank decomposition of the two-body operator.
+        decomposition = _low_rank_decomposition(
+                hamiltonian.two_body_tensor, spin_basis)
+        rank = decomposition.rank(truncation_threshold, final_rank)
+        self.truncation_error = decomposition.truncation_error(rank)
+        self.eigenvalues = decomposition.eigenvalues[:rank]
+        self.one_body_squares = decomposition.one_body_squares(rank)
         self.one_body_coefficients = (
-                hamiltonian.one_body_tensor + one_body_correction)
+                hamiltonian.one_body_tensor +
+                decomposition.one_body_correction)
         self.constant = hamiltonian.constant
 
         # Get scaled density-density terms and basis transformation matrices.
-        self.scaled_density_density_matrices = []  # type: List[numpy.ndarray]
-        self.basis_change_matrices = []            # type: List[numpy.ndarray]
-        for j in range(len(self.eigenvalues)):
-            density_density_matrix, basis_change_matrix = (
-                prepare_one_body_squared_evolution(self.one_body_squares[j]))
-            self.scaled_density_density_matrices.append(
-                    numpy.real(self.eigenvalues[j] * density_density_matrix))
-            self.basis_change_matrices.append(basis_change_matrix)
+        one_body_eigenvalues, basis_change_matrices = (
+                decomposition.diagonalize(rank))
+        self.scaled_density_density_matrices = list(numpy.real(
+                self.eigenvalues[:, numpy.newaxis, numpy.newaxis] *
+                one_body_eigenvalues[:, :, numpy.newaxis] *
+                one_body_eigenvalues[:, numpy.newaxis, :])
+                )  # type: List[numpy.ndarray]
+        self.basis_change_matrices = list(
+                basis_change_matrices)  # type: List[numpy.ndarray]
 
         super().__init__(hamiltonian)
 
+    def finish_resources(self,
+                         n_qubits: int,
+                         n_steps: int,
+                         controlled: bool=False,
+                         omit_final_swaps: bool=False) -> TrotterResources:
+        resources = TrotterResources()
+        if not omit_final_swaps and n_steps & 1:
+            resources += swap_network_resources(n_qubits, fermionic=True)
+            if len(self.eigenvalues) & 1:
+                resources += swap_network_resources(n_qubits)
+        return resources
+
+    def _step_resources(self,
+                        n_qubits: int,
+                        controlled: bool) -> Optional[TrotterResources]:
+        """The resources of a Trotter step, or None if they are not known.
+
+        The basis changes of consecutive singular components are merged into
+        one Bogoliubov transformation, so there is one more of them than
+        there are components. The basis change matrices act identically on
+        both spins, so the rotations between spins are omitted from their
+        decompositions. Basis change matrices that are not unitary
+        describe transformations whose cost depends on their decomposition,
+        so None is returned for them.
+        """
+        if not all(cirq.is_unitary(matrix)
+                   for matrix in self.basis_change_matrices):
+            # coverage: ignore
+            return None
+        n_components = len(self.eigenvalues)
+        if controlled:
+            one_body = (swap_network_resources(
+                            n_qubits,
+                            TrotterResources.gates('ControlledXXYYGate', 3),
+                            fermionic=True) +
+                        TrotterResources.gates('Rot11Gate', 2, n_qubits) +
+                        TrotterResources.gates('RotZGate', 1))
+            component = (swap_network_resources(
+                             n_qubits,
+                             TrotterResources.gates('Rot111Gate', 3)) +
+                         TrotterResources.gates('Rot11Gate', 2, n_qubits))
+        else:
+            one_body = (swap_network_resources(
+                            n_qubits, TrotterResources.gates('XXYYGate', 2),
+                            fermionic=True) +
+                        TrotterResources.gates('RotZGate', 1, n_qubits))
+            component = (swap_network_resources(
+                             n_qubits, TrotterResources.gates('Rot11Gate', 2)) +
+                         TrotterResources.gates('RotZGate', 1, n_qubits))
+        return (one_body + n_components * component +
+                (n_components + 1) * bogoliubov_transform_resources(
+                    n_qubits, spin_symmetric=True))
+
 
 class AsymmetricLowRankTrotterStep(LowRankTrotterStep):
 
@@ -211,6 +441,15 @@ class AsymmetricLowRankTrotterStep(LowRankTrotterStep):
         if is_unitary:
             yield bogoliubov_transform(qubits, prior_basis_matrix)
 
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        resources = self._step_resources(n_qubits, controlled=False)
+        if resources is None:
+            # coverage: ignore
+            return super().trotter_step_resources(n_qubits, controlled)
+        return resources
+
     def step_qubit_permutation(self,
                                qubits: Sequence[cirq.QubitId],
                                control_qubit: Optional[cirq.QubitId]=None
@@ -240,6 +479,179 @@ class AsymmetricLowRankTrotterStep(LowRankTrotterStep):
                     yield swap_network(qubits)
 
 
+# The phases left on the diagonal and the Givens rotations (i, j, theta, phi)
+# in the order in which they are applied
+_GivensDecomposition = Tuple[numpy.ndarray,
+                             List[Tuple[int, int, float, float]]]
+
+
+def _givens_decomposition(matrix: numpy.ndarray) -> _GivensDecomposition:
+    """Decompose a basis change as in `bogoliubov_transform`."""
+    decomposition, diagonal = givens_decomposition_square(matrix)
+    return (numpy.angle(diagonal),
+            [rotation for parallel_rotations in reversed(decomposition)
+             for rotation in parallel_rotations])
+
+
+class OptimizedAsymmetricLowRankTrotterStep(AsymmetricLowRankTrotterStep):
+    """An asymmetric low rank Trotter step with fewer gates.
+
+    This implements the same kind of product formula as
+    `AsymmetricLowRankTrotterStep`, with these changes:
+
+        - The singular components are ordered greedily so that each merged
+          basis change needs as few Givens rotations as possible. The
+          components do not commute, so this changes the product formula,
+          but not its order.
+        - Gates whose rotation angle is smaller than `angle_tolerance` are
+          omitted. This includes the Givens rotations of the basis changes,
+          whose decompositions are computed once when the step is created.
+        - The Z rotations of the diagonal terms are combined with the phases
+          at the start of the basis change that follows them.
+
+    Attributes:
+        angle_tolerance: The rotation angle below which gates are omitted.
+        component_order: The order in which the singular components are
+            simulated.
+    """
+
+    def __init__(self,
+                 hamiltonian: InteractionOperator,
+                 truncation_threshold: Optional[float]=1e-8,
+                 final_rank: Optional[int]=None,
+                 spin_basis=True,
+                 angle_tolerance: float=1e-8,
+                 reorder_components: bool=True) -> None:
+        """
+        Args:
+            reorder_components: Whether to order the singular components to
+                reduce the number of Givens rotations. If False, they are
+                simulated in order of decreasing weight.
+
+        The other arguments are as in `LowRankTrotterAlgorithm`.
+        """
+        super().__init__(hamiltonian, truncation_threshold, final_rank,
+                         spin_basis)
+        self.angle_tolerance = angle_tolerance
+
+        # The matrix of the basis change from component i to component j,
+        # where -1 stands for the original basis
+        n_qubits = len(self.basis_change_matrices[0])
+        matrices = [numpy.identity(n_qubits, complex)
+                    ] + self.basis_change_matrices
+        decompositions = {}  # type: Dict[Tuple[int, int], _GivensDecomposition]
+
+        def decomposition(i: int, j: int) -> _GivensDecomposition:
+            if (i, j) not in decompositions:
+                decompositions[i, j] = _givens_decomposition(
+                        numpy.dot(matrices[i + 1],
+                                  numpy.conjugate(matrices[j + 1].T)))
+            return decompositions[i, j]
+
+        def n_rotations(i: int, j: int) -> int:
+            return sum(abs(theta) >= angle_tolerance
+                       for _, _, theta, _ in decomposition(i, j)[1])
+
+        n_components = len(self.eigenvalues)
+        if reorder_components:
+            self.component_order = []  # type: List[int]
+            remaining = list(range(n_components))
+            current = -1
+            while remaining:
+                current = min(remaining, key=lambda j: n_rotations(current, j))
+                remaining.remove(current)
+                self.component_order.append(current)
+        else:
+            self.component_order = list(range(n_components))
+
+        path = [-1] + self.component_order + [-1]
+        self._basis_changes = [decomposition(i, j)
+                               for i, j in zip(path, path[1:])]
+
+    def trotter_step(
+            self,
+            qubits: Sequence[cirq.QubitId],
+            time: float,
+            control_qubit: Optional[cirq.QubitId]=None
+            ) -> cirq.OP_TREE:
+
+        n_qubits = len(qubits)
+
+        # Simulate the off-diagonal one-body terms.
+        yield swap_network(
+                qubits,
+                lambda p, q, a, b: self._xxyy(
+                    self.one_body_coefficients[p, q].real * time, a, b),
+                fermionic=True)
+        qubits = qubits[::-1]
+
+        # The diagonal one-body terms are applied with the next basis change
+        diagonal_rads = [-self.one_body_coefficients[j, j].real * time
+                         for j in range(n_qubits)]
+
+        # Simulate each singular vector of the two-body terms.
+        for k, j in enumerate(self.component_order):
+            yield self._basis_change(qubits, k, diagonal_rads)
+
+            # Simulate the off-diagonal two-body terms.
+            two_body_coefficients = self.scaled_density_density_matrices[j]
+            yield swap_network(
+                    qubits,
+                    lambda p, q, a, b: self._rot11(
+                        -2 * two_body_coefficients[p, q] * time, a, b))
+            qubits = qubits[::-1]
+
+            # The diagonal two-body terms are applied with the next basis
+            # change
+            diagonal_rads = [-two_body_coefficients[l, l] * time
+                             for l in range(n_qubits)]
+
+        # Undo the final basis transformation.
+        yield self._basis_change(qubits, len(self.component_order),
+                                 diagonal_rads)
+
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        # The gates that are omitted depend on the coefficients
+        return TrotterStep.trotter_step_resources(self, n_qubits, controlled)
+
+    def _basis_change(self,
+                      qubits: Sequence[cirq.QubitId],
+                      index: int,
+                      diagonal_rads: Sequence[float]) -> cirq.OP_TREE:
+        """The merged basis change at the given index, preceded by Z
+        rotations."""
+        phases, rotations = self._basis_changes[index]
+        for j, qubit in enumerate(qubits):
+            rads = diagonal_rads[j] + phases[j]
+            if not self._is_negligible_phase(rads):
+                yield cirq.RotZGate(rads=rads).on(qubit)
+        for i, j, theta, phi in rotations:
+            if abs(theta) >= self.angle_tolerance:
+                yield YXXY(qubits[i], qubits[j]) ** (2 * theta / numpy.pi)
+            if not self._is_negligible_phase(phi):
+                yield cirq.Z(qubits[j]) ** (phi / numpy.pi)
+
+    def _xxyy(self,
+              duration: float,
+              a: cirq.QubitId,
+              b: cirq.QubitId) -> cirq.OP_TREE:
+        if abs(duration) >= self.angle_tolerance:
+            yield XXYYGate(duration=duration).on(a, b)
+
+    def _rot11(self,
+               rads: float,
+               a: cirq.QubitId,
+               b: cirq.QubitId) -> cirq.OP_TREE:
+        if not self._is_negligible_phase(rads):
+            yield cirq.Rot11Gate(rads=rads).on(a, b)
+
+    def _is_negligible_phase(self, rads: float) -> bool:
+        return (abs((rads + numpy.pi) % (2 * numpy.pi) - numpy.pi) <
+                self.angle_tolerance)
+
+
 class ControlledAsymmetricLowRankTrotterStep(LowRankTrotterStep):
 
     def trotter_step(
@@ -322,6 +734,15 @@ class ControlledAsymmetricLowRankTrotterStep(LowRankTrotterStep):
         # Apply phase from constant term
         yield cirq.RotZGate(rads=-self.constant * time).on(control_qubit)
 
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        resources = self._step_resources(n_qubits, controlled=True)
+        if resources is None:
+            # coverage: ignore
+            return super().trotter_step_resources(n_qubits, controlled)
+        return resources
+
     def step_qubit_permutation(self,
                                qubits: Sequence[cirq.QubitId],
                                control_qubit: Optional[cirq.QubitId]=None
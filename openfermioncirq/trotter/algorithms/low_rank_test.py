@@ -0,0 +1,162 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import pytest
+import scipy.sparse.linalg
+
+import cirq
+import openfermion
+from openfermion.utils import (low_rank_two_body_decomposition,
+                               prepare_one_body_squared_evolution)
+
+from openfermioncirq.trotter import (
+        LowRankTrotterAlgorithm,
+        count_trotter_resources,
+        simulate_trotter_state)
+from openfermioncirq.trotter.algorithms.low_rank import (
+        OptimizedAsymmetricLowRankTrotterStep,
+        _LOW_RANK_DECOMPOSITION_CACHE,
+        _low_rank_decomposition)
+
+
+bond_length = 1.45
+geometry = [('Li', (0., 0., 0.)), ('H', (0., 0., bond_length))]
+lih_hamiltonian = openfermion.load_molecular_hamiltonian(
+        geometry, 'sto-3g', 1, format(bond_length), 2, 2)
+
+
+@pytest.mark.parametrize('truncation_threshold, final_rank', [
+    (1e-8, None), (1e-3, None), (1e-1, None), (None, 1), (None, 3)])
+def test_low_rank_trotter_step_matches_decomposition(truncation_threshold,
+                                                     final_rank):
+    step = LowRankTrotterAlgorithm(
+            truncation_threshold=truncation_threshold,
+            final_rank=final_rank).asymmetric(lih_hamiltonian)
+    eigenvalues, one_body_squares, one_body_correction, truncation_value = (
+            low_rank_two_body_decomposition(
+                lih_hamiltonian.two_body_tensor,
+                truncation_threshold=truncation_threshold,
+                final_rank=final_rank))
+
+    numpy.testing.assert_allclose(step.eigenvalues, eigenvalues)
+    numpy.testing.assert_allclose(step.one_body_squares, one_body_squares)
+    numpy.testing.assert_allclose(
+            step.one_body_coefficients,
+            lih_hamiltonian.one_body_tensor + one_body_correction)
+    assert step.truncation_error == pytest.approx(truncation_value)
+    for j, eigenvalue in enumerate(eigenvalues):
+        density_density_matrix, basis_change_matrix = (
+                prepare_one_body_squared_evolution(one_body_squares[j]))
+        numpy.testing.assert_allclose(
+                step.scaled_density_density_matrices[j],
+                numpy.real(eigenvalue * density_density_matrix),
+                atol=1e-12)
+        numpy.testing.assert_allclose(
+                step.basis_change_matrices[j], basis_change_matrix)
+
+
+def test_low_rank_trotter_step_caches_decomposition():
+    _LOW_RANK_DECOMPOSITION_CACHE.clear()
+
+    steps = [LowRankTrotterAlgorithm(truncation_threshold=threshold
+                                     ).asymmetric(lih_hamiltonian)
+             for threshold in (1e-8, 1e-4, 1e-2, 1e-1)]
+
+    assert _LOW_RANK_DECOMPOSITION_CACHE.misses == 1
+    assert _LOW_RANK_DECOMPOSITION_CACHE.hits == 3
+    # Looser thresholds keep fewer components and have larger errors
+    ranks = [len(step.eigenvalues) for step in steps]
+    errors = [step.truncation_error for step in steps]
+    assert ranks == sorted(ranks, reverse=True)
+    assert errors == sorted(errors)
+    for step, threshold in zip(steps, (1e-8, 1e-4, 1e-2, 1e-1)):
+        assert step.truncation_error <= threshold
+
+
+def test_low_rank_decomposition_read_only():
+    decomposition = _low_rank_decomposition(lih_hamiltonian.two_body_tensor)
+    _, basis_change_matrices = decomposition.diagonalize(2)
+
+    with pytest.raises(ValueError):
+        basis_change_matrices[0, 0, 0] = 0
+    with pytest.raises(ValueError):
+        decomposition.eigenvalues[0] = 0
+
+
+def test_low_rank_decomposition_cache_is_keyed_by_content():
+    _LOW_RANK_DECOMPOSITION_CACHE.clear()
+    two_body_tensor = lih_hamiltonian.two_body_tensor
+
+    decomposition = _low_rank_decomposition(two_body_tensor)
+    assert _low_rank_decomposition(two_body_tensor.copy()) is decomposition
+    assert (_low_rank_decomposition(two_body_tensor, spin_basis=False)
+            is not decomposition)
+    assert (_LOW_RANK_DECOMPOSITION_CACHE.hits,
+            _LOW_RANK_DECOMPOSITION_CACHE.misses) == (1, 2)
+
+
+def test_optimized_low_rank_trotter_step_matches_unoptimized():
+    qubits = cirq.LineQubit.range(4)
+    step = LowRankTrotterAlgorithm().asymmetric(lih_hamiltonian)
+    optimized_step = OptimizedAsymmetricLowRankTrotterStep(
+            lih_hamiltonian, angle_tolerance=0.0, reorder_components=False)
+
+    cirq.testing.assert_allclose_up_to_global_phase(
+            cirq.Circuit.from_ops(
+                optimized_step.trotter_step(qubits, 0.7)).to_unitary_matrix(
+                    qubit_order=qubits),
+            cirq.Circuit.from_ops(
+                step.trotter_step(qubits, 0.7)).to_unitary_matrix(
+                    qubit_order=qubits),
+            atol=1e-8)
+
+
+@pytest.mark.parametrize('angle_tolerance', [1e-8, 1e-3])
+def test_optimized_low_rank_trotter_step_simulates_hamiltonian(
+        angle_tolerance):
+    initial_state = openfermion.haar_random_vector(16, seed=40127)
+    exact_state = scipy.sparse.linalg.expm_multiply(
+            -1j * openfermion.get_sparse_operator(lih_hamiltonian),
+            initial_state)
+    algorithm = LowRankTrotterAlgorithm(optimize=True,
+                                        angle_tolerance=angle_tolerance)
+
+    final_state = simulate_trotter_state(
+            initial_state, lih_hamiltonian, 1.0, 20, algorithm=algorithm)
+
+    assert abs(numpy.vdot(final_state, exact_state)) > 0.99
+
+
+def test_optimized_low_rank_trotter_step_uses_fewer_gates():
+    resources = count_trotter_resources(lih_hamiltonian,
+                                        algorithm=LowRankTrotterAlgorithm())
+    optimized_resources = count_trotter_resources(
+            lih_hamiltonian,
+            algorithm=LowRankTrotterAlgorithm(optimize=True))
+
+    assert optimized_resources.n_gates < resources.n_gates
+    assert (optimized_resources.gate_counts['YXXYGate'] <=
+            resources.gate_counts['YXXYGate'])
+
+
+def test_low_rank_trotter_algorithm_with_time_independent_structure():
+    algorithm = LowRankTrotterAlgorithm(truncation_threshold=1e-3,
+                                        optimize=True, angle_tolerance=1e-3)
+    fixed_algorithm = algorithm.with_time_independent_structure()
+
+    assert fixed_algorithm.angle_tolerance == 0.0
+    assert fixed_algorithm.optimize
+    assert fixed_algorithm.truncation_threshold == 1e-3
+    unoptimized_algorithm = LowRankTrotterAlgorithm(angle_tolerance=1e-3)
+    assert (unoptimized_algorithm.with_time_independent_structure() is
+            unoptimized_algorithm)
@@ -19,6 +19,10 @@ from openfermion import DiagonalCoulombHamiltonian, QuadraticHamiltonian
 
 from openfermioncirq import Rot111Gate, bogoliubov_transform, swap_network
 
+from openfermioncirq.trotter.resources import (
+        TrotterResources,
+        bogoliubov_transform_resources,
+        swap_network_resources)
 from openfermioncirq.trotter.trotter_algorithm import (
         Hamiltonian,
         TrotterStep,
@@ -135,6 +139,29 @@ class SymmetricSplitOperatorTrotterStep(SplitOperatorTrotterStep):
         if n_steps & 1 and not omit_final_swaps:
             yield swap_network(qubits)
 
+    def prepare_resources(self,
+                          n_qubits: int,
+                          controlled: bool=False) -> TrotterResources:
+        return bogoliubov_transform_resources(n_qubits)
+
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        return (swap_network_resources(
+                    n_qubits, TrotterResources.gates('Rot11Gate', 2)) +
+                2 * bogoliubov_transform_resources(n_qubits) +
+                2 * TrotterResources.gates('RotZGate', 1, n_qubits))
+
+    def finish_resources(self,
+                         n_qubits: int,
+                         n_steps: int,
+                         controlled: bool=False,
+                         omit_final_swaps: bool=False) -> TrotterResources:
+        resources = bogoliubov_transform_resources(n_qubits)
+        if n_steps & 1 and not omit_final_swaps:
+            resources += swap_network_resources(n_qubits)
+        return resources
+
 
 class ControlledSymmetricSplitOperatorTrotterStep(SplitOperatorTrotterStep):
 
@@ -207,6 +234,30 @@ class ControlledSymmetricSplitOperatorTrotterStep(SplitOperatorTrotterStep):
         if n_steps & 1 and not omit_final_swaps:
             yield swap_network(qubits)
 
+    def prepare_resources(self,
+                          n_qubits: int,
+                          controlled: bool=False) -> TrotterResources:
+        return bogoliubov_transform_resources(n_qubits)
+
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        return (swap_network_resources(
+                    n_qubits, TrotterResources.gates('Rot111Gate', 3)) +
+                2 * bogoliubov_transform_resources(n_qubits) +
+                2 * TrotterResources.gates('Rot11Gate', 2, n_qubits) +
+                TrotterResources.gates('RotZGate', 1))
+
+    def finish_resources(self,
+                         n_qubits: int,
+                         n_steps: int,
+                         controlled: bool=False,
+                         omit_final_swaps: bool=False) -> TrotterResources:
+        resources = bogoliubov_transform_resources(n_qubits)
+        if n_steps & 1 and not omit_final_swaps:
+            resources += swap_network_resources(n_qubits)
+        return resources
+
 
 class AsymmetricSplitOperatorTrotterStep(SplitOperatorTrotterStep):
 
@@ -257,6 +308,23 @@ class AsymmetricSplitOperatorTrotterStep(SplitOperatorTrotterStep):
         if n_steps & 1 and not omit_final_swaps:
             yield swap_network(qubits)
 
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        return (swap_network_resources(
+                    n_qubits, TrotterResources.gates('Rot11Gate', 2)) +
+                2 * bogoliubov_transform_resources(n_qubits) +
+                TrotterResources.gates('RotZGate', 1, n_qubits))
+
+    def finish_resources(self,
+                         n_qubits: int,
+                         n_steps: int,
+                         controlled: bool=False,
+                         omit_final_swaps: bool=False) -> TrotterResources:
+        if n_steps & 1 and not omit_final_swaps:
+            return swap_network_resources(n_qubits)
+        return TrotterResources()
+
 
 class ControlledAsymmetricSplitOperatorTrotterStep(SplitOperatorTrotterStep):
 
@@ -312,3 +380,21 @@ class ControlledAsymmetricSplitOperatorTrotterStep(SplitOperatorTrotterStep):
         # If the number of Trotter steps is odd, possibly swap qubits back
         if n_steps & 1 and not omit_final_swaps:
             yield swap_network(qubits)
+
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        return (swap_network_resources(
+                    n_qubits, TrotterResources.gates('Rot111Gate', 3)) +
+                2 * bogoliubov_transform_resources(n_qubits) +
+                TrotterResources.gates('Rot11Gate', 2, n_qubits) +
+                TrotterResources.gates('RotZGate', 1))
+
+    def finish_resources(self,
+                         n_qubits: int,
+                         n_steps: int,
+                         controlled: bool=False,
+                         omit_final_swaps: bool=False) -> TrotterResources:
+        if n_steps & 1 and not omit_final_swaps:
+            return swap_network_resources(n_qubits)
+        return TrotterResources()
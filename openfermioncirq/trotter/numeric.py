@@ -0,0 +1,311 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Apply Trotter-Suzuki product formulas directly to state vectors."""
+
+from typing import (
+        Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union)
+
+import numpy
+
+import cirq
+
+from openfermioncirq.gates import FSWAP
+from openfermioncirq.trotter.simulate_trotter import (
+        _perform_trotter_step,
+        _resolve_n_steps,
+        _select_trotter_step)
+from openfermioncirq.trotter.trotter_algorithm import (
+        Hamiltonian,
+        TrotterAlgorithm)
+
+
+def simulate_trotter_state(initial_state: numpy.ndarray,
+                           hamiltonian: Hamiltonian,
+                           time: float,
+                           n_steps: Union[int, str]=1,
+                           order: int=0,
+                           algorithm: Optional[TrotterAlgorithm]=None,
+                           controlled: bool=False,
+                           omit_final_swaps: bool=False,
+                           target_error: float=1e-3) -> numpy.ndarray:
+    """Apply a Trotter-Suzuki product formula to a state vector.
+
+    This computes the same state as applying the circuit produced by
+    `simulate_trotter` to the initial state, without building the circuit.
+    The operations of the first Trotter step are compiled into a short
+    program acting on the state vector, which is replayed for the other
+    steps:
+
+        - Consecutive diagonal gates, such as the phases of the one-body
+          potential and the density-density interactions of a swap network,
+          are combined into a single vector of phases.
+        - Swap gates relabel the axes of the state tensor instead of moving
+          amplitudes.
+        - Gates applied to the same qubits in a row, such as the
+          interactions of a pair of modes in a swap network, are combined
+          into one small matrix that is contracted with the state tensor.
+
+    This is much faster than simulating the circuit, which makes it suitable
+    for studying the Trotter error as a function of the number of steps.
+
+    Args:
+        initial_state: The state vector to evolve. Qubits are ordered as in
+            `cirq.LineQubit.range`, with the j-th qubit holding the
+            occupation of the j-th fermionic mode. If `controlled` is True,
+            the control qubit comes first.
+        hamiltonian: The Hamiltonian to simulate.
+        time: The evolution time.
+        n_steps: The number of Trotter steps to use, or 'auto'.
+        order: The order of the product formula.
+        algorithm: The algorithm to use to simulate a single Trotter step.
+        controlled: Whether to control the evolution on an additional qubit.
+        omit_final_swaps: Whether SWAP or FSWAP gates at the end of the
+            circuit may be omitted.
+        target_error: The error bound used to choose the number of steps if
+            `n_steps` is 'auto'.
+
+    The other arguments have the same meaning as in `simulate_trotter`.
+
+    Returns:
+        The final state vector.
+
+    Raises:
+        ValueError: The length of the initial state is not a power of 2.
+    """
+    n_qubits = int(numpy.log2(len(initial_state)))
+    if 2**n_qubits != len(initial_state):
+        raise ValueError('The length of the initial state, {}, is not a '
+                         'power of 2.'.format(len(initial_state)))
+    all_qubits = cirq.LineQubit.range(n_qubits)
+    qubits = all_qubits[1:] if controlled else all_qubits
+    control_qubit = all_qubits[0] if controlled else None
+
+    trotter_step = _select_trotter_step(
+            hamiltonian, order, algorithm, controlled)
+    n_steps = _resolve_n_steps(
+            hamiltonian, time, n_steps, order, algorithm, target_error)
+    propagator = _StateVectorPropagator(all_qubits, initial_state)
+
+    propagator.apply(trotter_step.prepare(qubits, control_qubit))
+    step_time = time / n_steps
+    for _ in range(n_steps):
+        propagator.apply_cached(
+                (tuple(qubits), control_qubit),
+                lambda: _perform_trotter_step(
+                    qubits, step_time, order, trotter_step, control_qubit))
+        qubits, control_qubit = trotter_step.step_qubit_permutation(
+                qubits, control_qubit)
+    propagator.apply(trotter_step.finish(
+            qubits, n_steps, control_qubit, omit_final_swaps))
+
+    return propagator.state()
+
+
+# A kernel is a vector of phases if its axes are None, and otherwise a
+# matrix to apply to those axes of the state tensor
+_Kernel = Tuple[Optional[Tuple[int, ...]], numpy.ndarray]
+
+_MatrixAndDiagonal = Tuple[numpy.ndarray, Optional[numpy.ndarray]]
+
+_FSWAP_PHASES = numpy.array([1, 1, 1, -1], dtype=numpy.complex128)
+
+
+class _Program:
+    """Operations compiled into a sequence of kernels.
+
+    Attributes:
+        kernels: The kernels to apply in order.
+        final_axes: The axis holding each qubit after the program has run.
+    """
+
+    def __init__(self,
+                 kernels: List[_Kernel],
+                 final_axes: Dict[cirq.QubitId, int],
+                 n_qubits: int) -> None:
+        self.kernels = kernels
+        self.final_axes = final_axes
+        # Matrices are applied by moving their axes to the front
+        self.transpositions = [
+                None if axes is None else
+                (list(axes) + [i for i in range(n_qubits) if i not in axes],
+                 numpy.argsort(list(axes) + [i for i in range(n_qubits)
+                                             if i not in axes]))
+                for axes, _ in kernels]
+
+
+class _StateVectorPropagator:
+    """Applies operations to a state vector stored as a tensor.
+
+    Attributes:
+        axes: The axis of the state tensor that holds each qubit. Swap gates
+            exchange entries of this dictionary instead of moving amplitudes.
+    """
+
+    def __init__(self,
+                 qubits: Sequence[cirq.QubitId],
+                 initial_state: numpy.ndarray) -> None:
+        n_qubits = len(qubits)
+        self.qubits = list(qubits)
+        self.axes = {qubit: i for i, qubit in enumerate(qubits)
+                     }  # type: Dict[cirq.QubitId, int]
+        self._tensor = numpy.array(initial_state, dtype=numpy.complex128
+                                   ).reshape((2,) * n_qubits)
+        # The bit of each basis state index that belongs to each axis
+        indices = numpy.arange(2**n_qubits)
+        self._bits = [(indices >> (n_qubits - 1 - axis)) & 1
+                      for axis in range(n_qubits)]
+        self._matrices = {}  # type: Dict[Hashable, _MatrixAndDiagonal]
+        self._programs = {}  # type: Dict[Hashable, _Program]
+
+    def apply(self, op_tree: cirq.OP_TREE) -> None:
+        self._run(self._compile(op_tree))
+
+    def apply_cached(self,
+                     key: Hashable,
+                     op_tree_factory: Callable[[], cirq.OP_TREE]) -> None:
+        """Apply operations, reusing the program compiled for the same key.
+
+        The program also depends on which axes hold the qubits, so that is
+        made part of the key.
+        """
+        key = key, tuple(self.axes[qubit] for qubit in self.qubits)
+        if key not in self._programs:
+            self._programs[key] = self._compile(op_tree_factory())
+        self._run(self._programs[key])
+
+    def state(self) -> numpy.ndarray:
+        """The state vector, with qubits in their original order."""
+        return self._tensor.transpose(
+                [self.axes[qubit] for qubit in self.qubits]).reshape(-1)
+
+    def _run(self, program: _Program) -> None:
+        shape = self._tensor.shape
+        for (_, array), transposition in zip(program.kernels,
+                                             program.transpositions):
+            if transposition is None:
+                self._tensor = self._tensor * array
+            else:
+                permutation, inverse = transposition
+                self._tensor = array.dot(
+                        self._tensor.transpose(permutation).reshape(
+                            len(array), -1)
+                        ).reshape(shape).transpose(inverse)
+        self.axes = dict(program.final_axes)
+
+    def _compile(self, op_tree: cirq.OP_TREE) -> _Program:
+        kernels = []  # type: List[_Kernel]
+        phases = None  # type: Optional[numpy.ndarray]
+        axes_of = dict(self.axes)
+
+        for op in cirq.flatten_op_tree(op_tree):
+            gate = op.gate
+            axes = tuple(axes_of[qubit] for qubit in op.qubits)
+            if gate == cirq.SWAP or gate == FSWAP:
+                if gate == FSWAP:
+                    phases = self._multiply_phases(
+                            kernels, phases, axes, _FSWAP_PHASES)
+                a, b = op.qubits
+                axes_of[a], axes_of[b] = axes_of[b], axes_of[a]
+                continue
+
+            matrix, diagonal = self._matrix(gate)
+            if diagonal is not None:
+                if numpy.any(diagonal != 1):
+                    phases = self._multiply_phases(
+                            kernels, phases, axes, diagonal)
+                continue
+
+            if phases is not None:
+                kernels.append((None, phases.reshape(self._tensor.shape)))
+                phases = None
+            last_axes = kernels[-1][0] if kernels else None
+            if last_axes is not None and sorted(last_axes) == sorted(axes):
+                # Combine with the matrix applied to the same qubits
+                kernels[-1] = (last_axes,
+                               _permute(matrix, axes, last_axes).dot(
+                                   kernels[-1][1]))
+            else:
+                kernels.append((axes, matrix))
+
+        if phases is not None:
+            kernels.append((None, phases.reshape(self._tensor.shape)))
+        return _Program(kernels, axes_of, len(self.qubits))
+
+    def _multiply_phases(self,
+                         kernels: List[_Kernel],
+                         phases: Optional[numpy.ndarray],
+                         axes: Tuple[int, ...],
+                         diagonal: numpy.ndarray) -> Optional[numpy.ndarray]:
+        """Add a diagonal gate to a program being compiled.
+
+        Returns:
+            The new vector of phases that have not been applied yet.
+        """
+        last_axes = kernels[-1][0] if kernels else None
+        if (phases is None and last_axes is not None and
+                set(axes) <= set(last_axes)):
+            # Fold into the matrix applied to the same qubits
+            diagonal = _expand_diagonal(diagonal, axes, last_axes)
+            kernels[-1] = (last_axes,
+                           diagonal[:, numpy.newaxis] * kernels[-1][1])
+            return None
+        index = sum(self._bits[axis] << (len(axes) - 1 - i)
+                    for i, axis in enumerate(axes))
+        if phases is None:
+            return diagonal[index]
+        return phases * diagonal[index]
+
+    def _matrix(self, gate: cirq.Gate) -> _MatrixAndDiagonal:
+        """The matrix of a gate, and its diagonal if it is diagonal."""
+        try:
+            return self._matrices[gate]
+        except KeyError:
+            pass
+        matrix = gate.matrix()
+        diagonal = numpy.diag(matrix)
+        if numpy.any(matrix != numpy.diag(diagonal)):
+            diagonal = None
+        self._matrices[gate] = matrix, diagonal
+        return matrix, diagonal
+
+
+def _expand_diagonal(diagonal: numpy.ndarray,
+                     axes: Sequence[int],
+                     new_axes: Sequence[int]) -> numpy.ndarray:
+    """Extend a diagonal acting on axes to act on new_axes.
+
+    The axes must be a subset of the new axes.
+    """
+    if list(axes) == list(new_axes):
+        return diagonal
+    k = len(new_axes)
+    indices = numpy.arange(2**k)
+    index = sum(((indices >> (k - 1 - list(new_axes).index(axis))) & 1)
+                << (len(axes) - 1 - i)
+                for i, axis in enumerate(axes))
+    return diagonal[index]
+
+
+def _permute(matrix: numpy.ndarray,
+             axes: Sequence[int],
+             new_axes: Sequence[int]) -> numpy.ndarray:
+    """Reorder a matrix acting on axes to act on new_axes.
+
+    The new axes must be a permutation of the axes.
+    """
+    if list(axes) == list(new_axes):
+        return matrix
+    k = len(axes)
+    permutation = [list(axes).index(axis) for axis in new_axes]
+    return matrix.reshape((2,) * (2 * k)).transpose(
+            permutation + [k + p for p in permutation]).reshape(2**k, 2**k)
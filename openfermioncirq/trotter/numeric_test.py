@@ -0,0 +1,106 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import pytest
+import scipy.sparse.linalg
+
+import cirq
+import openfermion
+
+from openfermioncirq import simulate_trotter
+from openfermioncirq.trotter import (
+        LINEAR_SWAP_NETWORK,
+        LOW_RANK,
+        SPLIT_OPERATOR,
+        LowRankTrotterAlgorithm,
+        simulate_trotter_state,
+        trotter_steps_for_error)
+
+
+diag_coul_hamiltonian = openfermion.random_diagonal_coulomb_hamiltonian(
+        4, real=False, seed=27194)
+
+bond_length = 1.45
+geometry = [('Li', (0., 0., 0.)), ('H', (0., 0., bond_length))]
+lih_hamiltonian = openfermion.load_molecular_hamiltonian(
+        geometry, 'sto-3g', 1, format(bond_length), 2, 2)
+
+
+@pytest.mark.parametrize(
+        'hamiltonian, order, n_steps, algorithm', [
+            (diag_coul_hamiltonian, 0, 3, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 1, 2, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 2, 1, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 0, 3, SPLIT_OPERATOR),
+            (diag_coul_hamiltonian, 1, 2, SPLIT_OPERATOR),
+            (diag_coul_hamiltonian, 2, 1, SPLIT_OPERATOR),
+            (lih_hamiltonian, 0, 3, LOW_RANK),
+            (lih_hamiltonian, 0, 2, LowRankTrotterAlgorithm(final_rank=2)),
+            (lih_hamiltonian, 0, 2, LowRankTrotterAlgorithm(optimize=True)),
+])
+@pytest.mark.parametrize('controlled', [False, True])
+@pytest.mark.parametrize('omit_final_swaps', [False, True])
+def test_simulate_trotter_state_matches_circuit(
+        hamiltonian, order, n_steps, algorithm, controlled,
+        omit_final_swaps):
+    n_qubits = openfermion.count_qubits(hamiltonian) + controlled
+    qubits = cirq.LineQubit.range(n_qubits)
+    control = qubits[0] if controlled else None
+    initial_state = openfermion.haar_random_vector(2**n_qubits, seed=48201)
+
+    circuit = cirq.Circuit.from_ops(simulate_trotter(
+        qubits[controlled:], hamiltonian, 0.6, n_steps, order, algorithm,
+        control, omit_final_swaps))
+    correct_state = circuit.apply_unitary_effect_to_state(
+            initial_state, qubit_order=qubits)
+
+    final_state = simulate_trotter_state(
+            initial_state, hamiltonian, 0.6, n_steps, order, algorithm,
+            controlled, omit_final_swaps)
+
+    numpy.testing.assert_allclose(final_state, correct_state, atol=1e-10)
+
+
+def test_simulate_trotter_state_converges_with_n_steps():
+    initial_state = openfermion.haar_random_vector(16, seed=5521)
+    exact_state = scipy.sparse.linalg.expm_multiply(
+            -1j * openfermion.get_sparse_operator(diag_coul_hamiltonian),
+            initial_state)
+
+    # The distance between the states up to a global phase, which ignores
+    # the phase from the constant term that is not simulated
+    errors = [numpy.sqrt(2 - 2 * abs(numpy.vdot(
+                  simulate_trotter_state(initial_state, diag_coul_hamiltonian,
+                                         1.0, n_steps),
+                  exact_state)))
+              for n_steps in (4, 8, 16)]
+
+    # The asymmetric formula has an error of first order in the step size
+    assert errors[0] > errors[1] > errors[2]
+    assert errors[1] / errors[2] == pytest.approx(2, rel=0.2)
+
+
+def test_simulate_trotter_state_auto_n_steps():
+    initial_state = openfermion.haar_random_vector(16, seed=7120)
+    n_steps = trotter_steps_for_error(diag_coul_hamiltonian, 0.2, 1e-2)
+
+    numpy.testing.assert_allclose(
+            simulate_trotter_state(initial_state, diag_coul_hamiltonian, 0.2,
+                                   'auto', target_error=1e-2),
+            simulate_trotter_state(initial_state, diag_coul_hamiltonian, 0.2,
+                                   n_steps))
+
+
+def test_simulate_trotter_state_bad_length_raises_error():
+    with pytest.raises(ValueError):
+        _ = simulate_trotter_state(numpy.ones(6), diag_coul_hamiltonian, 1.0)
@@ -0,0 +1,178 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Counting the gates of Trotter circuits without constructing them."""
+
+import collections
+from typing import Dict, Optional
+
+import numpy
+
+import cirq
+
+from openfermioncirq.primitives.swap_network import swap_network_schedule
+
+
+class TrotterResources:
+    """The resources used by a circuit or part of a circuit.
+
+    Resources can be added together and multiplied by an integer, so the
+    resources of a circuit can be computed from those of its parts.
+
+    Attributes:
+        gate_counts: The number of gates of each type, keyed by the name of
+            the gate class, e.g. 'XXYYGate'.
+        gate_sizes: The number of gates acting on each number of qubits.
+        swap_network_layers: The number of layers of the swap networks,
+            which is their contribution to the depth of the circuit.
+        givens_rotations: The number of Givens rotations used for basis
+            changes.
+    """
+
+    def __init__(self,
+                 gate_counts: Optional[Dict[str, int]]=None,
+                 gate_sizes: Optional[Dict[int, int]]=None,
+                 swap_network_layers: int=0,
+                 givens_rotations: int=0) -> None:
+        self.gate_counts = collections.Counter(
+                gate_counts or {})  # type: Dict[str, int]
+        self.gate_sizes = collections.Counter(
+                gate_sizes or {})  # type: Dict[int, int]
+        self.swap_network_layers = swap_network_layers
+        self.givens_rotations = givens_rotations
+
+    @staticmethod
+    def gates(name: str, n_qubits: int, count: int=1) -> 'TrotterResources':
+        """The resources of a number of gates of the same type."""
+        return TrotterResources({name: count}, {n_qubits: count})
+
+    @staticmethod
+    def from_operations(op_tree: cirq.OP_TREE) -> 'TrotterResources':
+        """Count the gates of some operations by constructing them.
+
+        Swap network layers and Givens rotations cannot be recognized from
+        the operations, so they are not counted.
+        """
+        resources = TrotterResources()
+        for op in cirq.flatten_op_tree(op_tree):
+            gate = getattr(op, 'gate', None)
+            name = type(op if gate is None else gate).__name__
+            resources.gate_counts[name] += 1
+            resources.gate_sizes[len(op.qubits)] += 1
+        return resources
+
+    @property
+    def n_gates(self) -> int:
+        """The total number of gates."""
+        return sum(self.gate_counts.values())
+
+    @property
+    def two_qubit_gates(self) -> int:
+        """The number of gates acting on two qubits."""
+        return self.gate_sizes[2]
+
+    def __add__(self, other: 'TrotterResources') -> 'TrotterResources':
+        if not isinstance(other, TrotterResources):
+            return NotImplemented
+        return TrotterResources(
+                self.gate_counts + other.gate_counts,
+                self.gate_sizes + other.gate_sizes,
+                self.swap_network_layers + other.swap_network_layers,
+                self.givens_rotations + other.givens_rotations)
+
+    def __mul__(self, factor: int) -> 'TrotterResources':
+        if not isinstance(factor, int):
+            return NotImplemented
+        return TrotterResources(
+                {name: factor * count
+                 for name, count in self.gate_counts.items()},
+                {size: factor * count
+                 for size, count in self.gate_sizes.items()},
+                factor * self.swap_network_layers,
+                factor * self.givens_rotations)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if not isinstance(other, TrotterResources):
+            return NotImplemented
+        return (+self.gate_counts == +other.gate_counts and
+                +self.gate_sizes == +other.gate_sizes and
+                self.swap_network_layers == other.swap_network_layers and
+                self.givens_rotations == other.givens_rotations)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return ('openfermioncirq.trotter.TrotterResources({!r}, {!r}, {!r}, '
+                '{!r})'.format(dict(+self.gate_counts),
+                               dict(+self.gate_sizes),
+                               self.swap_network_layers,
+                               self.givens_rotations))
+
+
+def swap_network_resources(n_qubits: int,
+                           interaction: Optional[TrotterResources]=None,
+                           fermionic: bool=False,
+                           offset: bool=False) -> TrotterResources:
+    """The resources of a call to `swap_network`.
+
+    The pairs and layers are counted from the cached schedule of the swap
+    network, which is the one `swap_network` follows.
+
+    Args:
+        n_qubits: The number of qubits of the swap network.
+        interaction: The resources of the operation applied to each pair.
+        fermionic: Whether fermionic swaps are used.
+        offset: Whether qubit 0 participates in odd-numbered layers.
+    """
+    schedule = swap_network_schedule(n_qubits, offset)
+    n_pairs = len(schedule)
+    swaps = TrotterResources.gates(
+            'FermionicSwapGate' if fermionic else 'SwapGate', 2, n_pairs)
+    swaps.swap_network_layers = len(numpy.unique(schedule[:, 0]))
+    if interaction is None:
+        return swaps
+    return swaps + n_pairs * interaction
+
+
+def bogoliubov_transform_resources(n_qubits: int,
+                                   spin_symmetric: bool=False
+                                   ) -> TrotterResources:
+    """The resources of a `bogoliubov_transform` or its inverse.
+
+    This is for a particle-conserving transformation, given by a square
+    matrix, applied to an arbitrary state. The decomposition omits Givens
+    rotations that are not needed because an entry of the matrix is already
+    zero, so the counts are exact for generic matrices and an upper bound
+    for sparse ones.
+
+    Args:
+        n_qubits: The number of qubits of the transformation.
+        spin_symmetric: Whether the matrix is the Kronecker product of a
+            matrix with the 2 x 2 identity, so that it acts identically on
+            the even and odd qubits. The rotations that would mix the two
+            are then omitted, which leaves n_qubits * (n_qubits - 2) / 2 of
+            them for a generic matrix.
+    """
+    if spin_symmetric:
+        n_rotations = n_qubits * (n_qubits - 2) // 2
+    else:
+        n_rotations = n_qubits * (n_qubits - 1) // 2
+    # The phases left on the diagonal are applied first, and each Givens
+    # rotation is a YXXY gate followed by a Z rotation
+    resources = (TrotterResources.gates('RotZGate', 1,
+                                        n_qubits + n_rotations) +
+                 TrotterResources.gates('YXXYGate', 2, n_rotations))
+    resources.givens_rotations = n_rotations
+    return resources
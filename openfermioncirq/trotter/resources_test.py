@@ -0,0 +1,164 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Optional, Sequence
+
+import numpy
+import pytest
+
+import cirq
+import openfermion
+
+import openfermioncirq
+from openfermioncirq import bogoliubov_transform, simulate_trotter, swap_network
+from openfermioncirq.trotter import (
+        LINEAR_SWAP_NETWORK,
+        LOW_RANK,
+        SPLIT_OPERATOR,
+        LowRankTrotterAlgorithm,
+        TrotterResources,
+        TrotterStep,
+        count_trotter_resources)
+from openfermioncirq.trotter.resources import (
+        bogoliubov_transform_resources,
+        swap_network_resources)
+
+
+diag_coul_hamiltonian = openfermion.random_diagonal_coulomb_hamiltonian(
+        5, real=False, seed=6124)
+
+bond_length = 1.45
+geometry = [('Li', (0., 0., 0.)), ('H', (0., 0., bond_length))]
+lih_hamiltonian = openfermion.load_molecular_hamiltonian(
+        geometry, 'sto-3g', 1, format(bond_length), 2, 2)
+
+
+def circuit_resources(hamiltonian, n_steps, order, algorithm, controlled,
+                      omit_final_swaps):
+    qubits = cirq.LineQubit.range(openfermion.count_qubits(hamiltonian))
+    control = cirq.LineQubit(-1) if controlled else None
+    return TrotterResources.from_operations(simulate_trotter(
+        qubits, hamiltonian, 0.7, n_steps, order, algorithm, control,
+        omit_final_swaps))
+
+
+@pytest.mark.parametrize('algorithm', [LINEAR_SWAP_NETWORK, SPLIT_OPERATOR])
+@pytest.mark.parametrize('order', [0, 1, 2])
+@pytest.mark.parametrize('n_steps', [1, 2])
+@pytest.mark.parametrize('controlled', [False, True])
+@pytest.mark.parametrize('omit_final_swaps', [False, True])
+def test_count_trotter_resources_diagonal_coulomb(
+        algorithm, order, n_steps, controlled, omit_final_swaps):
+    resources = count_trotter_resources(
+            diag_coul_hamiltonian, n_steps, order, algorithm, controlled,
+            omit_final_swaps)
+    correct = circuit_resources(
+            diag_coul_hamiltonian, n_steps, order, algorithm, controlled,
+            omit_final_swaps)
+
+    assert resources.gate_counts == correct.gate_counts
+    assert resources.gate_sizes == correct.gate_sizes
+
+
+@pytest.mark.parametrize('algorithm', [
+        LOW_RANK, LowRankTrotterAlgorithm(final_rank=1)])
+@pytest.mark.parametrize('n_steps', [1, 2, 3])
+@pytest.mark.parametrize('controlled', [False, True])
+@pytest.mark.parametrize('omit_final_swaps', [False, True])
+def test_count_trotter_resources_low_rank(
+        algorithm, n_steps, controlled, omit_final_swaps):
+    resources = count_trotter_resources(
+            lih_hamiltonian, n_steps, 0, algorithm, controlled,
+            omit_final_swaps)
+    correct = circuit_resources(
+            lih_hamiltonian, n_steps, 0, algorithm, controlled,
+            omit_final_swaps)
+
+    assert resources.gate_counts == correct.gate_counts
+    assert resources.gate_sizes == correct.gate_sizes
+
+
+@pytest.mark.parametrize('n_qubits', range(6))
+@pytest.mark.parametrize('offset', [False, True])
+def test_swap_network_resources(n_qubits, offset):
+    qubits = cirq.LineQubit.range(n_qubits)
+    circuit = cirq.Circuit.from_ops(
+            swap_network(qubits, lambda p, q, a, b: cirq.CZ(a, b),
+                         offset=offset),
+            strategy=cirq.InsertStrategy.EARLIEST)
+    resources = swap_network_resources(
+            n_qubits, TrotterResources.gates('Rot11Gate', 2), offset=offset)
+
+    assert resources == TrotterResources.from_operations(
+            circuit.all_operations()) + TrotterResources(
+                swap_network_layers=resources.swap_network_layers)
+    assert resources.swap_network_layers == len(circuit) // 2
+
+
+def test_bogoliubov_transform_resources():
+    qubits = cirq.LineQubit.range(5)
+    matrix = openfermion.random_unitary_matrix(5, seed=3310)
+    resources = bogoliubov_transform_resources(5)
+
+    assert resources.givens_rotations == 10
+    assert TrotterResources(resources.gate_counts, resources.gate_sizes) == (
+            TrotterResources.from_operations(
+                bogoliubov_transform(qubits, matrix)))
+
+
+def test_bogoliubov_transform_resources_spin_symmetric():
+    qubits = cirq.LineQubit.range(6)
+    matrix = numpy.kron(openfermion.random_unitary_matrix(3, seed=3310),
+                        numpy.eye(2))
+    resources = bogoliubov_transform_resources(6, spin_symmetric=True)
+
+    assert resources.givens_rotations == 12
+    assert TrotterResources(resources.gate_counts, resources.gate_sizes) == (
+            TrotterResources.from_operations(
+                bogoliubov_transform(qubits, matrix)))
+
+
+def test_trotter_resources_arithmetic():
+    a = TrotterResources.gates('XXYYGate', 2, 3)
+    b = TrotterResources({'RotZGate': 2}, {1: 2}, swap_network_layers=4,
+                         givens_rotations=1)
+    total = 2 * (a + b)
+
+    assert total == TrotterResources({'XXYYGate': 6, 'RotZGate': 4},
+                                     {2: 6, 1: 4}, 8, 2)
+    assert total != a
+    assert total.n_gates == 10
+    assert total.two_qubit_gates == 6
+    assert a * 0 == TrotterResources()
+    assert eval(repr(total), {'openfermioncirq': openfermioncirq}) == total
+
+
+class IdentityTrotterStep(TrotterStep):
+
+    def trotter_step(
+            self,
+            qubits: Sequence[cirq.QubitId],
+            time: float,
+            control_qubit: Optional[cirq.QubitId]=None
+            ) -> cirq.OP_TREE:
+        yield cirq.ISWAP.on(*qubits[:2])
+        yield (cirq.Z(qubit) for qubit in qubits)
+
+
+def test_trotter_step_resources_default_constructs_operations():
+    step = IdentityTrotterStep(diag_coul_hamiltonian)
+
+    assert step.prepare_resources(3) == TrotterResources()
+    assert step.trotter_step_resources(3) == (
+            TrotterResources.gates('ISwapGate', 2) +
+            TrotterResources.gates('RotZGate', 1, 3))
+    assert step.finish_resources(3, 5) == TrotterResources()
@@ -12,10 +12,13 @@
 
 """Perform Hamiltonian simulation via a Trotter-Suzuki product formula."""
 
-from typing import Optional, Sequence
+from typing import Iterable, List, Optional, Sequence, Union
 
 import cirq
-from openfermion import DiagonalCoulombHamiltonian, InteractionOperator
+from openfermion import (
+        DiagonalCoulombHamiltonian,
+        InteractionOperator,
+        count_qubits)
 
 from openfermioncirq.trotter.trotter_algorithm import (
         Hamiltonian,
@@ -24,16 +27,19 @@ from openfermioncirq.trotter.trotter_algorithm import (
 from openfermioncirq.trotter.algorithms import (
         LINEAR_SWAP_NETWORK,
         LOW_RANK)
+from openfermioncirq.trotter.resources import TrotterResources
+from openfermioncirq.trotter.trotter_error import trotter_steps_for_error
 
 
 def simulate_trotter(qubits: Sequence[cirq.QubitId],
                      hamiltonian: Hamiltonian,
                      time: float,
-                     n_steps: int=1,
+                     n_steps: Union[int, str]=1,
                      order: int=0,
                      algorithm: Optional[TrotterAlgorithm]=None,
                      control_qubit: Optional[cirq.QubitId]=None,
-                     omit_final_swaps: bool=False
+                     omit_final_swaps: bool=False,
+                     target_error: float=1e-3
                      ) -> cirq.OP_TREE:
     """Simulate Hamiltonian evolution using a Trotter-Suzuki product formula.
 
@@ -51,7 +57,9 @@ def simulate_trotter(qubits: Sequence[cirq.QubitId],
             j-th fermionic mode.
         hamiltonian: The Hamiltonian to simulate.
         time: The evolution time.
-        n_steps: The number of Trotter steps to use. Default is 1.
+        n_steps: The number of Trotter steps to use. Default is 1. If this
+            is 'auto', the fewest steps are used for which
+            `trotter_error_bound` is at most `target_error`.
         order: The order of the product formula. The value indexes symmetric
             formulae, e.g., a value of 2 indicates a second-order symmetric,
             sometimes known as a fourth-order, Trotter formula. A value of 0
@@ -77,26 +85,18 @@ def simulate_trotter(qubits: Sequence[cirq.QubitId],
             number of Trotter steps used and the order of the Trotter formula
             selected. Setting this option to True will sometimes result in a
             circuit with fewer gates, but with the ordering of qubits or modes
-            reversed in the final wavefunction.
+            reversed in the final wavefunction. The resulting ordering is
+            given by `trotter_qubit_permutation`.
+        target_error: The bound on the error of the product formula used to
+            choose the number of steps if `n_steps` is 'auto'.
     """
     # TODO Document gate complexities of algorithm options
-    if order < 0:
-        raise ValueError('The order of the Trotter formula must be at least 0.')
-
-    if algorithm is None:
-        algorithm = _select_trotter_algorithm(hamiltonian)
-
-    if not isinstance(hamiltonian, tuple(algorithm.supported_types)):
-        raise TypeError(
-                'The input Hamiltonian was a {} but the chosen Trotter step '
-                'algorithm only supports Hamiltonians of type {}'.format(
-                    type(hamiltonian).__name__,
-                    {cls.__name__ for cls in algorithm.supported_types}))
-
     # Select the Trotter step to use
     trotter_step = _select_trotter_step(
             hamiltonian, order, algorithm,
             controlled = control_qubit is not None)
+    n_steps = _resolve_n_steps(
+            hamiltonian, time, n_steps, order, algorithm, target_error)
 
     # Get ready to perform Trotter steps
     yield trotter_step.prepare(qubits, control_qubit)
@@ -113,6 +113,249 @@ def simulate_trotter(qubits: Sequence[cirq.QubitId],
     yield trotter_step.finish(qubits, n_steps, control_qubit, omit_final_swaps)
 
 
+def count_trotter_resources(hamiltonian: Hamiltonian,
+                            n_steps: int=1,
+                            order: int=0,
+                            algorithm: Optional[TrotterAlgorithm]=None,
+                            controlled: bool=False,
+                            omit_final_swaps: bool=False
+                            ) -> TrotterResources:
+    """Count the gates of the circuit produced by `simulate_trotter`.
+
+    The counts are computed arithmetically from the number of qubits and the
+    structure of the Trotter step, without constructing the operations, so
+    they are cheap to obtain even for circuits with millions of gates. The
+    Trotter step is still constructed, which for the low rank algorithm
+    includes decomposing the two-body tensor.
+
+    Basis changes are counted as if every Givens rotation were needed. For
+    sparse basis change matrices, such as those of Hamiltonians with spin
+    symmetry, some rotations are omitted from the circuit and the counts of
+    YXXYGate and RotZGate are upper bounds.
+
+    Args:
+        hamiltonian: The Hamiltonian to simulate.
+        n_steps: The number of Trotter steps.
+        order: The order of the product formula.
+        algorithm: The algorithm to use to simulate a single Trotter step.
+        controlled: Whether the evolution is controlled on an additional
+            qubit.
+        omit_final_swaps: Whether SWAP or FSWAP gates at the end of the
+            circuit may be omitted.
+
+    The other arguments have the same meaning as in `simulate_trotter`.
+    """
+    trotter_step = _select_trotter_step(
+            hamiltonian, order, algorithm, controlled)
+    n_qubits = count_qubits(hamiltonian)
+
+    # A step of a symmetric formula of order k > 1 is split recursively into
+    # 5^(k - 1) symmetric steps
+    n_stages = n_steps * 5**max(order - 1, 0)
+    return (trotter_step.prepare_resources(n_qubits, controlled) +
+            n_stages * trotter_step.trotter_step_resources(
+                n_qubits, controlled) +
+            trotter_step.finish_resources(
+                n_qubits, n_steps, controlled, omit_final_swaps))
+
+
+def trotter_qubit_permutation(qubits: Sequence[cirq.QubitId],
+                              hamiltonian: Hamiltonian,
+                              n_steps: int=1,
+                              order: int=0,
+                              algorithm: Optional[TrotterAlgorithm]=None,
+                              control_qubit: Optional[cirq.QubitId]=None
+                              ) -> Sequence[cirq.QubitId]:
+    """The qubit permutation induced by `simulate_trotter` with final swaps
+    omitted.
+
+    Swap networks reverse the order of the qubits, and `simulate_trotter`
+    restores it at the end with another swap network unless
+    `omit_final_swaps` is True. Instead of paying for those gates, the
+    permutation can be applied to the qubit order used to read out the
+    final state, as is done with `VariationalAnsatz.qubit_permutation`::
+
+        circuit = cirq.Circuit.from_ops(simulate_trotter(
+            qubits, hamiltonian, time, n_steps, omit_final_swaps=True))
+        result = simulator.simulate(
+            circuit,
+            qubit_order=trotter_qubit_permutation(
+                qubits, hamiltonian, n_steps))
+
+    If fermionic swaps were omitted, the state read out in this order differs
+    from the state with the swaps by a sign that depends on the number of
+    particles, which is a global phase for states with a definite number of
+    particles.
+
+    Args:
+        qubits: The qubits passed to `simulate_trotter`.
+        hamiltonian: The Hamiltonian to simulate.
+        n_steps: The number of Trotter steps.
+        order: The order of the product formula.
+        algorithm: The algorithm to use to simulate a single Trotter step.
+        control_qubit: A qubit on which to control the Trotter step.
+
+    The arguments have the same meaning as in `simulate_trotter`.
+
+    Returns:
+        The qubits at the end of the circuit, ordered so that the j-th qubit
+        holds the occupation of the j-th fermionic mode.
+    """
+    trotter_step = _select_trotter_step(
+            hamiltonian, order, algorithm,
+            controlled=control_qubit is not None)
+    for _ in range(n_steps):
+        qubits, control_qubit = trotter_step.step_qubit_permutation(
+                qubits, control_qubit)
+    return qubits
+
+
+class TrotterCircuitTemplate:
+    """A Trotter circuit that is built once and resolved for many times.
+
+    The circuit produced by `simulate_trotter` depends on the evolution time
+    only through the exponents of some of its gates, and each of these
+    exponents is an affine function of the time. The template builds the
+    circuit with a Symbol in place of each such exponent, so that circuits
+    for many evolution times can be obtained by resolving the Symbols
+    instead of constructing every gate again.
+
+    Example::
+        template = TrotterCircuitTemplate(qubits, hamiltonian, n_steps=10)
+        result = simulator.run_sweep(template.circuit,
+                                     template.param_sweep(times))
+
+    The structure of the circuit depends on the number of Trotter steps and
+    the order of the formula, so a separate template is needed for each.
+    Algorithms that omit gates with small angles would give circuits whose
+    gates depend on the time, so the template builds the circuit with the
+    algorithm returned by their `with_time_independent_structure` method,
+    which omits no such gates.
+
+    Attributes:
+        circuit: The circuit with a Symbol as the exponent of each gate
+            that depends on the evolution time.
+        n_steps: The number of Trotter steps.
+        order: The order of the product formula.
+        qubit_permutation: The qubits at the end of the circuit, ordered so
+            that the j-th qubit holds the occupation of the j-th fermionic
+            mode. This differs from the qubits passed in only if final swaps
+            are omitted, as described in `trotter_qubit_permutation`.
+    """
+
+    # The two times at which the circuit is built to find the exponents of
+    # time-dependent gates. They are small so that no exponent wraps around
+    # its period in between.
+    _PROBE_TIMES = (1e-4, 2e-4)
+
+    def __init__(self,
+                 qubits: Sequence[cirq.QubitId],
+                 hamiltonian: Hamiltonian,
+                 n_steps: int=1,
+                 order: int=0,
+                 algorithm: Optional[TrotterAlgorithm]=None,
+                 control_qubit: Optional[cirq.QubitId]=None,
+                 omit_final_swaps: bool=False) -> None:
+        """
+        Args:
+            qubits: The qubits on which to apply operations.
+            hamiltonian: The Hamiltonian to simulate.
+            n_steps: The number of Trotter steps to use.
+            order: The order of the product formula.
+            algorithm: The algorithm to use to simulate a single Trotter
+                step.
+            control_qubit: A qubit on which to control the Trotter step.
+            omit_final_swaps: Whether SWAP or FSWAP gates at the end of
+                the circuit may be omitted.
+
+        The arguments have the same meaning as in `simulate_trotter`.
+
+        Raises:
+            ValueError: The circuit depends on the time in a way that
+                cannot be expressed with Symbols.
+        """
+        self.n_steps = n_steps
+        self.order = order
+        if algorithm is not None:
+            algorithm = algorithm.with_time_independent_structure()
+        self.qubit_permutation = (
+                trotter_qubit_permutation(qubits, hamiltonian, n_steps, order,
+                                          algorithm, control_qubit)
+                if omit_final_swaps else qubits)
+
+        first_time, second_time = self._PROBE_TIMES
+        first, second = (
+                list(cirq.flatten_op_tree(simulate_trotter(
+                    qubits, hamiltonian, time, n_steps, order, algorithm,
+                    control_qubit, omit_final_swaps)))
+                for time in self._PROBE_TIMES)
+        if len(first) != len(second):
+            raise ValueError('The number of operations of the circuit '
+                             'depends on the evolution time.')
+
+        # The exponent of the gate with Symbol 't{i}' is
+        # offsets[i] + slopes[i] * time
+        self._offsets = []  # type: List[float]
+        self._slopes = []  # type: List[float]
+        operations = []  # type: List[cirq.Operation]
+        for first_op, second_op in zip(first, second):
+            if first_op == second_op:
+                operations.append(first_op)
+                continue
+            first_gate = getattr(first_op, 'gate', None)
+            second_gate = getattr(second_op, 'gate', None)
+            if not (isinstance(first_gate, cirq.EigenGate) and
+                    type(first_gate) == type(second_gate) and
+                    first_op.qubits == second_op.qubits):
+                raise ValueError('The operation {!r} depends on the evolution '
+                                 'time but is not an exponentiated gate.'
+                                 .format(first_op))
+            # EigenGate keeps its exponent in _exponent
+            first_exponent = first_gate._exponent
+            second_exponent = second_gate._exponent
+            slope = ((second_exponent - first_exponent) /
+                     (second_time - first_time))
+            symbol = cirq.Symbol('t{}'.format(len(self._slopes)))
+            self._offsets.append(first_exponent - slope * first_time)
+            self._slopes.append(slope)
+            operations.append(
+                    first_gate._with_exponent(symbol).on(*first_op.qubits))
+        self.circuit = cirq.Circuit.from_ops(operations)
+
+    def param_resolver(self, time: float) -> cirq.ParamResolver:
+        """A resolver that sets the evolution time of the circuit."""
+        return cirq.ParamResolver(
+                {'t{}'.format(i): offset + slope * time
+                 for i, (offset, slope) in enumerate(
+                     zip(self._offsets, self._slopes))
+                 })
+
+    def param_sweep(self, times: Iterable[float]) -> List[cirq.ParamResolver]:
+        """Resolvers that set the evolution time to each of several times."""
+        return [self.param_resolver(time) for time in times]
+
+    def resolved_circuit(self, time: float) -> cirq.Circuit:
+        """The circuit for a particular evolution time."""
+        return self.circuit.with_parameters_resolved_by(
+                self.param_resolver(time))
+
+
+def _resolve_n_steps(hamiltonian: Hamiltonian,
+                     time: float,
+                     n_steps: Union[int, str],
+                     order: int,
+                     algorithm: Optional[TrotterAlgorithm],
+                     target_error: float) -> int:
+    """The number of Trotter steps to use, choosing it if it is 'auto'."""
+    if isinstance(n_steps, str):
+        if n_steps != 'auto':
+            raise ValueError("The number of Trotter steps must be an integer "
+                             "or 'auto', not {!r}.".format(n_steps))
+        return trotter_steps_for_error(
+                hamiltonian, time, target_error, order, algorithm)
+    return n_steps
+
+
 def _perform_trotter_step(qubits: Sequence[cirq.QubitId],
                           time: float,
                           order: int,
@@ -159,9 +402,22 @@ def _select_trotter_algorithm(hamiltonian: Hamiltonian) -> TrotterAlgorithm:
 
 def _select_trotter_step(hamiltonian: Hamiltonian,
                          order: int,
-                         algorithm: TrotterAlgorithm,
+                         algorithm: Optional[TrotterAlgorithm],
                          controlled: bool) -> TrotterStep:
     """Select a particular Trotter step from a Trotter step algorithm."""
+    if order < 0:
+        raise ValueError('The order of the Trotter formula must be at least 0.')
+
+    if algorithm is None:
+        algorithm = _select_trotter_algorithm(hamiltonian)
+
+    if not isinstance(hamiltonian, tuple(algorithm.supported_types)):
+        raise TypeError(
+                'The input Hamiltonian was a {} but the chosen Trotter step '
+                'algorithm only supports Hamiltonians of type {}'.format(
+                    type(hamiltonian).__name__,
+                    {cls.__name__ for cls in algorithm.supported_types}))
+
     if controlled:
         if order == 0:
             trotter_step = algorithm.controlled_asymmetric(hamiltonian)
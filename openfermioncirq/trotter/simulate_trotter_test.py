@@ -19,13 +19,16 @@ import scipy.sparse.linalg
 import cirq
 import openfermion
 
-from openfermioncirq import simulate_trotter
+from openfermioncirq import TrotterCircuitTemplate, simulate_trotter
 from openfermioncirq.trotter import (
         SPLIT_OPERATOR,
         LINEAR_SWAP_NETWORK,
         LOW_RANK,
         LowRankTrotterAlgorithm,
-        TrotterAlgorithm)
+        TrotterAlgorithm,
+        TrotterStep,
+        trotter_qubit_permutation,
+        trotter_steps_for_error)
 from openfermioncirq.trotter.trotter_algorithm import Hamiltonian
 
 
@@ -309,6 +312,51 @@ def test_simulate_trotter_omit_final_swaps():
     assert len(circuit_without_swaps) < len(circuit_with_swaps)
 
 
+@pytest.mark.parametrize(
+        'hamiltonian, order, n_steps, algorithm', [
+            (diag_coul_hamiltonian, 0, 1, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 0, 2, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 1, 3, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 2, 1, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 0, 3, SPLIT_OPERATOR),
+            (diag_coul_hamiltonian, 1, 1, SPLIT_OPERATOR),
+            (h2_hamiltonian, 0, 1, LOW_RANK),
+            (lih_hamiltonian, 0, 1, LowRankTrotterAlgorithm(final_rank=2)),
+            (lih_hamiltonian, 0, 3, LowRankTrotterAlgorithm(final_rank=3)),
+])
+@pytest.mark.parametrize('controlled', [False, True])
+def test_trotter_qubit_permutation(
+        hamiltonian, order, n_steps, algorithm, controlled):
+    n_qubits = openfermion.count_qubits(hamiltonian)
+    qubits = cirq.LineQubit.range(n_qubits)
+    control = cirq.LineQubit(-1) if controlled else None
+    all_qubits = [control] * controlled + qubits
+
+    # A random state with two particles, with the control qubit in |+>
+    system_state = openfermion.haar_random_vector(2**n_qubits, seed=16173)
+    system_state[[bin(i).count('1') != 2 for i in range(2**n_qubits)]] = 0
+    system_state /= numpy.linalg.norm(system_state)
+    initial_state = numpy.kron(numpy.ones(2**controlled), system_state)
+    initial_state /= numpy.linalg.norm(initial_state)
+
+    def final_state(omit_final_swaps):
+        circuit = cirq.Circuit.from_ops(simulate_trotter(
+            qubits, hamiltonian, longer_time, n_steps, order, algorithm,
+            control, omit_final_swaps))
+        return circuit.apply_unitary_effect_to_state(
+                initial_state, qubit_order=all_qubits)
+
+    permutation = trotter_qubit_permutation(
+            qubits, hamiltonian, n_steps, order, algorithm, control)
+    permuted_qubits = [control] * controlled + list(permutation)
+    permuted_state = final_state(True).reshape((2,) * len(all_qubits)
+            ).transpose([all_qubits.index(qubit)
+                         for qubit in permuted_qubits]).reshape(-1)
+
+    cirq.testing.assert_allclose_up_to_global_phase(
+            permuted_state, final_state(False), atol=1e-7)
+
+
 def test_simulate_trotter_bad_order_raises_error():
     qubits = cirq.LineQubit.range(2)
     hamiltonian = openfermion.random_diagonal_coulomb_hamiltonian(2, seed=0)
@@ -349,3 +397,138 @@ def test_simulate_trotter_unsupported_trotter_step_raises_error():
     with pytest.raises(ValueError):
         _ = next(simulate_trotter(qubits, hamiltonian, time, order=1,
                                   algorithm=algorithm, control_qubit=control))
+
+
+@pytest.mark.parametrize(
+        'hamiltonian, order, n_steps, algorithm, controlled', [
+            (diag_coul_hamiltonian, 0, 2, LINEAR_SWAP_NETWORK, False),
+            (diag_coul_hamiltonian, 1, 1, LINEAR_SWAP_NETWORK, True),
+            (diag_coul_hamiltonian, 2, 1, SPLIT_OPERATOR, False),
+            (diag_coul_hamiltonian, 0, 3, SPLIT_OPERATOR, True),
+            (h2_hamiltonian, 0, 2, LOW_RANK, False),
+            (lih_hamiltonian, 0, 2, LowRankTrotterAlgorithm(final_rank=2),
+                True),
+])
+def test_trotter_circuit_template_matches_simulate_trotter(
+        hamiltonian, order, n_steps, algorithm, controlled):
+    n_qubits = openfermion.count_qubits(hamiltonian)
+    qubits = cirq.LineQubit.range(n_qubits)
+    control = cirq.LineQubit(-1) if controlled else None
+
+    template = TrotterCircuitTemplate(
+            qubits, hamiltonian, n_steps, order, algorithm, control)
+
+    assert template.circuit.is_parameterized()
+    times = [short_time, longer_time, -2.7]
+    for time, resolver in zip(times, template.param_sweep(times)):
+        circuit = cirq.Circuit.from_ops(simulate_trotter(
+            qubits, hamiltonian, time, n_steps, order, algorithm, control))
+        resolved_circuit = template.circuit.with_parameters_resolved_by(
+                resolver)
+        assert len(resolved_circuit) == len(circuit)
+        numpy.testing.assert_allclose(
+                resolved_circuit.to_unitary_matrix(),
+                circuit.to_unitary_matrix(),
+                atol=1e-8)
+        assert (template.resolved_circuit(time) ==
+                resolved_circuit)
+
+
+def test_trotter_circuit_template_qubit_permutation():
+    qubits = cirq.LineQubit.range(4)
+
+    template = TrotterCircuitTemplate(qubits, diag_coul_hamiltonian,
+                                      n_steps=3, omit_final_swaps=True)
+    assert template.qubit_permutation == qubits[::-1]
+
+    template = TrotterCircuitTemplate(qubits, diag_coul_hamiltonian,
+                                      n_steps=3)
+    assert template.qubit_permutation == qubits
+
+
+def test_trotter_circuit_template_simulate():
+    qubits = cirq.LineQubit.range(4)
+    template = TrotterCircuitTemplate(qubits, h2_hamiltonian, n_steps=10,
+                                      algorithm=LOW_RANK)
+
+    final_state = template.resolved_circuit(
+            longer_time).apply_unitary_effect_to_state(h2_initial_state)
+    assert fidelity(final_state, h2_exact_state) > .9999
+
+
+def test_trotter_circuit_template_optimized_low_rank():
+    qubits = cirq.LineQubit.range(4)
+    algorithm = LowRankTrotterAlgorithm(optimize=True, angle_tolerance=1e-3)
+    exact_algorithm = LowRankTrotterAlgorithm(optimize=True,
+                                              angle_tolerance=0.0)
+    initial_state = openfermion.haar_random_vector(16, seed=2389)
+
+    template = TrotterCircuitTemplate(qubits, lih_hamiltonian, n_steps=5,
+                                      algorithm=algorithm)
+
+    for time in [short_time, longer_time, -2.7]:
+        unitary = template.resolved_circuit(time).to_unitary_matrix(
+                qubit_order=qubits)
+        # The template omits no gates, whatever their angle at this time
+        numpy.testing.assert_allclose(
+                unitary,
+                cirq.Circuit.from_ops(simulate_trotter(
+                    qubits, lih_hamiltonian, time, 5,
+                    algorithm=exact_algorithm)).to_unitary_matrix(
+                        qubit_order=qubits),
+                atol=1e-8)
+        circuit = cirq.Circuit.from_ops(simulate_trotter(
+            qubits, lih_hamiltonian, time, 5, algorithm=algorithm))
+        assert fidelity(
+                unitary.dot(initial_state),
+                circuit.to_unitary_matrix(qubit_order=qubits).dot(
+                    initial_state)) > .9999
+
+
+class MatrixTrotterStep(TrotterStep):
+    """Applies a matrix gate whose entries depend on the time."""
+
+    def trotter_step(self, qubits, time, control_qubit=None):
+        yield cirq.SingleQubitMatrixGate(numpy.diag(
+            [1, numpy.exp(1j * time)])).on(qubits[0])
+
+
+class TimeDependentLengthTrotterStep(TrotterStep):
+    """Applies more gates for longer times."""
+
+    def trotter_step(self, qubits, time, control_qubit=None):
+        for _ in range(int(time * 1e4)):
+            yield cirq.Z(qubits[0])
+
+
+@pytest.mark.parametrize('trotter_step_type',
+                         [MatrixTrotterStep, TimeDependentLengthTrotterStep])
+def test_trotter_circuit_template_unsupported_time_dependence(
+        trotter_step_type):
+    class UnsupportedTrotterAlgorithm(TrotterAlgorithm):
+        supported_types = {openfermion.DiagonalCoulombHamiltonian}
+
+        def asymmetric(self, hamiltonian):
+            return trotter_step_type(hamiltonian)
+
+    qubits = cirq.LineQubit.range(2)
+    hamiltonian = openfermion.random_diagonal_coulomb_hamiltonian(2, seed=0)
+    with pytest.raises(ValueError):
+        _ = TrotterCircuitTemplate(qubits, hamiltonian,
+                                   algorithm=UnsupportedTrotterAlgorithm())
+
+
+def test_simulate_trotter_auto_n_steps():
+    qubits = cirq.LineQubit.range(4)
+    hamiltonian = openfermion.random_diagonal_coulomb_hamiltonian(4, seed=8)
+    n_steps = trotter_steps_for_error(hamiltonian, 0.1, 1e-2, order=1)
+    assert n_steps > 1
+
+    circuit = cirq.Circuit.from_ops(simulate_trotter(
+        qubits, hamiltonian, 0.1, 'auto', order=1, target_error=1e-2))
+    correct_circuit = cirq.Circuit.from_ops(simulate_trotter(
+        qubits, hamiltonian, 0.1, n_steps, order=1))
+    assert circuit == correct_circuit
+
+    with pytest.raises(ValueError):
+        _ = next(simulate_trotter(qubits, hamiltonian, 0.1, 'many'))
@@ -18,6 +18,8 @@ import cirq
 from cirq import abc
 import openfermion
 
+from openfermioncirq.trotter.resources import TrotterResources
+
 if TYPE_CHECKING:
     # pylint: disable=unused-import
     from typing import Set, Type
@@ -114,6 +116,62 @@ class TrotterStep(metaclass=abc.ABCMeta):
         # Default: do nothing
         return ()
 
+    def prepare_resources(self,
+                          n_qubits: int,
+                          controlled: bool=False) -> TrotterResources:
+        """The resources used by `prepare`.
+
+        Subclasses may override the methods that return resources to count
+        them arithmetically. By default, the operations are constructed and
+        counted.
+
+        Args:
+            n_qubits: The number of system qubits.
+            controlled: Whether the algorithm is controlled.
+        """
+        qubits, control_qubit = _resource_qubits(n_qubits, controlled)
+        return TrotterResources.from_operations(
+                self.prepare(qubits, control_qubit))
+
+    def trotter_step_resources(self,
+                               n_qubits: int,
+                               controlled: bool=False) -> TrotterResources:
+        """The resources used by `trotter_step`.
+
+        Args:
+            n_qubits: The number of system qubits.
+            controlled: Whether the algorithm is controlled.
+        """
+        qubits, control_qubit = _resource_qubits(n_qubits, controlled)
+        return TrotterResources.from_operations(
+                self.trotter_step(qubits, 1.0, control_qubit))
+
+    def finish_resources(self,
+                         n_qubits: int,
+                         n_steps: int,
+                         controlled: bool=False,
+                         omit_final_swaps: bool=False) -> TrotterResources:
+        """The resources used by `finish`.
+
+        Args:
+            n_qubits: The number of system qubits.
+            n_steps: The total number of Trotter steps that have been performed.
+            controlled: Whether the algorithm is controlled.
+            omit_final_swaps: Whether or not to omit swap gates at the end of
+                the circuit.
+        """
+        qubits, control_qubit = _resource_qubits(n_qubits, controlled)
+        return TrotterResources.from_operations(
+                self.finish(qubits, n_steps, control_qubit, omit_final_swaps))
+
+
+def _resource_qubits(n_qubits: int, controlled: bool
+                     ) -> Tuple[Sequence[cirq.QubitId],
+                                Optional[cirq.QubitId]]:
+    """Qubits on which to construct operations to count them."""
+    qubits = cirq.LineQubit.range(n_qubits)
+    return qubits, cirq.LineQubit(-1) if controlled else None
+
 
 class TrotterAlgorithm(metaclass=abc.ABCMeta):
     """An algorithm for performing a Trotter step.
@@ -144,3 +202,13 @@ class TrotterAlgorithm(metaclass=abc.ABCMeta):
     def controlled_asymmetric(self, hamiltonian: Hamiltonian
                               ) -> Optional[TrotterStep]:
         return None
+
+    def with_time_independent_structure(self) -> 'TrotterAlgorithm':
+        """An algorithm whose circuits have the same gates at every time.
+
+        The circuits of the returned algorithm may differ from those of this
+        one only in the exponents of their gates. Algorithms that omit gates
+        whose angles, which scale with the evolution time, are small should
+        override this to return an algorithm that does not omit them.
+        """
+        return self
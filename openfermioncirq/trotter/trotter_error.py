@@ -0,0 +1,302 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Bounds on the error of Trotter-Suzuki product formulas."""
+
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy
+
+from openfermion import DiagonalCoulombHamiltonian, InteractionOperator
+from openfermioncirq.trotter.algorithms import (
+        LOW_RANK,
+        LowRankTrotterAlgorithm)
+from openfermioncirq.trotter.algorithms.low_rank import _low_rank_decomposition
+from openfermioncirq.trotter.trotter_algorithm import (
+        Hamiltonian,
+        TrotterAlgorithm)
+
+
+def trotter_error_bound(hamiltonian: Hamiltonian,
+                        time: float,
+                        n_steps: int=1,
+                        order: int=0,
+                        algorithm: Optional[TrotterAlgorithm]=None) -> float:
+    """Bound the error of simulating a Hamiltonian with a product formula.
+
+    The bound is on the spectral norm of the difference between the unitary
+    implemented by `simulate_trotter` and the exact time evolution, ignoring
+    the global phase from the constant term and the qubit permutations that
+    are undone at the end of the circuit.
+
+    The Hamiltonian is split into the factors that are exponentiated
+    separately: the hopping term of each pair of modes, the diagonal terms,
+    and for the low rank algorithm, each squared one-body operator of the
+    decomposition. The error of a Trotter step of duration t is at most
+    t^2 / 2 times the sum over pairs of factors of the norms of their
+    commutators. These norms are bounded by vectorized sums over the
+    coefficient tensors; hopping terms commute unless they share a mode, and
+    diagonal terms commute with hopping terms on other modes. For higher
+    order formulas, each symmetric stage is bounded in the same way, and the
+    result is also compared with the bound from the remainders of the Taylor
+    series, which decreases faster with the step size.
+
+    For the low rank algorithm, the error from truncating the decomposition
+    is added.
+
+    Args:
+        hamiltonian: The Hamiltonian to simulate.
+        time: The evolution time.
+        n_steps: The number of Trotter steps.
+        order: The order of the product formula.
+        algorithm: The algorithm used to simulate a single Trotter step.
+
+    The arguments have the same meaning as in `simulate_trotter`.
+
+    Raises:
+        ValueError: The order is negative or the number of steps is not
+            positive.
+        TypeError: The type of the Hamiltonian is not supported.
+    """
+    if n_steps < 1:
+        raise ValueError('The number of Trotter steps must be at least 1.')
+    coefficients = _error_coefficients(hamiltonian, order, algorithm)
+    return (min(coefficients.commutator * time**2 / n_steps,
+                coefficients.taylor * abs(time)**(coefficients.power + 1) /
+                n_steps**coefficients.power) +
+            coefficients.truncation * abs(time))
+
+
+def trotter_steps_for_error(hamiltonian: Hamiltonian,
+                            time: float,
+                            target_error: float,
+                            order: int=0,
+                            algorithm: Optional[TrotterAlgorithm]=None
+                            ) -> int:
+    """The fewest Trotter steps for which the error bound meets a target.
+
+    Args:
+        hamiltonian: The Hamiltonian to simulate.
+        time: The evolution time.
+        target_error: The largest acceptable value of `trotter_error_bound`.
+        order: The order of the product formula.
+        algorithm: The algorithm used to simulate a single Trotter step.
+
+    Raises:
+        ValueError: The target cannot be met with any number of steps
+            because the truncation error of the low rank decomposition is
+            too large, or the order is negative.
+        TypeError: The type of the Hamiltonian is not supported.
+    """
+    coefficients = _error_coefficients(hamiltonian, order, algorithm)
+    budget = target_error - coefficients.truncation * abs(time)
+    if budget <= 0:
+        raise ValueError('The truncation error of the low rank decomposition '
+                         'is larger than the target error.')
+
+    # Both bounds are monomials in 1 / n_steps, so they can be inverted
+    commutator_steps = math.ceil(coefficients.commutator * time**2 / budget)
+    taylor_steps = math.ceil(
+            (coefficients.taylor * abs(time)**(coefficients.power + 1) /
+             budget)**(1 / coefficients.power))
+    # math.ceil returns a float on Python 2
+    return int(max(1, min(commutator_steps, taylor_steps)))
+
+
+# The error bound for n_steps steps of total duration t is
+#     min(commutator * t^2 / n_steps,
+#         taylor * |t|^(power + 1) / n_steps^power) + truncation * |t|
+_ErrorCoefficients = NamedTuple('_ErrorCoefficients', [
+        ('commutator', float),
+        ('taylor', float),
+        ('power', int),
+        ('truncation', float)])
+
+
+def _error_coefficients(hamiltonian: Hamiltonian,
+                        order: int,
+                        algorithm: Optional[TrotterAlgorithm]
+                        ) -> _ErrorCoefficients:
+    if order < 0:
+        raise ValueError('The order of the Trotter formula must be at least 0.')
+    if algorithm is not None and not isinstance(
+            hamiltonian, tuple(algorithm.supported_types)):
+        raise TypeError(
+                'The input Hamiltonian was a {} but the chosen Trotter step '
+                'algorithm only supports Hamiltonians of type {}'.format(
+                    type(hamiltonian).__name__,
+                    {cls.__name__ for cls in algorithm.supported_types}))
+
+    truncation = 0.0
+    if isinstance(hamiltonian, DiagonalCoulombHamiltonian):
+        commutator_sum, norm_sum = _diagonal_coulomb_norms(hamiltonian)
+    elif isinstance(hamiltonian, InteractionOperator):
+        if not isinstance(algorithm, LowRankTrotterAlgorithm):
+            algorithm = LOW_RANK
+        commutator_sum, norm_sum, truncation = _low_rank_norms(
+                hamiltonian, algorithm)
+    else:
+        raise TypeError('Failed to bound the Trotter error for Hamiltonian '
+                        'of type {}.'.format(type(hamiltonian).__name__))
+
+    stage_times = _stage_times(order)
+    if order == 0:
+        # The first-order formula for a step of duration t has error at most
+        # t^2 / 2 times the sum of the norms of the commutators
+        commutator = commutator_sum / 2
+        power = 1
+    else:
+        # A symmetric stage of duration s is a first-order formula of
+        # duration s / 2 followed by its reverse
+        commutator = commutator_sum * sum(s**2 for s in stage_times) / 4
+        power = 2 * order
+    # The Taylor series of the formula and of the exact evolution agree up to
+    # the given power, and the remainders are bounded by the sum of the norms
+    # of all exponentiated factors
+    total_stage_time = sum(abs(s) for s in stage_times)
+    taylor = (norm_sum**(power + 1) * (total_stage_time**(power + 1) + 1) /
+              math.factorial(power + 1))
+    return _ErrorCoefficients(commutator, taylor, power, truncation)
+
+
+def _stage_times(order: int) -> List[float]:
+    """The durations of the symmetric stages of a step of unit duration.
+
+    This follows the recursion in `_perform_trotter_step`.
+    """
+    if order <= 1:
+        return [1.0]
+    split_time = 1 / (4 - 4**(1 / (2 * order - 1)))
+    inner = _stage_times(order - 1)
+    return ([split_time * s for s in inner] * 2 +
+            [(1 - 4 * split_time) * s for s in inner] +
+            [split_time * s for s in inner] * 2)
+
+
+def _diagonal_coulomb_norms(hamiltonian: DiagonalCoulombHamiltonian
+                            ) -> Tuple[float, float]:
+    """Commutator and norm sums of the factors of a swap network step."""
+    one_body = hamiltonian.one_body
+    two_body = hamiltonian.two_body.real
+    # The real and imaginary parts of each hopping term are separate gates
+    real = numpy.abs(one_body.real)
+    imag = numpy.abs(one_body.imag)
+    numpy.fill_diagonal(real, 0)
+    numpy.fill_diagonal(imag, 0)
+    hopping = real + imag
+
+    # The hopping term of p and q acts on the occupations (1, 0) and (0, 1)
+    # of the two modes, so its commutator with the diagonal terms is bounded
+    # by the largest change of the diagonal energy between them
+    diagonal = one_body.diagonal().real + two_body.diagonal()
+    differences = 2 * numpy.abs(two_body[:, numpy.newaxis, :] -
+                                two_body[numpy.newaxis, :, :])
+    energy_changes = (numpy.abs(diagonal[:, numpy.newaxis] -
+                                diagonal[numpy.newaxis, :]) +
+                      numpy.sum(differences, axis=2) -
+                      numpy.einsum('pqp->pq', differences) -
+                      numpy.einsum('pqq->pq', differences))
+
+    commutator_sum = (_hopping_commutator_sum(hopping) +
+                      numpy.sum(numpy.triu(
+                          hopping * energy_changes + 2 * real * imag, 1)))
+    norm_sum = (numpy.sum(numpy.triu(hopping, 1)) +
+                numpy.sum(numpy.abs(diagonal)) +
+                numpy.sum(numpy.abs(numpy.triu(two_body, 1))) * 2)
+    return commutator_sum, norm_sum
+
+
+def _low_rank_norms(hamiltonian: InteractionOperator,
+                    algorithm: LowRankTrotterAlgorithm
+                    ) -> Tuple[float, float, float]:
+    """Commutator and norm sums of the factors of a low rank step, and the
+    truncation error."""
+    decomposition = _low_rank_decomposition(hamiltonian.two_body_tensor,
+                                            algorithm.spin_basis)
+    rank = decomposition.rank(algorithm.truncation_threshold,
+                              algorithm.final_rank)
+    truncation = decomposition.truncation_error(rank)
+    eigenvalues = decomposition.eigenvalues[:rank]
+    one_body_squares = decomposition.one_body_squares(rank)
+    # Only the real part of the one-body coefficients is simulated
+    one_body = (hamiltonian.one_body_tensor +
+                decomposition.one_body_correction).real
+    hopping = numpy.abs(one_body)
+    numpy.fill_diagonal(hopping, 0)
+    diagonal = one_body.diagonal()
+
+    # Each squared one-body operator G_j^2 is exponentiated exactly in its
+    # eigenbasis, and the norm of G_j follows from its eigenvalues
+    one_body_eigenvalues, _ = decomposition.diagonalize(rank)
+    square_roots_norms = _one_body_norms(one_body_eigenvalues)
+    weights = 2 * numpy.abs(eigenvalues) * square_roots_norms
+    squares_norms = numpy.abs(eigenvalues) * square_roots_norms**2
+    hopping_sum = numpy.sum(numpy.triu(hopping, 1))
+    diagonal_norm = _one_body_norms(diagonal[numpy.newaxis])[0]
+
+    # For any X, the norm of [X, G^2] is at most 2 |G| |[X, G]|, and the
+    # commutator of two one-body operators is a one-body operator.
+    # The commutator of the hopping term of p and q with G has a matrix with
+    # nonzero entries only in rows and columns p and q, whose trace norm is
+    # bounded by the norms of those rows
+    row_norms = numpy.linalg.norm(one_body_squares, axis=2)
+    hopping_commutators = 2 * numpy.einsum(
+            'pq,jp->j', hopping, row_norms)
+    diagonal_commutators = _anti_hermitian_norms(
+            (diagonal[:, numpy.newaxis] - diagonal[numpy.newaxis, :]) *
+            one_body_squares)
+    squares_commutators = 0.0
+    for j in range(len(eigenvalues)):
+        others = one_body_squares[j + 1:]
+        commutators = (numpy.matmul(one_body_squares[j], others) -
+                       numpy.matmul(others, one_body_squares[j]))
+        squares_commutators += weights[j] * numpy.dot(
+                weights[j + 1:], _anti_hermitian_norms(commutators))
+
+    commutator_sum = (
+            _hopping_commutator_sum(hopping) +
+            numpy.sum(numpy.triu(
+                hopping * numpy.abs(diagonal[:, numpy.newaxis] -
+                                    diagonal[numpy.newaxis, :]), 1)) +
+            numpy.dot(weights, hopping_commutators + diagonal_commutators) +
+            squares_commutators)
+    norm_sum = hopping_sum + diagonal_norm + numpy.sum(squares_norms)
+    return commutator_sum, norm_sum, truncation
+
+
+def _hopping_commutator_sum(hopping: numpy.ndarray) -> float:
+    """Bound the commutators of all pairs of hopping terms.
+
+    The hopping terms of two pairs of modes commute unless the pairs share
+    exactly one mode, and then their commutator is a hopping term between
+    the other two modes whose magnitude is the product of the magnitudes.
+    Summing over the shared mode q and the pairs of other modes p < r gives
+    (row_sum_q^2 - sum_p hopping_pq^2) / 2 for each q.
+    """
+    return numpy.sum(numpy.sum(hopping, axis=1)**2 -
+                     numpy.sum(hopping**2, axis=1)) / 2
+
+
+def _one_body_norms(eigenvalues: numpy.ndarray) -> numpy.ndarray:
+    """The norms of number-conserving one-body operators.
+
+    The largest magnitude of sum_p e_p n_p over occupations is attained by
+    occupying either all modes with positive or all with negative e_p.
+    """
+    return numpy.maximum(numpy.sum(numpy.maximum(eigenvalues, 0), axis=-1),
+                         -numpy.sum(numpy.minimum(eigenvalues, 0), axis=-1))
+
+
+def _anti_hermitian_norms(matrices: numpy.ndarray) -> numpy.ndarray:
+    """The norms of one-body operators with anti-Hermitian matrices."""
+    return _one_body_norms(numpy.linalg.eigvalsh(-1j * matrices))
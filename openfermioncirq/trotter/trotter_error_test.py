@@ -0,0 +1,128 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import pytest
+import scipy.sparse.linalg
+
+import openfermion
+
+from openfermioncirq.trotter import (
+        LINEAR_SWAP_NETWORK,
+        LOW_RANK,
+        SPLIT_OPERATOR,
+        LowRankTrotterAlgorithm,
+        simulate_trotter_state,
+        trotter_error_bound,
+        trotter_steps_for_error)
+
+
+diag_coul_hamiltonian = openfermion.random_diagonal_coulomb_hamiltonian(
+        4, real=False, seed=27194)
+
+bond_length = 1.45
+geometry = [('Li', (0., 0., 0.)), ('H', (0., 0., bond_length))]
+lih_hamiltonian = openfermion.load_molecular_hamiltonian(
+        geometry, 'sto-3g', 1, format(bond_length), 2, 2)
+
+
+@pytest.mark.parametrize(
+        'hamiltonian, time, order, n_steps, algorithm', [
+            (diag_coul_hamiltonian, 0.5, 0, 4, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 0.5, 1, 2, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 0.5, 2, 1, LINEAR_SWAP_NETWORK),
+            (diag_coul_hamiltonian, 0.5, 0, 4, SPLIT_OPERATOR),
+            (diag_coul_hamiltonian, 0.5, 1, 2, SPLIT_OPERATOR),
+            (lih_hamiltonian, 2.0, 0, 1, LOW_RANK),
+            (lih_hamiltonian, 2.0, 0, 5, LOW_RANK),
+            (lih_hamiltonian, 2.0, 0, 5, LowRankTrotterAlgorithm(final_rank=2)),
+])
+def test_trotter_error_bound_exceeds_error(
+        hamiltonian, time, order, n_steps, algorithm):
+    initial_state = openfermion.haar_random_vector(16, seed=3381)
+    exact_state = scipy.sparse.linalg.expm_multiply(
+            -1j * time * openfermion.get_sparse_operator(hamiltonian),
+            initial_state)
+    final_state = simulate_trotter_state(
+            initial_state, hamiltonian, time, n_steps, order, algorithm)
+
+    # The distance between the states up to a global phase, which ignores
+    # the phase from the constant term that is not simulated
+    error = numpy.sqrt(2 - 2 * abs(numpy.vdot(final_state, exact_state)))
+    bound = trotter_error_bound(hamiltonian, time, n_steps, order, algorithm)
+
+    assert error <= bound
+    assert bound < 1000 * error
+
+
+@pytest.mark.parametrize(
+        'hamiltonian, order, target_error', [
+            (diag_coul_hamiltonian, 0, 1e-2),
+            (diag_coul_hamiltonian, 1, 1e-2),
+            (diag_coul_hamiltonian, 2, 1e-4),
+            (lih_hamiltonian, 0, 1e-3),
+])
+def test_trotter_steps_for_error_is_minimal(hamiltonian, order, target_error):
+    n_steps = trotter_steps_for_error(hamiltonian, 1.0, target_error, order)
+
+    assert isinstance(n_steps, int)
+    assert trotter_error_bound(hamiltonian, 1.0, n_steps, order) <= (
+            target_error * (1 + 1e-12))
+    assert (n_steps == 1 or
+            trotter_error_bound(hamiltonian, 1.0, n_steps - 1, order) >
+            target_error)
+
+
+def test_trotter_error_bound_scaling():
+    # The first-order bound is inversely proportional to the number of steps
+    first, second = (trotter_error_bound(diag_coul_hamiltonian, 1.0, n_steps)
+                     for n_steps in (100, 200))
+    assert first / second == pytest.approx(2)
+
+    # Higher order formulas need fewer steps for a small error
+    steps = [trotter_steps_for_error(diag_coul_hamiltonian, 1.0, 1e-6, order)
+             for order in range(3)]
+    assert steps[0] > steps[1] > steps[2]
+
+    # The evolution time enters through the product with the Hamiltonian
+    assert trotter_error_bound(diag_coul_hamiltonian, -2.0, 3) == (
+            pytest.approx(trotter_error_bound(
+                openfermion.DiagonalCoulombHamiltonian(
+                    2 * diag_coul_hamiltonian.one_body,
+                    2 * diag_coul_hamiltonian.two_body),
+                1.0, 3)))
+
+
+def test_trotter_error_bound_includes_truncation_error():
+    algorithm = LowRankTrotterAlgorithm(final_rank=1)
+    truncation_error = trotter_error_bound(
+            lih_hamiltonian, 1.0, 10**12, algorithm=algorithm)
+    assert truncation_error > 1e-3
+    assert trotter_error_bound(
+            lih_hamiltonian, 1.0, 10**12, algorithm=LOW_RANK) < 1e-6
+
+    with pytest.raises(ValueError):
+        _ = trotter_steps_for_error(lih_hamiltonian, 1.0,
+                                    truncation_error / 2,
+                                    algorithm=algorithm)
+
+
+def test_trotter_error_bound_bad_arguments_raise_error():
+    with pytest.raises(ValueError):
+        _ = trotter_error_bound(diag_coul_hamiltonian, 1.0, order=-1)
+    with pytest.raises(ValueError):
+        _ = trotter_error_bound(diag_coul_hamiltonian, 1.0, n_steps=0)
+    with pytest.raises(TypeError):
+        _ = trotter_error_bound(diag_coul_hamiltonian, 1.0,
+                                algorithm=LOW_RANK)
+    with pytest.raises(TypeError):
+        _ = trotter_steps_for_error(openfermion.FermionOperator(), 1.0, 1e-3)
@@ -14,6 +14,13 @@
 
 from openfermioncirq.variational.ansatz import VariationalAnsatz
 
+from openfermioncirq.variational.catalog import CatalogEntry, StudyCatalog
+
+from openfermioncirq.variational.executor import (
+    DistributedExecutor,
+    RepetitionExecutor,
+    run_worker)
+
 from openfermioncirq.variational.ansatzes import (
     SplitOperatorTrotterAnsatz,
     SwapNetworkTrotterAnsatz)
@@ -24,3 +31,7 @@ from openfermioncirq.variational.hamiltonian_objective import (
 from openfermioncirq.variational.objective import VariationalObjective
 
 from openfermioncirq.variational.study import VariationalStudy
+
+from openfermioncirq.variational.layerwise import (
+    map_layer_params,
+    optimize_layerwise)
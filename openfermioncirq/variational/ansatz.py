@@ -19,6 +19,8 @@ import numpy
 import cirq
 from cirq import abc
 
+from openfermioncirq.primitives import pack_moments
+
 
 class VariationalAnsatz(metaclass=abc.ABCMeta):
     """A variational ansatz.
@@ -53,9 +55,7 @@ class VariationalAnsatz(metaclass=abc.ABCMeta):
                        for param_name in self.param_names()}
 
         # Generate the ansatz circuit
-        self.circuit = cirq.Circuit.from_ops(
-                self.operations(self.qubits),
-                strategy=cirq.InsertStrategy.EARLIEST)
+        self.circuit = cirq.Circuit(pack_moments(self.operations(self.qubits)))
 
     @abc.abstractmethod
     def param_names(self) -> Sequence[str]:
@@ -0,0 +1,233 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""An index of saved variational studies."""
+
+from typing import Any, Hashable, Iterator, List, Optional, TYPE_CHECKING
+
+import contextlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy
+
+if TYPE_CHECKING:
+    # pylint: disable=unused-import
+    from openfermioncirq.variational.study import VariationalStudy
+
+
+class CatalogEntry:
+    """A trial result recorded in a StudyCatalog.
+
+    Attributes:
+        study_name: The name of the study containing the trial result.
+        path: The absolute path of the saved study file.
+        file_format: The format the study was saved in.
+        ansatz: The class name of the ansatz of the study.
+        objective: The class name of the objective of the study.
+        num_qubits: The number of qubits used by the ansatz.
+        identifier: The identifier of the trial result within the study.
+        algorithm: The name of the optimization algorithm used.
+        repetitions: The number of repetitions of the trial result.
+        optimal_value: The optimal value of the trial result, or None if
+            there is none.
+    """
+
+    def __init__(self,
+                 study_name: str,
+                 path: str,
+                 file_format: str,
+                 ansatz: str,
+                 objective: str,
+                 num_qubits: int,
+                 identifier: Hashable,
+                 algorithm: str,
+                 repetitions: int,
+                 optimal_value: Optional[float]) -> None:
+        self.study_name = study_name
+        self.path = path
+        self.file_format = file_format
+        self.ansatz = ansatz
+        self.objective = objective
+        self.num_qubits = num_qubits
+        self.identifier = identifier
+        self.algorithm = algorithm
+        self.repetitions = repetitions
+        self.optimal_value = optimal_value
+
+
+class StudyCatalog:
+    """A SQLite index of saved studies and their trial results.
+
+    The catalog records the metadata of each study and the optimal value of
+    each of its trial results, so that queries across many saved studies do
+    not need to load any of them. Pass a catalog to `VariationalStudy.save`
+    to keep it up to date.
+
+    Example::
+        catalog = StudyCatalog('studies.sqlite')
+        study.save(catalog=catalog)
+        best = catalog.best(ansatz='SwapNetworkTrotterAnsatz',
+                            algorithm='COBYLA')
+        print(best.study_name, best.identifier, best.optimal_value)
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Args:
+            filename: The SQLite database file. It is created if it does
+                not exist.
+        """
+        self.filename = filename
+        with self._connect() as connection:
+            connection.execute(
+                    'CREATE TABLE IF NOT EXISTS studies ('
+                    'path TEXT PRIMARY KEY, name TEXT, file_format TEXT, '
+                    'ansatz TEXT, objective TEXT, num_qubits INTEGER, '
+                    'num_params INTEGER, saved_at REAL)')
+            connection.execute(
+                    'CREATE TABLE IF NOT EXISTS trials ('
+                    'path TEXT, identifier TEXT, algorithm TEXT, '
+                    'repetitions INTEGER, optimal_value REAL)')
+            connection.execute(
+                    'CREATE INDEX IF NOT EXISTS trials_path ON trials (path)')
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection and commit, or roll back on error, when done."""
+        connection = sqlite3.connect(self.filename)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def update(self,
+               study: 'VariationalStudy',
+               path: str,
+               file_format: str) -> None:
+        """Record a saved study, replacing any previous record of the file.
+
+        Args:
+            study: The study that was saved.
+            path: The file the study was saved to.
+            file_format: The format the study was saved in.
+        """
+        path = os.path.abspath(path)
+        stats = study.statistics()
+        trial_rows = [
+                (path,
+                 json.dumps(identifier, default=repr),
+                 result.params.algorithm.name,
+                 int(repetitions),
+                 None if numpy.isnan(optimal_value) else float(optimal_value))
+                for identifier, result, repetitions, optimal_value
+                in zip(stats.identifiers,
+                       study.trial_results.values(),
+                       stats.repetitions,
+                       stats.optimal_values)]
+        with self._connect() as connection:
+            connection.execute('DELETE FROM trials WHERE path = ?', (path,))
+            connection.execute(
+                    'INSERT OR REPLACE INTO studies VALUES '
+                    '(?, ?, ?, ?, ?, ?, ?, ?)',
+                    (path,
+                     study.name,
+                     file_format,
+                     type(study.ansatz).__name__,
+                     type(study.objective).__name__,
+                     len(study.ansatz.qubits),
+                     study.num_params,
+                     time.time()))
+            connection.executemany('INSERT INTO trials VALUES (?, ?, ?, ?, ?)',
+                                   trial_rows)
+
+    def remove(self, path: str) -> None:
+        """Remove the record of a saved study file."""
+        path = os.path.abspath(path)
+        with self._connect() as connection:
+            connection.execute('DELETE FROM trials WHERE path = ?', (path,))
+            connection.execute('DELETE FROM studies WHERE path = ?', (path,))
+
+    def query(self,
+              study_name: Optional[str]=None,
+              ansatz: Optional[str]=None,
+              objective: Optional[str]=None,
+              algorithm: Optional[str]=None,
+              num_qubits: Optional[int]=None,
+              limit: Optional[int]=None) -> List[CatalogEntry]:
+        """Find trial results matching the given criteria.
+
+        Criteria that are not specified are not used for filtering. Results
+        are sorted by optimal value, with trial results that have no
+        optimal value last.
+
+        Args:
+            study_name: The name of the study.
+            ansatz: The class name of the ansatz.
+            objective: The class name of the objective.
+            algorithm: The name of the optimization algorithm.
+            num_qubits: The number of qubits of the ansatz.
+            limit: The maximum number of entries to return.
+        """
+        conditions = []  # type: List[str]
+        values = []  # type: List[Any]
+        for column, value in (('studies.name', study_name),
+                              ('studies.ansatz', ansatz),
+                              ('studies.objective', objective),
+                              ('trials.algorithm', algorithm),
+                              ('studies.num_qubits', num_qubits)):
+            if value is not None:
+                conditions.append('{} = ?'.format(column))
+                values.append(value)
+        sql = ('SELECT studies.name, studies.path, studies.file_format, '
+               'studies.ansatz, studies.objective, studies.num_qubits, '
+               'trials.identifier, trials.algorithm, trials.repetitions, '
+               'trials.optimal_value '
+               'FROM trials JOIN studies ON trials.path = studies.path')
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += (' ORDER BY trials.optimal_value IS NULL, '
+                'trials.optimal_value, trials.rowid')
+        if limit is not None:
+            sql += ' LIMIT ?'
+            values.append(limit)
+
+        with self._connect() as connection:
+            rows = connection.execute(sql, values).fetchall()
+        return [CatalogEntry(name, path, file_format, ansatz_name,
+                             objective_name, qubits,
+                             _identifier_from_json(json.loads(identifier)),
+                             algorithm_name, repetitions, optimal_value)
+                for (name, path, file_format, ansatz_name, objective_name,
+                     qubits, identifier, algorithm_name, repetitions,
+                     optimal_value) in rows]
+
+    def best(self, **criteria) -> Optional[CatalogEntry]:
+        """The trial result with the lowest optimal value matching criteria.
+
+        Takes the same keyword arguments as `query`, except `limit`. Returns
+        None if no trial result with an optimal value matches.
+        """
+        entries = self.query(limit=1, **criteria)
+        if not entries or entries[0].optimal_value is None:
+            return None
+        return entries[0]
+
+
+def _identifier_from_json(identifier: Any) -> Hashable:
+    """Undo the conversion of tuples to lists by JSON."""
+    if isinstance(identifier, list):
+        return tuple(_identifier_from_json(item) for item in identifier)
+    return identifier
@@ -0,0 +1,82 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+
+import numpy
+
+from openfermioncirq.optimization import (
+        COBYLA,
+        OptimizationParams,
+        OptimizationResult,
+        OptimizationTrialResult)
+from openfermioncirq.testing import (
+        ExampleAlgorithm,
+        ExampleAnsatz,
+        ExampleVariationalObjective)
+from openfermioncirq.variational import StudyCatalog, VariationalStudy
+
+
+def make_study(name, datadir, values):
+    study = VariationalStudy(name,
+                             ExampleAnsatz(),
+                             ExampleVariationalObjective(),
+                             datadir=datadir)
+    for identifier, algorithm, value in values:
+        study.trial_results[identifier] = OptimizationTrialResult(
+                [OptimizationResult(optimal_value=value,
+                                    optimal_parameters=numpy.zeros(2))],
+                OptimizationParams(algorithm))
+    return study
+
+
+def test_study_catalog(tmpdir):
+    datadir = str(tmpdir)
+    filename = os.path.join(datadir, 'catalog.sqlite')
+
+    study_a = make_study('a', datadir, [('run0', COBYLA, 2.0),
+                                        (('run', 1), ExampleAlgorithm(), 1.0)])
+    study_b = make_study('b', datadir, [('run0', COBYLA, 1.5),
+                                        ('skipped', COBYLA, numpy.nan)])
+    study_a.save(catalog=filename)
+    study_b.save(file_format='npz', catalog=StudyCatalog(filename))
+
+    catalog = StudyCatalog(filename)
+    entries = catalog.query()
+    assert [(e.study_name, e.identifier) for e in entries] == [
+            ('a', ('run', 1)), ('b', 'run0'), ('a', 'run0'), ('b', 'skipped')]
+    assert entries[-1].optimal_value is None
+
+    best = catalog.best(ansatz='ExampleAnsatz', algorithm='COBYLA')
+    assert best.study_name == 'b'
+    assert best.identifier == 'run0'
+    assert best.optimal_value == 1.5
+    assert best.file_format == 'npz'
+    assert best.path == os.path.abspath(os.path.join(datadir, 'b.npz'))
+    assert best.objective == 'ExampleVariationalObjective'
+    assert best.num_qubits == 2
+    assert best.repetitions == 1
+
+    assert catalog.best(algorithm='SLSQP') is None
+    assert len(catalog.query(study_name='a', limit=1)) == 1
+    assert len(catalog.query(num_qubits=3)) == 0
+
+    # Saving again replaces the previous record of the file
+    study_a.trial_results['run0'].extend(
+            [OptimizationResult(optimal_value=0.5,
+                                optimal_parameters=numpy.zeros(2))])
+    study_a.save(catalog=catalog)
+    assert catalog.best().optimal_value == 0.5
+    assert len(catalog.query(study_name='a')) == 2
+
+    catalog.remove(os.path.join(datadir, 'a.study'))
+    assert {e.study_name for e in catalog.query()} == {'b'}
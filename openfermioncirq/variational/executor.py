@@ -0,0 +1,358 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Executors that run the repetitions of optimization runs."""
+
+from typing import (
+        Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple)
+
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.managers
+import queue
+import socket
+import threading
+
+from cirq import abc
+
+
+class RepetitionExecutor(metaclass=abc.ABCMeta):
+    """Runs the repetitions of optimization runs of a VariationalStudy.
+
+    An executor can be passed to the optimization methods of
+    VariationalStudy to control where repetitions are run. The study calls
+    `map` with a module-level function and picklable argument tuples, so an
+    executor is free to run them in other processes or on other hosts.
+    """
+
+    @abc.abstractmethod
+    def map(self,
+            function: Callable[[Any], Any],
+            iterable: Iterable[Any]) -> Iterator[Any]:
+        """Apply a function to each item and yield the results in order.
+
+        Exceptions raised by the function are raised by the returned
+        iterator.
+        """
+        pass
+
+    def new_event(self) -> Any:
+        """An event that can be shared with the function applied by `map`."""
+        return threading.Event()
+
+    def new_queue(self) -> Any:
+        """A queue that can be shared with the function applied by `map`."""
+        return queue.Queue()
+
+
+class DistributedExecutor(RepetitionExecutor):
+    """Sends repetitions to worker processes over TCP connections.
+
+    The executor acts as a coordinator that listens for workers on
+    `address`. Workers, possibly on other hosts, connect by calling
+    `run_worker` with the same address and authentication key. Each
+    connected worker is sent one task at a time. If a worker disconnects,
+    its task is put back in the queue and handed to another worker. A worker
+    that does not return a result within `task_timeout` seconds may only be
+    slow, so it stays connected while a copy of its task is handed to
+    another worker, and the first result returned is used.
+
+    Messages are pickled, so workers must be able to import the ansatz,
+    objective and algorithm classes of the study, and the authentication key
+    should only be given to trusted workers. Events and queues shared with
+    workers, which are used to stop at the target and to report progress,
+    are served by a manager process listening on `manager_host`.
+
+    Example::
+        # On the coordinator
+        executor = DistributedExecutor(authkey=b'secret',
+                                       address=('0.0.0.0', 6000))
+        study.optimize_sweep(param_sweep, repetitions=100, executor=executor)
+        executor.close()
+
+        # On each worker host
+        run_worker(('coordinator-host', 6000), authkey=b'secret')
+
+    Attributes:
+        address: The address the coordinator listens on.
+        manager_host: The host the manager listens on, which workers connect
+            to in order to use shared events and queues.
+        task_timeout: The number of seconds after which a copy of a task
+            whose result has not been returned is handed to another worker.
+    """
+
+    def __init__(self,
+                 authkey: bytes,
+                 address: Tuple[str, int]=('localhost', 0),
+                 task_timeout: Optional[float]=None,
+                 manager_host: Optional[str]=None) -> None:
+        """
+        Args:
+            authkey: The key used to authenticate workers. It must not be
+                empty.
+            address: The host and port to listen on. A port of 0 chooses a
+                free port, which can be read from the `address` attribute.
+            task_timeout: An optional number of seconds after which a copy
+                of a task whose result has not been returned is handed to
+                another worker.
+            manager_host: The host the manager listens on. Workers must be
+                able to reach it by this name. The default is the host of
+                `address`, unless that is a wildcard such as '0.0.0.0', in
+                which case it is the address of this host's fully qualified
+                domain name.
+
+        Raises:
+            ValueError: The authentication key is empty.
+        """
+        _check_authkey(authkey)
+        self.task_timeout = task_timeout
+        self._authkey = authkey
+        self._listener = multiprocessing.connection.Listener(
+                address, authkey=authkey)
+        self.address = self._listener.address  # type: Tuple[str, int]
+        if manager_host is None:
+            manager_host = self.address[0]
+            if manager_host in _WILDCARD_HOSTS:
+                # Workers cannot connect to a wildcard address
+                manager_host = socket.gethostbyname(socket.getfqdn())
+        self.manager_host = manager_host
+        self._tasks = queue.Queue()  # type: queue.Queue
+        self._result_queues = {}  # type: Dict[int, queue.Queue]
+        self._cancelled = set()  # type: Set[int]
+        self._finished = set()  # type: Set[Tuple[int, int]]
+        self._map_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._num_workers = 0
+        self._closed = False
+        self._manager = None \
+                # type: Optional[multiprocessing.managers.SyncManager]
+        self._accept_thread = threading.Thread(target=self._accept,
+                                               daemon=True)
+        self._accept_thread.start()
+
+    @property
+    def num_workers(self) -> int:
+        """The number of workers currently connected."""
+        return self._num_workers
+
+    def map(self,
+            function: Callable[[Any], Any],
+            iterable: Iterable[Any]) -> Iterator[Any]:
+        """Run a function on the workers and yield the results in order.
+
+        All tasks are queued immediately. The returned iterator blocks until
+        workers have returned the results.
+        """
+        items = list(iterable)
+        results = queue.Queue()  # type: queue.Queue
+        with self._lock:
+            map_id = next(self._map_ids)
+            self._result_queues[map_id] = results
+        for index, item in enumerate(items):
+            self._tasks.put(((map_id, index), function, item))
+        return self._collect(map_id, len(items), results)
+
+    def new_event(self) -> Any:
+        return self._get_manager().Event()
+
+    def new_queue(self) -> Any:
+        return self._get_manager().Queue()
+
+    def close(self) -> None:
+        """Stop accepting workers and tell connected workers to exit."""
+        if self._closed:
+            return
+        self._closed = True
+        self._tasks.put(None)
+        # Wake up the thread blocked in accept so that it can exit
+        try:
+            socket.create_connection(self.address).close()
+        except OSError:  # coverage: ignore
+            pass
+        self._accept_thread.join()
+        self._listener.close()
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def __enter__(self) -> 'DistributedExecutor':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _get_manager(self) -> multiprocessing.managers.SyncManager:
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.managers.SyncManager(
+                        address=(self.manager_host, 0),
+                        authkey=self._authkey)
+                self._manager.start()
+            return self._manager
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection = self._listener.accept()
+            except (EOFError, OSError, multiprocessing.AuthenticationError):
+                if self._closed:
+                    return
+                continue
+            if self._closed:
+                connection.close()
+                return
+            threading.Thread(target=self._serve,
+                             args=(connection,),
+                             daemon=True).start()
+
+    def _serve(self, connection: multiprocessing.connection.Connection
+               ) -> None:
+        """Hand tasks to a connected worker until it is lost or closed."""
+        with self._lock:
+            self._num_workers += 1
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    # Let the other workers see the shutdown as well
+                    self._tasks.put(None)
+                    connection.send(None)
+                    return
+                (map_id, index), function, item = task
+                with self._lock:
+                    if (map_id in self._cancelled or
+                            (map_id, index) in self._finished):
+                        # The map was abandoned, or this is a copy of a
+                        # task that another worker finished after a timeout
+                        continue
+                try:
+                    connection.send((function, item))
+                except (EOFError, OSError):
+                    self._tasks.put(task)
+                    return
+                except Exception as e:
+                    # The task could not be pickled
+                    self._deliver(map_id, index, False, e)
+                    continue
+                requeued = False
+                try:
+                    if (self.task_timeout is not None and
+                            not connection.poll(self.task_timeout)):
+                        # The worker may only be slow, so it keeps running
+                        # the task while a copy is handed to another worker
+                        self._tasks.put(task)
+                        requeued = True
+                    success, value = connection.recv()
+                except (EOFError, OSError):
+                    # The worker is lost, so give the task to another one
+                    if not requeued:
+                        self._tasks.put(task)
+                    return
+                self._deliver(map_id, index, success, value)
+        except (EOFError, OSError):  # coverage: ignore
+            pass
+        finally:
+            connection.close()
+            with self._lock:
+                self._num_workers -= 1
+
+    def _deliver(self,
+                 map_id: int,
+                 index: int,
+                 success: bool,
+                 value: Any) -> None:
+        with self._lock:
+            results = self._result_queues.get(map_id)
+            if results is not None:
+                self._finished.add((map_id, index))
+        if results is not None:
+            results.put((index, success, value))
+
+    def _collect(self,
+                 map_id: int,
+                 num_items: int,
+                 results: queue.Queue) -> Iterator[Any]:
+        received = {}  # type: Dict[int, Any]
+        next_index = 0
+        try:
+            while next_index < num_items:
+                index, success, value = results.get()
+                if index < next_index or index in received:
+                    continue
+                if not success:
+                    raise value
+                received[index] = value
+                while next_index in received:
+                    yield received.pop(next_index)
+                    next_index += 1
+        finally:
+            with self._lock:
+                del self._result_queues[map_id]
+                self._cancelled.add(map_id)
+                self._finished = {task_id for task_id in self._finished
+                                  if task_id[0] != map_id}
+
+
+def run_worker(address: Tuple[str, int], authkey: bytes) -> int:
+    """Run tasks from a DistributedExecutor until it is closed.
+
+    The authentication key also becomes the key of the current process, so
+    that events and queues shared by the executor can be used.
+
+    Args:
+        address: The address of the executor.
+        authkey: The key used to authenticate with the executor.
+
+    Returns:
+        The number of tasks that were run.
+
+    Raises:
+        ValueError: The authentication key is empty.
+    """
+    _check_authkey(authkey)
+    multiprocessing.current_process().authkey = authkey
+    connection = multiprocessing.connection.Client(address, authkey=authkey)
+    num_tasks = 0
+    with connection:
+        while True:
+            try:
+                task = connection.recv()
+            except EOFError:
+                break
+            if task is None:
+                break
+            function, item = task
+            try:
+                result = (True, function(item))  # type: Tuple[bool, Any]
+            except Exception as e:
+                result = (False, e)
+            try:
+                connection.send(result)
+            except (EOFError, OSError):  # coverage: ignore
+                break
+            except Exception as e:
+                # The result could not be pickled
+                connection.send((False, RuntimeError(
+                    'Could not send the result of a task: {!r}'.format(e))))
+            num_tasks += 1
+    return num_tasks
+
+
+# Hosts on which a socket listens on all interfaces
+_WILDCARD_HOSTS = ('', '0.0.0.0', '::')
+
+
+def _check_authkey(authkey: bytes) -> None:
+    if not isinstance(authkey, bytes) or not authkey:
+        raise ValueError('The authentication key must be a non-empty bytes '
+                         'object.')
@@ -0,0 +1,195 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+
+from openfermioncirq.optimization import OptimizationParams, SKIPPED
+from openfermioncirq.testing import (
+        ExampleAlgorithm,
+        ExampleAnsatz,
+        ExampleVariationalObjective)
+from openfermioncirq.variational import (
+        DistributedExecutor,
+        RepetitionExecutor,
+        VariationalStudy,
+        run_worker)
+
+
+AUTHKEY = b'executor_test'
+
+
+def square(x):
+    if x < 0:
+        raise ValueError('negative')
+    return x * x
+
+
+def square_unless_fragile(x):
+    if os.environ.get('FRAGILE_WORKER') == 'crash':
+        os._exit(1)
+    if os.environ.get('FRAGILE_WORKER') == 'hang':
+        time.sleep(60)
+    if os.environ.get('FRAGILE_WORKER') == 'slow':
+        time.sleep(1.5)
+    return x * x
+
+
+def run_crashing_worker(address, authkey):
+    os.environ['FRAGILE_WORKER'] = 'crash'
+    run_worker(address, authkey)
+
+
+def run_hanging_worker(address, authkey):
+    os.environ['FRAGILE_WORKER'] = 'hang'
+    run_worker(address, authkey)
+
+
+def run_slow_worker(address, authkey):
+    os.environ['FRAGILE_WORKER'] = 'slow'
+    # Report the number of tasks run in the exit code
+    sys.exit(run_worker(address, authkey))
+
+
+def start_worker(executor, target=run_worker):
+    worker = multiprocessing.Process(target=target,
+                                     args=(executor.address, AUTHKEY))
+    worker.start()
+    return worker
+
+
+def wait_for_workers(executor, num_workers):
+    deadline = time.time() + 10
+    while executor.num_workers != num_workers:
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_repetition_executor_is_abstract():
+    with pytest.raises(TypeError):
+        _ = RepetitionExecutor()
+
+
+def test_distributed_executor_requires_authkey():
+    with pytest.raises(ValueError):
+        _ = DistributedExecutor(authkey=b'')
+    with pytest.raises(ValueError):
+        run_worker(('localhost', 6000), authkey=b'')
+
+
+def test_distributed_executor_manager_host():
+    with DistributedExecutor(authkey=AUTHKEY,
+                             address=('0.0.0.0', 0)) as executor:
+        assert executor.manager_host not in ('', '0.0.0.0')
+        worker = start_worker(executor)
+        event = executor.new_event()
+        assert event._token.address[0] == executor.manager_host
+        assert list(executor.map(square, [3])) == [9]
+    worker.join()
+
+    with DistributedExecutor(authkey=AUTHKEY) as executor:
+        assert executor.manager_host == executor.address[0]
+
+
+def test_distributed_executor_map():
+    with DistributedExecutor(authkey=AUTHKEY) as executor:
+        workers = [start_worker(executor) for _ in range(2)]
+        assert list(executor.map(square, range(10))) == [
+                x * x for x in range(10)]
+        with pytest.raises(ValueError):
+            list(executor.map(square, [1, -1, 2]))
+        assert list(executor.map(square, [])) == []
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+
+def test_distributed_executor_requeues_tasks_of_lost_workers():
+    with DistributedExecutor(authkey=AUTHKEY) as executor:
+        # The only worker crashes on its first task
+        fragile = start_worker(executor, run_crashing_worker)
+        wait_for_workers(executor, 1)
+        results = executor.map(square_unless_fragile, [3, 4])
+        fragile.join()
+        assert fragile.exitcode == 1
+
+        # The task is handed to the next worker
+        worker = start_worker(executor)
+        assert list(results) == [9, 16]
+    worker.join()
+
+
+def test_distributed_executor_task_timeout():
+    with DistributedExecutor(authkey=AUTHKEY, task_timeout=0.5) as executor:
+        # The only worker hangs on its first task
+        fragile = start_worker(executor, run_hanging_worker)
+        wait_for_workers(executor, 1)
+        results = executor.map(square_unless_fragile, [5])
+        worker = start_worker(executor)
+        assert list(results) == [25]
+        fragile.terminate()
+    fragile.join()
+    worker.join()
+
+
+def test_distributed_executor_task_timeout_keeps_slow_worker():
+    with DistributedExecutor(authkey=AUTHKEY, task_timeout=0.5) as executor:
+        # The only worker takes longer than the timeout
+        slow = start_worker(executor, run_slow_worker)
+        wait_for_workers(executor, 1)
+        assert list(executor.map(square_unless_fragile, [5])) == [25]
+
+        # The worker stays connected and is given further tasks
+        assert executor.num_workers == 1
+        assert list(executor.map(square_unless_fragile, [6])) == [36]
+    slow.join()
+
+    # The copy of the first task was not run again
+    assert slow.exitcode == 2
+
+
+def test_variational_study_with_distributed_executor():
+    study = VariationalStudy('study',
+                             ExampleAnsatz(),
+                             ExampleVariationalObjective(),
+                             target=2.0,
+                             seed=0)
+    reports = []
+    with DistributedExecutor(authkey=AUTHKEY) as executor:
+        workers = [start_worker(executor) for _ in range(2)]
+        study.optimize_sweep([OptimizationParams(ExampleAlgorithm())] * 2,
+                             ['a', 'b'],
+                             repetitions=3,
+                             executor=executor,
+                             progress_callback=lambda *args:
+                                 reports.append(args))
+        study.optimize(OptimizationParams(ExampleAlgorithm()),
+                       'c',
+                       repetitions=3,
+                       executor=executor,
+                       stop_at_target=True)
+    for worker in workers:
+        worker.join()
+
+    assert [result.repetitions for result in study.trial_results.values()
+            ] == [3, 3, 3]
+    assert len(reports) == 30
+    assert study.trial_results['c'].results[0].status != SKIPPED
+
+    with pytest.raises(ValueError):
+        study.optimize(OptimizationParams(ExampleAlgorithm()),
+                       executor=executor,
+                       use_threads=True)
@@ -104,9 +104,15 @@ class HamiltonianObjective(VariationalObjective):
         variance of an energy measurement with a certain measurement strategy;
         see arXiv:1801.03524 for a derivation.
         """
+        return self.noise_with_rng(cost)
+
+    def noise_with_rng(self,
+                       cost: Optional[float]=None,
+                       rng: Optional['numpy.random.Generator']=None) -> float:
         if cost is None:
             return 0.0
-        return numpy.random.normal(
+        random = numpy.random if rng is None else rng
+        return random.normal(
                 loc=0.0, scale=numpy.sqrt(self.variance_bound / cost))
 
     def noise_bounds(self,
@@ -0,0 +1,157 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Layer-wise growth of ansatzes with repeated iterations."""
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import copy
+import re
+
+import numpy
+
+import cirq
+
+from openfermioncirq.optimization import OptimizationParams
+from openfermioncirq.variational.ansatz import VariationalAnsatz
+from openfermioncirq.variational.objective import VariationalObjective
+from openfermioncirq.variational.study import VariationalStudy
+
+
+_ITERATION_SUFFIX_PATTERN = re.compile('(.*)-([0-9]+)$')
+
+
+def map_layer_params(params: numpy.ndarray,
+                     source: VariationalAnsatz,
+                     target: VariationalAnsatz,
+                     fill: Optional[numpy.ndarray]=None) -> numpy.ndarray:
+    """Map parameters of an ansatz onto an ansatz with more iterations.
+
+    Ansatzes such as SwapNetworkTrotterAnsatz name the parameters of
+    iteration i with the suffix '-i', or with no suffix if there is only
+    one iteration. A parameter of the target ansatz takes the value of the
+    parameter of the source ansatz with the same name and iteration.
+    Parameters that the source ansatz does not have, such as those of the
+    new iterations, take their value from `fill`.
+
+    Args:
+        params: The parameters of the source ansatz.
+        source: The ansatz the parameters belong to.
+        target: The ansatz to map the parameters onto.
+        fill: The values to use for parameters of the target ansatz that
+            the source ansatz does not have. The default is to use the
+            default initial parameters of the target ansatz. For
+            SwapNetworkTrotterAnsatz, zeros make each new iteration act as
+            the identity, so the target circuit starts out equal to the
+            source circuit.
+
+    Raises:
+        ValueError: The number of parameters does not match the source
+            ansatz.
+    """
+    source_names = source.param_names()
+    if len(params) != len(source_names):
+        raise ValueError('Got {} parameters but the source ansatz has {}.'
+                         .format(len(params), len(source_names)))
+    if fill is None:
+        fill = target.default_initial_params()
+
+    values = {_split_iteration(name): value
+              for name, value in zip(source_names, params)
+              }  # type: Dict[Tuple[str, int], float]
+    return numpy.array([values.get(_split_iteration(name), default)
+                        for name, default in zip(target.param_names(), fill)])
+
+
+def optimize_layerwise(name: str,
+                       ansatzes: Iterable[VariationalAnsatz],
+                       objective: VariationalObjective,
+                       optimization_params: OptimizationParams,
+                       identifier: Hashable='layerwise',
+                       target: Optional[float]=None,
+                       preparation_circuit: Optional[cirq.Circuit]=None,
+                       datadir: Optional[str]=None,
+                       zero_new_layers: bool=False,
+                       **kwargs: Any) -> List[VariationalStudy]:
+    """Optimize ansatzes of growing depth, warm-starting each from the last.
+
+    A study is created for each ansatz, named after `name` and the index of
+    the ansatz. The first ansatz is optimized with the given optimization
+    parameters. Each later ansatz starts from the optimal parameters of the
+    previous one, mapped with `map_layer_params`. Growth stops early once a
+    study reaches the target value, if one is given.
+
+    Example::
+        ansatzes = [SwapNetworkTrotterAnsatz(hamiltonian, iterations=i)
+                    for i in range(1, 5)]
+        studies = optimize_layerwise('hubbard', ansatzes, objective,
+                                     OptimizationParams(COBYLA),
+                                     zero_new_layers=True)
+        print(studies[-1].trial_results['layerwise'].optimal_value)
+
+    Args:
+        name: The prefix of the names of the studies.
+        ansatzes: The ansatzes to optimize, in order of increasing depth.
+        objective: The objective function.
+        optimization_params: The parameters of the optimization runs. The
+            initial guesses are replaced for all but the first ansatz.
+        identifier: The identifier of the run in each study.
+        target: An optional target value of the studies.
+        preparation_circuit: An optional circuit to apply prior to the
+            ansatz circuits.
+        datadir: The directory to use when saving the studies.
+        zero_new_layers: Whether to initialize parameters of new iterations
+            to zero instead of to the default initial parameters of the
+            ansatz.
+        **kwargs: Other keyword arguments accepted by
+            `VariationalStudy.optimize`.
+
+    Returns:
+        The studies, one for each ansatz that was optimized.
+    """
+    studies = []  # type: List[VariationalStudy]
+    params = optimization_params
+    for ansatz in ansatzes:
+        if studies:
+            previous = studies[-1]
+            fill = numpy.zeros(len(ansatz.params)) if zero_new_layers else None
+            initial_guess = map_layer_params(
+                    previous.trial_results[identifier].optimal_parameters,
+                    previous.ansatz,
+                    ansatz,
+                    fill)
+            params = copy.copy(optimization_params)
+            params.initial_guess = initial_guess
+            params.initial_guess_array = initial_guess[numpy.newaxis]
+
+        study = VariationalStudy('{}_{}'.format(name, len(studies)),
+                                 ansatz,
+                                 objective,
+                                 target=target,
+                                 preparation_circuit=preparation_circuit,
+                                 datadir=datadir)
+        result = study.optimize(params, identifier, **kwargs)
+        studies.append(study)
+
+        if result.optimal_parameters is None:
+            break
+        if target is not None and result.optimal_value <= target:
+            break
+    return studies
+
+
+def _split_iteration(param_name: str) -> Tuple[str, int]:
+    """Split a parameter name into its base name and iteration."""
+    match = _ITERATION_SUFFIX_PATTERN.match(param_name)
+    if match is None:
+        return param_name, 0
+    return match.group(1), int(match.group(2))
@@ -0,0 +1,104 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import pytest
+
+import cirq
+import openfermion
+
+from openfermioncirq.optimization import (
+        OptimizationParams,
+        ScipyOptimizationAlgorithm)
+from openfermioncirq.variational import (
+        HamiltonianObjective,
+        SwapNetworkTrotterAnsatz,
+        map_layer_params,
+        optimize_layerwise)
+from openfermioncirq.variational.study import VariationalBlackBox
+
+
+hubbard_hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+        openfermion.fermi_hubbard(1, 2, 1., 4.))
+ansatzes = [SwapNetworkTrotterAnsatz(hubbard_hamiltonian, iterations=i)
+            for i in range(1, 4)]
+objective = HamiltonianObjective(hubbard_hamiltonian)
+algorithm = ScipyOptimizationAlgorithm(kwargs={'method': 'COBYLA'},
+                                       options={'maxiter': 10})
+
+
+def final_state(ansatz, params):
+    return cirq.google.XmonSimulator().simulate(
+            ansatz.circuit,
+            param_resolver=ansatz.param_resolver(params),
+            qubit_order=ansatz.qubit_permutation(ansatz.qubits)).final_state
+
+
+def test_map_layer_params():
+    one, two, three = ansatzes
+    params = numpy.arange(len(one.params)) * 0.1
+
+    mapped = map_layer_params(params, one, two)
+    default = two.default_initial_params()
+    for name, value, default_value in zip(two.param_names(), mapped, default):
+        if name.endswith('-0'):
+            assert value == params[one.param_names().index(name[:-2])]
+        else:
+            assert value == default_value
+
+    grown = map_layer_params(mapped, two, three,
+                             fill=numpy.zeros(len(three.params)))
+    numpy.testing.assert_allclose(grown[:len(mapped)], mapped)
+    numpy.testing.assert_allclose(grown[len(mapped):], 0)
+
+    # Zero parameters make the new iterations act as the identity
+    zero_filled = map_layer_params(params, one, three,
+                                   fill=numpy.zeros(len(three.params)))
+    cirq.testing.assert_allclose_up_to_global_phase(
+            final_state(one, params),
+            final_state(three, zero_filled),
+            atol=1e-6)
+
+    with pytest.raises(ValueError):
+        map_layer_params(params[:-1], one, two)
+
+
+def test_optimize_layerwise():
+    studies = optimize_layerwise('hubbard',
+                                 ansatzes[:2],
+                                 objective,
+                                 OptimizationParams(algorithm),
+                                 zero_new_layers=True)
+    assert [study.name for study in studies] == ['hubbard_0', 'hubbard_1']
+
+    first, second = [study.trial_results['layerwise'] for study in studies]
+    numpy.testing.assert_allclose(
+            second.params.initial_guess,
+            map_layer_params(first.optimal_parameters,
+                             ansatzes[0],
+                             ansatzes[1],
+                             numpy.zeros(len(ansatzes[1].params))))
+    numpy.testing.assert_allclose(
+            VariationalBlackBox(ansatzes[1], objective).evaluate(
+                second.params.initial_guess),
+            first.optimal_value,
+            atol=1e-6)
+    assert second.optimal_value <= first.optimal_value + 1e-6
+
+
+def test_optimize_layerwise_stops_at_target():
+    studies = optimize_layerwise('hubbard',
+                                 ansatzes,
+                                 objective,
+                                 OptimizationParams(algorithm),
+                                 target=numpy.inf)
+    assert len(studies) == 1
@@ -54,6 +54,19 @@ class VariationalObjective(metaclass=abc.ABCMeta):
         # Default: no noise
         return 0.0
 
+    def noise_with_rng(self,
+                       cost: Optional[float]=None,
+                       rng: Optional['numpy.random.Generator']=None) -> float:
+        """Artificial noise drawn from a given random number generator.
+
+        This is what a VariationalStudy adds to the objective value, with the
+        generator of the repetition. Objectives with random noise should
+        override it to draw from `rng`, or from numpy's global random state
+        if it is None, and make `noise` call it. The default calls `noise`,
+        so objectives that only override `noise` keep working.
+        """
+        return self.noise(cost)
+
     def noise_bounds(self,
                      cost: float,
                      confidence: Optional[float]=None
@@ -43,6 +43,23 @@ def test_variational_objective_noise():
     assert -0.6 < test_objective_noisy.noise(2.0) < 0.6
 
 
+def test_variational_objective_noise_with_rng():
+    assert test_objective.noise_with_rng(2.0, numpy.random.RandomState(3)
+                                         ) == 0.0
+    assert (test_objective_noisy.noise_with_rng(
+                2.0, numpy.random.RandomState(3)) ==
+            test_objective_noisy.noise_with_rng(
+                2.0, numpy.random.RandomState(3)))
+
+    class ConstantNoiseObjective(ExampleVariationalObjective):
+        def noise(self, cost=None):
+            return 1.0
+
+    # Objectives that only override noise keep their noise model
+    assert ConstantNoiseObjective().noise_with_rng(
+            2.0, numpy.random.RandomState(3)) == 1.0
+
+
 def test_variational_objective_noise_bounds():
     assert test_objective.noise_bounds(100) == (-numpy.inf, numpy.inf)
 
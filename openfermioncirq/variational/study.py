@@ -13,29 +13,52 @@
 """The variational study class."""
 
 from typing import (
-        Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, cast)
+        Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional,
+        Sequence, Tuple, Union, cast)
 
 import collections
+import concurrent.futures
+import functools
 import itertools
+import json
 import multiprocessing
 import os
 import pickle
+import queue
+import random
+import threading
 import time
+import warnings
 
 import numpy
 
 import cirq
 
 from openfermioncirq.variational.ansatz import VariationalAnsatz
+from openfermioncirq.variational.catalog import (
+        StudyCatalog,
+        _identifier_from_json)
+from openfermioncirq.variational.executor import RepetitionExecutor
 from openfermioncirq.variational.objective import VariationalObjective
+from openfermioncirq.optimization import serialization
 from openfermioncirq.optimization import (
+        BUDGET_EXHAUSTED,
         BlackBox,
+        BudgetExhausted,
         OptimizationParams,
+        OptimizationProgress,
         OptimizationResult,
         OptimizationTrialResult,
+        SKIPPED,
         StatefulBlackBox)
 
 
+ProgressCallback = Callable[[Hashable, int, OptimizationProgress], None]
+
+NPZ_FORMAT_VERSION = 1
+"""The version of the format written by `VariationalStudy.save('npz')`."""
+
+
 class VariationalStudy:
     """The results from optimizing a variational ansatz.
 
@@ -67,6 +90,19 @@ class VariationalStudy:
             optimization runs of the study. Key is the identifier used to
             label the run.
         num_params: The number of parameters in the circuit.
+
+    Repetitions that are not given explicit seeds draw them from a
+    `numpy.random.SeedSequence` belonging to the study. Each repetition uses
+    its own `numpy.random.Generator` seeded with its seed, which is passed to
+    the black box and from there to the algorithm and the objective noise,
+    so a repetition gives the same result however the repetitions are
+    scheduled. With numpy older than 1.17, which has neither, the seeds are
+    drawn from RandomStates seeded with the entropy of the study, and each
+    repetition uses a `numpy.random.RandomState`. Code that still draws from
+    numpy's global random state, such as measurement sampling in the
+    simulator, is made reproducible by seeding the global state with the
+    seed of the repetition, except when repetitions run in threads, which
+    all share the global state.
     """
 
     def __init__(self,
@@ -75,7 +111,9 @@ class VariationalStudy:
                  objective: VariationalObjective,
                  target: Optional[float]=None,
                  preparation_circuit: Optional[cirq.Circuit]=None,
-                 datadir: Optional[str]=None) -> None:
+                 datadir: Optional[str]=None,
+                 seed: Optional[Union[int, 'numpy.random.SeedSequence']]=None
+                 ) -> None:
         """
         Args:
             name: The name of the study.
@@ -86,6 +124,9 @@ class VariationalStudy:
                 It should use the qubits belonging to the ansatz.
             datadir: The directory to use when saving the study. The default
                 behavior is to use the current working directory.
+            seed: An optional seed, or SeedSequence, from which the seeds
+                of repetitions are drawn. The default behavior is to use
+                fresh entropy from the operating system.
         """
         # TODO store results as a pandas DataFrame?
         self.name = name
@@ -97,6 +138,13 @@ class VariationalStudy:
         self._preparation_circuit = preparation_circuit or cirq.Circuit()
         self._circuit = self._preparation_circuit + self._ansatz.circuit
         self.datadir = datadir
+        if not isinstance(seed, _seed_sequence_types()):
+            seed = _new_seed_sequence(seed)
+        self._seed_sequence = seed
+        self._executor = None \
+                # type: Optional[concurrent.futures.ThreadPoolExecutor]
+        self._statistics_cache = None \
+                # type: Optional[Tuple[Any, StudyStatistics]]
 
     def optimize(self,
                  optimization_params: OptimizationParams,
@@ -107,7 +155,15 @@ class VariationalStudy:
                  repetitions: int=1,
                  seeds: Optional[Sequence[int]]=None,
                  use_multiprocessing: bool=False,
-                 num_processes: Optional[int]=None
+                 num_processes: Optional[int]=None,
+                 use_threads: bool=False,
+                 executor: Optional[RepetitionExecutor]=None,
+                 stop_at_target: bool=False,
+                 target_tolerance: float=0.0,
+                 checkpoint: bool=False,
+                 resume: bool=False,
+                 progress_callback: Optional[ProgressCallback]=None,
+                 progress_interval: int=1
                  ) -> OptimizationTrialResult:
         """Perform an optimization run and save the results.
 
@@ -146,13 +202,45 @@ class VariationalStudy:
                 a lot more memory.
             repetitions: The number of times to run the optimization.
             seeds: Random number generator seeds to use for the repetitions.
-                The default behavior is to randomly generate an independent seed
-                for each repetition.
+                The default behavior is to draw an independent seed for each
+                repetition from the study's SeedSequence.
             use_multiprocessing: Whether to use multiprocessing to run
                 repetitions in different processes.
-            num_processes: The number of processes to use for multiprocessing.
-                The default behavior is to use the output of
+            num_processes: The number of worker processes or threads to
+                use. The default behavior is to use the output of
                 `multiprocessing.cpu_count()`.
+            use_threads: Whether to run repetitions in a pool of threads
+                of the calling process. Unlike multiprocessing, this does
+                not copy the ansatz and objective, which are shared by all
+                threads and must not be modified during the run. It speeds
+                up the run when evaluations spend most of their time in
+                code that releases the GIL, such as numpy and scipy.sparse.
+                numpy's global random state is not seeded for each
+                repetition in this mode, so only random numbers drawn from
+                the generator of the black box are reproducible.
+            executor: An optional RepetitionExecutor that runs the
+                repetitions, for example a DistributedExecutor that sends
+                them to workers on other hosts.
+            stop_at_target: Whether to stop early once a repetition reaches
+                the target value of the study. Repetitions that have not
+                started by then are skipped and recorded with status SKIPPED.
+            target_tolerance: A repetition reaches the target if its optimal
+                value is at most the target plus this tolerance.
+            progress_callback: An optional function that is called in the
+                calling process with the identifier of the run, the seed of
+                the repetition and an OptimizationProgress every
+                `progress_interval` evaluations. Repetitions then use a
+                StatefulBlackBox, as if `stateful` were set.
+            progress_interval: The number of evaluations between progress
+                reports.
+            checkpoint: Whether to append each finished repetition to a
+                checkpoint file as soon as it completes. The checkpoint file
+                is stored next to the study file and removed by `save`.
+            resume: Whether to resume from an existing checkpoint file.
+                Repetitions recorded in the checkpoint are reused and only
+                the missing ones are run. If `seeds` is given, the missing
+                repetitions are those whose seed is not in the checkpoint.
+                New repetitions are appended to the checkpoint.
 
         Side effects:
             Saves the returned OptimizationTrialResult into the `trial_results`
@@ -166,7 +254,15 @@ class VariationalStudy:
                                    repetitions,
                                    seeds,
                                    use_multiprocessing,
-                                   num_processes)[0]
+                                   num_processes,
+                                   use_threads,
+                                   executor,
+                                   stop_at_target,
+                                   target_tolerance,
+                                   checkpoint,
+                                   resume,
+                                   progress_callback,
+                                   progress_interval)[0]
 
     def optimize_sweep(self,
                        param_sweep: Iterable[OptimizationParams],
@@ -177,7 +273,15 @@ class VariationalStudy:
                        repetitions: int=1,
                        seeds: Optional[Sequence[int]]=None,
                        use_multiprocessing: bool=False,
-                       num_processes: Optional[int]=None
+                       num_processes: Optional[int]=None,
+                       use_threads: bool=False,
+                       executor: Optional[RepetitionExecutor]=None,
+                       stop_at_target: bool=False,
+                       target_tolerance: float=0.0,
+                       checkpoint: bool=False,
+                       resume: bool=False,
+                       progress_callback: Optional[ProgressCallback]=None,
+                       progress_interval: int=1
                        ) -> List[OptimizationTrialResult]:
         """Perform multiple optimization runs and save the results.
 
@@ -209,21 +313,114 @@ class VariationalStudy:
             repetitions: The number of times to run the algorithm for each
                 set of optimization parameters.
             seeds: Random number generator seeds to use for the repetitions.
-                The default behavior is to randomly generate an independent seed
-                for each repetition.
+                The default behavior is to draw an independent seed for each
+                repetition from the study's SeedSequence.
             use_multiprocessing: Whether to use multiprocessing to run
                 repetitions in different processes.
-            num_processes: The number of processes to use for multiprocessing.
-                The default behavior is to use the output of
+            num_processes: The number of worker processes or threads to
+                use. The default behavior is to use the output of
                 `multiprocessing.cpu_count()`.
+            use_threads: Whether to run repetitions in a pool of threads
+                of the calling process. Unlike multiprocessing, this does
+                not copy the ansatz and objective, which are shared by all
+                threads and must not be modified during the run. It speeds
+                up the run when evaluations spend most of their time in
+                code that releases the GIL, such as numpy and scipy.sparse.
+                numpy's global random state is not seeded for each
+                repetition in this mode, so only random numbers drawn from
+                the generator of the black box are reproducible.
+            executor: An optional RepetitionExecutor that runs the
+                repetitions, for example a DistributedExecutor that sends
+                them to workers on other hosts.
+            stop_at_target: Whether to stop each run early once one of its
+                repetitions reaches the target value of the study. The
+                repetitions of that run that have not started by then are
+                skipped and recorded with status SKIPPED. The other runs of
+                the sweep are not affected.
+            target_tolerance: A repetition reaches the target if its optimal
+                value is at most the target plus this tolerance.
+            progress_callback: An optional function that is called in the
+                calling process with the identifier of the run, the seed of
+                the repetition and an OptimizationProgress every
+                `progress_interval` evaluations. Repetitions then use a
+                StatefulBlackBox, as if `stateful` were set.
+            progress_interval: The number of evaluations between progress
+                reports.
+            checkpoint: Whether to append each finished repetition to a
+                checkpoint file as soon as it completes. The checkpoint file
+                is stored next to the study file and removed by `save`.
+            resume: Whether to resume from an existing checkpoint file.
+                Repetitions recorded in the checkpoint are reused and only
+                the missing ones are run. If `seeds` is given, the missing
+                repetitions are those whose seed is not in the checkpoint.
+                New repetitions are appended to the checkpoint.
 
         Side effects:
             Saves the returned OptimizationTrialResult into the results
             dictionary
+
+        Raises:
+            ValueError: `stop_at_target` was set but the study has no target,
+                or more than one of `use_multiprocessing`, `use_threads`
+                and `executor` were given.
+        """
+        return self._optimize_sweep(param_sweep,
+                                    identifiers,
+                                    reevaluate_final_params,
+                                    stateful,
+                                    save_x_vals,
+                                    repetitions,
+                                    seeds,
+                                    use_multiprocessing,
+                                    num_processes,
+                                    use_threads,
+                                    executor,
+                                    stop_at_target,
+                                    target_tolerance,
+                                    checkpoint,
+                                    resume,
+                                    progress_callback,
+                                    progress_interval)
+
+    def _optimize_sweep(
+            self,
+            param_sweep: Iterable[OptimizationParams],
+            identifiers: Optional[Iterable[Hashable]]=None,
+            reevaluate_final_params: bool=False,
+            stateful: bool=False,
+            save_x_vals: bool=False,
+            repetitions: int=1,
+            seeds: Optional[Sequence[int]]=None,
+            use_multiprocessing: bool=False,
+            num_processes: Optional[int]=None,
+            use_threads: bool=False,
+            executor: Optional[RepetitionExecutor]=None,
+            stop_at_target: bool=False,
+            target_tolerance: float=0.0,
+            checkpoint: bool=False,
+            resume: bool=False,
+            progress_callback: Optional[ProgressCallback]=None,
+            progress_interval: int=1,
+            cancel_event: Any=None,
+            result_callback: Optional[
+                Callable[[Hashable, OptimizationResult], None]]=None
+            ) -> List[OptimizationTrialResult]:
+        """Implementation of `optimize_sweep`.
+
+        Args:
+            cancel_event: An event that, once set, causes the repetitions of
+                all runs that have not started yet to be skipped.
+            result_callback: A function called in the calling process with
+                the identifier and result of each repetition as soon as the
+                repetition finishes.
         """
         if seeds is not None and len(seeds) < repetitions:
             raise ValueError(
                     "Provided fewer RNG seeds than the number of repetitions.")
+        _check_execution_mode(use_multiprocessing, use_threads, executor)
+
+        stop_threshold = self._stop_threshold(stop_at_target,
+                                              target_tolerance)
 
         if identifiers is None:
             # Choose a sequence of integers as identifiers
@@ -235,29 +432,161 @@ class VariationalStudy:
                 start = 0
             identifiers = itertools.count(cast(int, start))  # type: ignore
 
+        completed = self._load_checkpoint() if resume else {}
+        checkpoint_file = None
+        if checkpoint or resume:
+            self._make_datadir()
+            checkpoint_file = open(self._filename('checkpoint'),
+                                   'ab' if resume else 'wb')
+
         trial_results = []
 
-        for identifier, optimization_params in zip(identifiers, param_sweep):
+        try:
+            for identifier, optimization_params in zip(identifiers,
+                                                       param_sweep):
+
+                # Only run the repetitions missing from the checkpoint
+                done = completed.get(identifier, [])
+                if seeds is not None:
+                    done_seeds = {result.seed for result in done}
+                    remaining_seeds = [
+                            seed for seed in seeds[:repetitions]
+                            if seed not in done_seeds
+                    ]  # type: Optional[List[int]]
+                    remaining = len(cast(List[int], remaining_seeds))
+                elif done:
+                    # Spawn the seeds of all repetitions so that the new
+                    # ones continue the sequence instead of repeating the
+                    # seeds already used by the completed repetitions
+                    done_seeds = {result.seed for result in done}
+                    remaining = max(repetitions - len(done), 0)
+                    remaining_seeds = [
+                            seed for seed in self._spawn_seeds(repetitions)
+                            if seed not in done_seeds][:remaining]
+                    remaining = len(remaining_seeds)
+                else:
+                    remaining_seeds = None
+                    remaining = repetitions
+
+                def on_result(result: OptimizationResult,
+                              identifier: Hashable=identifier) -> None:
+                    if checkpoint_file is not None:
+                        _write_checkpoint(checkpoint_file, identifier, result)
+                    if result_callback is not None:
+                        result_callback(identifier, result)
+
+                # Each run stops at the target independently of the others
+                result_list = done + self._get_result_list(
+                        optimization_params,
+                        reevaluate_final_params,
+                        stateful,
+                        save_x_vals,
+                        remaining,
+                        remaining_seeds,
+                        use_multiprocessing,
+                        num_processes,
+                        use_threads,
+                        executor,
+                        _new_event(use_multiprocessing, executor)
+                        if stop_at_target else None,
+                        stop_threshold,
+                        on_result,
+                        functools.partial(progress_callback, identifier)
+                        if progress_callback is not None else None,
+                        progress_interval,
+                        cancel_event)
+
+                trial_result = OptimizationTrialResult(result_list,
+                                                       optimization_params)
+                trial_results.append(trial_result)
+
+                # Save the result into the trial_results dictionary
+                self.trial_results[identifier] = trial_result
+        finally:
+            if checkpoint_file is not None:
+                checkpoint_file.close()
 
-            result_list = self._get_result_list(
-                    optimization_params,
-                    reevaluate_final_params,
-                    stateful,
-                    save_x_vals,
-                    repetitions,
-                    seeds,
-                    use_multiprocessing,
-                    num_processes)
+        return trial_results
 
-            trial_result = OptimizationTrialResult(result_list,
-                                                   optimization_params)
-            trial_results.append(trial_result)
+    def optimize_async(self,
+                       optimization_params: OptimizationParams,
+                       identifier: Optional[Hashable]=None,
+                       **kwargs) -> 'OptimizationFuture':
+        """Start an optimization run in the background.
 
-            # Save the result into the trial_results dictionary
-            self.trial_results[identifier] = trial_result
+        This is like `optimize`, but returns immediately. The run is
+        executed by an executor owned by the study, which runs one
+        asynchronous job at a time in submission order. The returned
+        OptimizationFuture resolves to the OptimizationTrialResult of the
+        run.
 
-        return trial_results
+        Args:
+            optimization_params: The parameters of the optimization run.
+            identifier: An optional identifier for the run.
+            **kwargs: Other keyword arguments accepted by `optimize`.
+        """
+        return self._submit([optimization_params],
+                            [identifier] if identifier else None,
+                            kwargs,
+                            single=True)
+
+    def optimize_sweep_async(self,
+                             param_sweep: Iterable[OptimizationParams],
+                             identifiers: Optional[Iterable[Hashable]]=None,
+                             **kwargs) -> 'OptimizationFuture':
+        """Start multiple optimization runs in the background.
+
+        This is like `optimize_sweep`, but returns immediately. The returned
+        OptimizationFuture resolves to the list of OptimizationTrialResults
+        of the runs.
+
+        Args:
+            param_sweep: The parameters for the optimization runs.
+            identifiers: Optional identifiers for the runs.
+            **kwargs: Other keyword arguments accepted by `optimize_sweep`.
+        """
+        return self._submit(list(param_sweep),
+                            identifiers,
+                            kwargs,
+                            single=False)
+
+    def _submit(self,
+                param_sweep: List[OptimizationParams],
+                identifiers: Optional[Iterable[Hashable]],
+                kwargs: Dict[str, Any],
+                single: bool) -> 'OptimizationFuture':
+        cancel_event = _new_event(kwargs.get('use_multiprocessing', False),
+                                  kwargs.get('executor'))
+        results_queue = queue.Queue()  # type: queue.Queue
+
+        def run() -> Any:
+            try:
+                trial_results = self._optimize_sweep(
+                        param_sweep,
+                        identifiers,
+                        cancel_event=cancel_event,
+                        result_callback=lambda identifier, result:
+                            results_queue.put((identifier, result)),
+                        **kwargs)
+            finally:
+                results_queue.put(None)
+            return trial_results[0] if single else trial_results
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1)
+        future = self._executor.submit(run)
+        return OptimizationFuture(future, cancel_event, results_queue)
 
+    def shutdown(self, wait: bool=True) -> None:
+        """Shut down the executor used for asynchronous optimizations.
+
+        Args:
+            wait: Whether to wait for pending runs to finish.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
 
     def extend_result(self,
                       identifier: Hashable,
@@ -267,7 +596,13 @@ class VariationalStudy:
                       repetitions: int=1,
                       seeds: Optional[Sequence[int]]=None,
                       use_multiprocessing: bool=False,
-                      num_processes: Optional[int]=None
+                      num_processes: Optional[int]=None,
+                      use_threads: bool=False,
+                      executor: Optional[RepetitionExecutor]=None,
+                      stop_at_target: bool=False,
+                      target_tolerance: float=0.0,
+                      progress_callback: Optional[ProgressCallback]=None,
+                      progress_interval: int=1
                       ) -> None:
         """Extend a result by repeating the run with the same parameters.
 
@@ -299,22 +634,52 @@ class VariationalStudy:
                 a lot more memory.
             repetitions: The number of repetitions to perform.
             seeds: Random number generator seeds to use for the repetitions.
-                The default behavior is to randomly generate an independent seed
-                for each repetition.
+                The default behavior is to draw an independent seed for each
+                repetition from the study's SeedSequence.
             use_multiprocessing: Whether to use multiprocessing to run
                 repetitions in different processes.
-            num_processes: The number of processes to use for multiprocessing.
-                The default behavior is to use the output of
+            num_processes: The number of worker processes or threads to
+                use. The default behavior is to use the output of
                 `multiprocessing.cpu_count()`.
+            use_threads: Whether to run repetitions in a pool of threads
+                of the calling process. Unlike multiprocessing, this does
+                not copy the ansatz and objective, which are shared by all
+                threads and must not be modified during the run. It speeds
+                up the run when evaluations spend most of their time in
+                code that releases the GIL, such as numpy and scipy.sparse.
+                numpy's global random state is not seeded for each
+                repetition in this mode, so only random numbers drawn from
+                the generator of the black box are reproducible.
+            executor: An optional RepetitionExecutor that runs the
+                repetitions, for example a DistributedExecutor that sends
+                them to workers on other hosts.
+            stop_at_target: Whether to stop early once a repetition reaches
+                the target value of the study. Repetitions that have not
+                started by then are skipped and recorded with status SKIPPED.
+            target_tolerance: A repetition reaches the target if its optimal
+                value is at most the target plus this tolerance.
+            progress_callback: An optional function that is called in the
+                calling process with the identifier of the run, the seed of
+                the repetition and an OptimizationProgress every
+                `progress_interval` evaluations. Repetitions then use a
+                StatefulBlackBox, as if `stateful` were set.
+            progress_interval: The number of evaluations between progress
+                reports.
 
         Raises:
             KeyError: There was no existing result with the given identifier.
+            ValueError: `stop_at_target` was set but the study has no target,
+                or more than one of `use_multiprocessing`, `use_threads`
+                and `executor` were given.
         """
         if identifier not in self.trial_results:
             raise KeyError('Could not find an existing result with the '
                            'identifier {}.'.format(identifier))
 
+        _check_execution_mode(use_multiprocessing, use_threads, executor)
         optimization_params = self.trial_results[identifier].params
+        stop_threshold = self._stop_threshold(stop_at_target,
+                                              target_tolerance)
 
         result_list = self._get_result_list(
                 optimization_params,
@@ -324,10 +689,33 @@ class VariationalStudy:
                 repetitions,
                 seeds,
                 use_multiprocessing,
-                num_processes)
+                num_processes,
+                use_threads,
+                executor,
+                _new_event(use_multiprocessing, executor)
+                if stop_at_target else None,
+                stop_threshold,
+                None,
+                functools.partial(progress_callback, identifier)
+                if progress_callback is not None else None,
+                progress_interval)
 
         self.trial_results[identifier].extend(result_list)
 
+    def _stop_threshold(self,
+                        stop_at_target: bool,
+                        target_tolerance: float) -> Optional[float]:
+        """The value at or below which repetitions signal the others to stop.
+
+        Returns None if early stopping is disabled.
+        """
+        if not stop_at_target:
+            return None
+        if self.target is None:
+            raise ValueError('Cannot stop at the target because the study '
+                             'has no target.')
+        return self.target + target_tolerance
+
     def _get_result_list(
             self,
             optimization_params,
@@ -337,107 +725,178 @@ class VariationalStudy:
             repetitions: int=1,
             seeds: Optional[Sequence[int]]=None,
             use_multiprocessing: bool=False,
-            num_processes: Optional[int]=None
+            num_processes: Optional[int]=None,
+            use_threads: bool=False,
+            executor: Optional[RepetitionExecutor]=None,
+            stop_event: Any=None,
+            stop_threshold: Optional[float]=None,
+            result_callback: Optional[
+                Callable[[OptimizationResult], None]]=None,
+            progress_callback: Optional[
+                Callable[[int, OptimizationProgress], None]]=None,
+            progress_interval: int=1,
+            cancel_event: Any=None
             ) -> List[OptimizationResult]:
 
+        progress_sink = progress_callback
+        progress_queue = None
+        if ((use_multiprocessing or use_threads or executor is not None)
+                and progress_callback is not None):
+            # Relay progress reports from the workers to a single thread
+            if executor is not None:
+                progress_queue = executor.new_queue()
+            elif use_multiprocessing:
+                progress_queue = multiprocessing.Manager().Queue()
+            else:
+                progress_queue = queue.Queue()
+            progress_sink = functools.partial(_put_progress, progress_queue)
+            relay = threading.Thread(target=_relay_progress,
+                                     args=(progress_queue, progress_callback))
+            relay.start()
+
+        if seeds is None:
+            seeds = self._spawn_seeds(repetitions)
+
+        arg_tuples = (
+            (
+                self.ansatz,
+                self.objective,
+                self._preparation_circuit,
+                optimization_params,
+                reevaluate_final_params,
+                stateful,
+                save_x_vals,
+                seeds[i],
+                self.ansatz.default_initial_params(),
+                stop_event,
+                cancel_event,
+                stop_threshold,
+                progress_sink,
+                progress_interval,
+                not use_threads
+            )
+            for i in range(repetitions)
+        )
+
+        if num_processes is None:
+            num_processes = multiprocessing.cpu_count()
+        pool = None
+        thread_pool = None
         if use_multiprocessing:
-            if num_processes is None:
-                num_processes = multiprocessing.cpu_count()
             pool = multiprocessing.Pool(num_processes)
-            try:
-                arg_tuples = (
-                    (
-                        self.ansatz,
-                        self.objective,
-                        self._preparation_circuit,
-                        optimization_params,
-                        reevaluate_final_params,
-                        stateful,
-                        save_x_vals,
-                        seeds[i] if seeds is not None
-                        else numpy.random.randint(4294967296),
-                        self.ansatz.default_initial_params()
-                    )
-                    for i in range(repetitions)
-                )
-                result_list = pool.map(_run_optimization, arg_tuples)
-            finally:
-                pool.terminate()
+            results = pool.imap(_run_optimization, arg_tuples)
+        elif executor is not None:
+            results = executor.map(_run_optimization, arg_tuples)
+        elif use_threads:
+            thread_pool = concurrent.futures.ThreadPoolExecutor(num_processes)
+            results = thread_pool.map(_run_optimization, arg_tuples)
         else:
-            result_list = []
-            for i in range(repetitions):
-                result = _run_optimization(
-                    (
-                        self.ansatz,
-                        self.objective,
-                        self._preparation_circuit,
-                        optimization_params,
-                        reevaluate_final_params,
-                        stateful,
-                        save_x_vals,
-                        seeds[i] if seeds is not None
-                        else numpy.random.randint(4294967296),
-                        self.ansatz.default_initial_params()
-                    )
-                )
+            results = map(_run_optimization, arg_tuples)
+
+        result_list = []
+        try:
+            for result in results:
+                if result_callback is not None:
+                    result_callback(result)
                 result_list.append(result)
+        finally:
+            if pool is not None:
+                pool.terminate()
+            if thread_pool is not None:
+                thread_pool.shutdown(wait=False)
+            if progress_queue is not None:
+                progress_queue.put(None)
+                relay.join()
 
         return result_list
 
+    def _spawn_seeds(self, repetitions: int) -> List[int]:
+        """Draw independent seeds for repetitions from the study's sequence.
+        """
+        if isinstance(self._seed_sequence, _RandomStateSeedSequence):
+            return self._seed_sequence.spawn_seeds(repetitions)
+        return [int(child.generate_state(1)[0])
+                for child in self._seed_sequence.spawn(repetitions)]
+
+    def statistics(self,
+                   quantiles: Sequence[float]=(0.25, 0.5, 0.75)
+                   ) -> 'StudyStatistics':
+        """Summary statistics of all trial results of the study.
+
+        The statistics of all trial results are computed together from
+        stacked arrays of their numeric data. The result is cached until
+        trial results are added or extended.
+
+        Args:
+            quantiles: The quantiles to compute for each numeric column.
+        """
+        quantiles = tuple(quantiles)
+        key = (quantiles,
+               tuple((identifier, id(result), result.repetitions)
+                     for identifier, result in self.trial_results.items()))
+        if self._statistics_cache is None or self._statistics_cache[0] != key:
+            self._statistics_cache = (
+                    key, StudyStatistics(self.trial_results, quantiles))
+        return self._statistics_cache[1]
+
+    def leaderboard(self, k: int=10) -> List[Tuple[Hashable, float]]:
+        """The k trial results with the lowest optimal values.
+
+        Returns a list of tuples (identifier, optimal value) sorted by
+        optimal value. Trial results without an optimal value are omitted.
+        """
+        return self.statistics().leaderboard(k)
+
     def __str__(self) -> str:
+        stats = self.statistics()
         header = []   # type: List[str]
         details = []  # type: List[str]
         optimal_value = numpy.inf
         optimal_identifier = None  # type: Optional[Hashable]
 
-        for identifier, result in self.trial_results.items():
-
-            result_opt = result.optimal_value
-            if result_opt < optimal_value:
-                optimal_value = result_opt
-                optimal_identifier = identifier
+        best = stats.leaderboard(1)
+        if best:
+            optimal_identifier, optimal_value = best[0]
 
+        for i, identifier in enumerate(stats.identifiers):
             details.append(
                     '    Identifier: {}'.format(
                         identifier)
             )
             details.append(
                     '        Optimal value: {}'.format(
-                        result_opt)
+                        stats.optimal_values[i])
             )
             details.append(
                     '        Number of repetitions: {}'.format(
-                        result.repetitions)
+                        stats.repetitions[i])
             )
             details.append(
                     '        Optimal value 1st, 2nd, 3rd quartiles:'
             )
             details.append(
                     '            {}'.format(
-                        list(result.data_frame['optimal_value'].quantile(
-                            [.25, .5, .75])))
+                        stats.quantile_values['optimal_value'][i].tolist())
             )
             details.append(
                     '        Num evaluations 1st, 2nd, 3rd quartiles:')
             details.append(
                     '            {}'.format(
-                        list(result.data_frame['num_evaluations'].quantile(
-                            [.25, .5, .75]))))
+                        stats.quantile_values['num_evaluations'][i].tolist())
+            )
             details.append(
                     '        Cost spent 1st, 2nd, 3rd quartiles:'
             )
             details.append(
                     '            {}'.format(
-                        list(result.data_frame['cost_spent'].quantile(
-                            [.25, .5, .75])))
+                        stats.quantile_values['cost_spent'][i].tolist())
             )
             details.append(
                     '        Time spent 1st, 2nd, 3rd quartiles:'
             )
             details.append(
                     '            {}'.format(
-                        list(result.data_frame['time'].quantile(
-                            [.25, .5, .75])))
+                        stats.quantile_values['time'][i].tolist())
             )
 
         header.append(
@@ -490,27 +949,135 @@ class VariationalStudy:
         return {'name': self.name,
                 'ansatz': self.ansatz,
                 'objective': self.objective,
-                'preparation_circuit': self._preparation_circuit}
+                'preparation_circuit': self._preparation_circuit,
+                'seed': self._seed_sequence}
 
-    def save(self) -> None:
-        """Save the study to disk."""
-        filename = '{}.study'.format(self.name)
+    def _filename(self, extension: str) -> str:
+        """The path of a file belonging to the study."""
+        filename = '{}.{}'.format(self.name, extension)
         if self.datadir is not None:
             filename = os.path.join(self.datadir, filename)
-            if not os.path.isdir(self.datadir):
-                os.mkdir(self.datadir)
-        with open(filename, 'wb') as f:
-            pickle.dump(
-                    (type(self), self._init_kwargs(), self.trial_results), f)
-
-    @staticmethod
-    def load(name: str, datadir: Optional[str]=None) -> 'VariationalStudy':
+        return filename
+
+    def _make_datadir(self) -> None:
+        if self.datadir is not None and not os.path.isdir(self.datadir):
+            os.mkdir(self.datadir)
+
+    def _load_checkpoint(self) -> Dict[Any, List[OptimizationResult]]:
+        """Read the finished repetitions recorded in the checkpoint file.
+
+        Returns a dictionary mapping identifiers to lists of results. A
+        record truncated by an interrupted write is ignored.
+        """
+        completed = collections.defaultdict(list) \
+                # type: Dict[Any, List[OptimizationResult]]
+        filename = self._filename('checkpoint')
+        if not os.path.exists(filename):
+            return completed
+        with open(filename, 'rb') as f:
+            while True:
+                try:
+                    identifier, result = pickle.load(f)
+                except (EOFError, pickle.UnpicklingError):
+                    break
+                completed[identifier].append(result)
+        return completed
+
+    def save(self,
+             file_format: str='pickle',
+             catalog: Optional[Union[str, StudyCatalog]]=None) -> None:
+        """Save the study to disk.
+
+        This also removes the checkpoint file of the study, if there is one,
+        since its results are now contained in the saved study.
+
+        Args:
+            file_format: Either 'pickle' or 'npz'. The 'pickle' format saves
+                the whole study to `<name>.study`. The 'npz' format saves
+                the trial results to `<name>.npz`, with numeric data in
+                compressed numpy arrays and everything else in JSON
+                metadata. It does not use pickle, but it does not store the
+                ansatz, objective and preparation circuit, which have to be
+                passed to `load` instead. Algorithms must be registered with
+                `optimization.register_algorithm` to be saved in this format.
+            catalog: An optional StudyCatalog, or the filename of one, in
+                which to record the saved study.
+
+        Raises:
+            ValueError: The file format is not supported.
+        """
+        self._make_datadir()
+        if file_format == 'pickle':
+            filename = self._filename('study')
+            with open(filename, 'wb') as f:
+                pickle.dump(
+                        (type(self), self._init_kwargs(), self.trial_results),
+                        f)
+        elif file_format == 'npz':
+            arrays = {}  # type: Dict[str, numpy.ndarray]
+            metadata = {
+                    'version': NPZ_FORMAT_VERSION,
+                    'name': self.name,
+                    'target': self.target,
+                    'ansatz': _qualified_name(type(self.ansatz)),
+                    'objective': _qualified_name(type(self.objective)),
+                    'num_params': self.num_params,
+                    'num_qubits': len(self.ansatz.qubits),
+                    'seed_entropy': self._seed_sequence.entropy,
+                    'seed_children_spawned':
+                        self._seed_sequence.n_children_spawned,
+                    'trial_results': [
+                        dict(identifier=identifier,
+                             **serialization.trial_result_to_json(
+                                 result, arrays, 'trial{}_'.format(i)))
+                        for i, (identifier, result)
+                        in enumerate(self.trial_results.items())]}
+            filename = self._filename('npz')
+            numpy.savez_compressed(filename,
+                                   metadata=numpy.array(json.dumps(metadata)),
+                                   **arrays)
+        else:
+            raise ValueError('Unsupported file format {}.'.format(file_format))
+        if catalog is not None:
+            if isinstance(catalog, str):
+                catalog = StudyCatalog(catalog)
+            catalog.update(self, filename, file_format)
+        checkpoint_filename = self._filename('checkpoint')
+        if os.path.exists(checkpoint_filename):
+            os.remove(checkpoint_filename)
+
+    @classmethod
+    def load(cls,
+             name: str,
+             datadir: Optional[str]=None,
+             file_format: str='pickle',
+             ansatz: Optional[VariationalAnsatz]=None,
+             objective: Optional[VariationalObjective]=None,
+             preparation_circuit: Optional[cirq.Circuit]=None
+             ) -> 'VariationalStudy':
         """Load a study from disk.
 
         Args:
             name: The name of the study.
             datadir: The directory where the study file is saved.
+            file_format: The format the study was saved in; see `save`.
+            ansatz: The ansatz of the study. Required for the 'npz' format.
+            objective: The objective of the study. Required for the 'npz'
+                format.
+            preparation_circuit: The preparation circuit of the study, if
+                any. Only used for the 'npz' format.
+
+        Raises:
+            ValueError: The file format is not supported, the ansatz or
+                objective is missing, or the ansatz has a different number
+                of parameters than the saved study.
         """
+        if file_format == 'npz':
+            return cls._load_npz(name, datadir, ansatz, objective,
+                                 preparation_circuit)
+        if file_format != 'pickle':
+            raise ValueError('Unsupported file format {}.'.format(file_format))
+
         if name.endswith('.study'):
             filename = name
         else:
@@ -518,12 +1085,292 @@ class VariationalStudy:
         if datadir is not None:
             filename = os.path.join(datadir, filename)
         with open(filename, 'rb') as f:
-            cls, kwargs, trial_results = pickle.load(f)
-        study = cls(datadir=datadir, **kwargs)
+            study_type, kwargs, trial_results = pickle.load(f)
+        study = study_type(datadir=datadir, **kwargs)
         for key, val in trial_results.items():
             study.trial_results[key] = val
         return study
 
+    @classmethod
+    def _load_npz(cls,
+                  name: str,
+                  datadir: Optional[str],
+                  ansatz: Optional[VariationalAnsatz],
+                  objective: Optional[VariationalObjective],
+                  preparation_circuit: Optional[cirq.Circuit]
+                  ) -> 'VariationalStudy':
+        if ansatz is None or objective is None:
+            raise ValueError('An ansatz and an objective are required to '
+                             'load a study saved in the npz format.')
+        filename = name if name.endswith('.npz') else '{}.npz'.format(name)
+        if datadir is not None:
+            filename = os.path.join(datadir, filename)
+
+        with numpy.load(filename, allow_pickle=False) as arrays:
+            metadata = json.loads(str(arrays['metadata']))
+            if metadata['version'] > NPZ_FORMAT_VERSION:
+                raise ValueError('The study was saved in a newer version {} '
+                                 'of the npz format.'.format(
+                                     metadata['version']))
+            if metadata['num_params'] != len(ansatz.params):
+                raise ValueError('The ansatz has {} parameters but the saved '
+                                 'study has {}.'.format(
+                                     len(ansatz.params),
+                                     metadata['num_params']))
+            study = cls(metadata['name'],
+                        ansatz,
+                        objective,
+                        target=metadata['target'],
+                        preparation_circuit=preparation_circuit,
+                        datadir=datadir,
+                        seed=_new_seed_sequence(
+                            metadata['seed_entropy'],
+                            n_children_spawned=metadata[
+                                'seed_children_spawned']))
+            for i, data in enumerate(metadata['trial_results']):
+                identifier = _identifier_from_json(data['identifier'])
+                study.trial_results[identifier] = (
+                        serialization.trial_result_from_json(
+                            data, arrays, 'trial{}_'.format(i)))
+        return study
+
+
+class StudyStatistics:
+    """Summary statistics of the trial results of a study.
+
+    Attributes:
+        identifiers: The identifiers of the trial results, in the order of
+            the study's `trial_results` dictionary. The i-th entry of each
+            array below refers to the i-th identifier.
+        repetitions: The number of repetitions of each trial result.
+        optimal_values: The optimal value of each trial result.
+        quantiles: The quantiles that were computed.
+        quantile_values: A dictionary mapping the name of each numeric column
+            of OptimizationTrialResult (see its NUMERIC_COLUMNS) to a 2d array
+            whose i-th row holds the quantiles of that column for the i-th
+            trial result. Missing values are ignored.
+    """
+
+    def __init__(self,
+                 trial_results: Dict[Any, OptimizationTrialResult],
+                 quantiles: Sequence[float]) -> None:
+        columns = OptimizationTrialResult.NUMERIC_COLUMNS
+        self.identifiers = list(trial_results.keys())
+        self.repetitions = numpy.array(
+                [result.repetitions for result in trial_results.values()],
+                dtype=int)
+        self.quantiles = tuple(quantiles)
+
+        # Stack the columns of all trial results, padding with NaN
+        stacked = numpy.full((len(columns),
+                              len(self.identifiers),
+                              max([0] + list(self.repetitions))),
+                             numpy.nan)
+        for i, result in enumerate(trial_results.values()):
+            for j, name in enumerate(columns):
+                stacked[j, i, :result.repetitions] = result.column(name)
+
+        with warnings.catch_warnings():
+            # Columns without values give NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if stacked.size:
+                self.optimal_values = numpy.nanmin(stacked[0], axis=1)
+                values = numpy.nanquantile(stacked, self.quantiles, axis=2)
+            else:
+                self.optimal_values = numpy.full(len(self.identifiers),
+                                                 numpy.nan)
+                values = numpy.full((len(self.quantiles),
+                                     len(columns),
+                                     len(self.identifiers)),
+                                    numpy.nan)
+        self.quantile_values = {
+                name: values[:, j, :].T for j, name in enumerate(columns)}
+
+    def leaderboard(self, k: int=10) -> List[Tuple[Hashable, float]]:
+        """The k trial results with the lowest optimal values.
+
+        Returns a list of tuples (identifier, optimal value) sorted by
+        optimal value. Trial results without an optimal value are omitted.
+        """
+        valid = numpy.flatnonzero(~numpy.isnan(self.optimal_values))
+        order = numpy.argsort(self.optimal_values[valid], kind='stable')
+        top = valid[order[:k]]
+        return [(self.identifiers[i], float(self.optimal_values[i]))
+                for i in top]
+
+
+class OptimizationFuture:
+    """A handle on optimization runs executing in the background.
+
+    This is returned by `VariationalStudy.optimize_async` and
+    `VariationalStudy.optimize_sweep_async`. It can be awaited from a
+    coroutine, in which case it resolves to the same value as `result`.
+    """
+
+    def __init__(self,
+                 future: concurrent.futures.Future,
+                 cancel_event: Any,
+                 results_queue: queue.Queue) -> None:
+        self._future = future
+        self._cancel_event = cancel_event
+        self._results_queue = results_queue
+
+    def result(self, timeout: Optional[float]=None) -> Any:
+        """Wait for the runs to finish and return their trial results.
+
+        Raises:
+            concurrent.futures.CancelledError: The runs were cancelled
+                before they started.
+            concurrent.futures.TimeoutError: The runs did not finish within
+                the timeout.
+        """
+        return self._future.result(timeout)
+
+    def done(self) -> bool:
+        """Whether the runs have finished or were cancelled."""
+        return self._future.done()
+
+    def cancelled(self) -> bool:
+        """Whether the runs were cancelled before they started."""
+        return self._future.cancelled()
+
+    def cancel(self) -> None:
+        """Cancel the runs.
+
+        If the runs have not started, they are not started at all. Otherwise,
+        repetitions that are in progress finish normally and the remaining
+        repetitions are recorded with status SKIPPED.
+        """
+        if self._future.cancel():
+            self._results_queue.put(None)
+        else:
+            self._cancel_event.set()
+
+    def completed_results(self, timeout: Optional[float]=None
+                          ) -> Iterator[Tuple[Hashable, OptimizationResult]]:
+        """Yield results of repetitions as soon as they finish.
+
+        Yields tuples (identifier, result), where identifier is the
+        identifier of the run that the repetition belongs to. The iteration
+        ends when all runs have finished. It can only be done once.
+
+        Args:
+            timeout: The maximum time in seconds to wait for each result.
+
+        Raises:
+            queue.Empty: No result arrived within the timeout.
+        """
+        while True:
+            item = self._results_queue.get(timeout=timeout)
+            if item is None:
+                return
+            yield item
+
+    def __await__(self):
+        # asyncio is not available in Python 2.7, where this is never called
+        import asyncio
+        return asyncio.wrap_future(self._future).__await__()
+
+
+def _qualified_name(cls: type) -> str:
+    return '{}.{}'.format(cls.__module__, cls.__name__)
+
+
+def _check_execution_mode(use_multiprocessing: bool,
+                          use_threads: bool,
+                          executor: Optional[RepetitionExecutor]) -> None:
+    if sum([use_multiprocessing, use_threads, executor is not None]) > 1:
+        raise ValueError('Only one of use_multiprocessing, use_threads and '
+                         'executor can be given.')
+
+
+def _new_event(use_multiprocessing: bool,
+               executor: Optional[RepetitionExecutor]=None) -> Any:
+    """An event that can be shared with the repetitions of a run."""
+    if executor is not None:
+        return executor.new_event()
+    if use_multiprocessing:
+        return multiprocessing.Manager().Event()
+    return threading.Event()
+
+
+def _new_seed_sequence(entropy: Optional[int]=None,
+                       n_children_spawned: int=0) -> Any:
+    """A SeedSequence, or a substitute for it if numpy is older than 1.17.
+    """
+    if hasattr(numpy.random, 'SeedSequence'):
+        return numpy.random.SeedSequence(
+                entropy, n_children_spawned=n_children_spawned)
+    return _RandomStateSeedSequence(entropy, n_children_spawned)
+
+
+def _seed_sequence_types() -> Tuple[type, ...]:
+    if hasattr(numpy.random, 'SeedSequence'):
+        return (numpy.random.SeedSequence, _RandomStateSeedSequence)
+    return (_RandomStateSeedSequence,)
+
+
+def _new_rng(seed: int) -> Any:
+    """A Generator, or a RandomState if numpy is older than 1.17."""
+    if hasattr(numpy.random, 'default_rng'):
+        return numpy.random.default_rng(seed)
+    return numpy.random.RandomState(seed)
+
+
+class _RandomStateSeedSequence:
+    """Spawns seeds like a SeedSequence using only RandomState.
+
+    The k-th seed is drawn from a RandomState seeded with the words of the
+    entropy followed by k, so the seeds spawned next are determined by the
+    entropy and the number of seeds spawned so far.
+    """
+
+    def __init__(self,
+                 entropy: Optional[int]=None,
+                 n_children_spawned: int=0) -> None:
+        if entropy is None:
+            entropy = random.SystemRandom().getrandbits(128)
+        self.entropy = entropy
+        self.n_children_spawned = n_children_spawned
+
+    def spawn_seeds(self, n_seeds: int) -> List[int]:
+        words = []  # type: List[int]
+        remaining = self.entropy
+        while remaining or not words:
+            words.append(remaining & 0xffffffff)
+            remaining >>= 32
+        seeds = [int(numpy.random.RandomState(words + [k]).randint(
+                    2**32, dtype=numpy.int64))
+                 for k in range(self.n_children_spawned,
+                                self.n_children_spawned + n_seeds)]
+        self.n_children_spawned += n_seeds
+        return seeds
+
+
+def _put_progress(progress_queue,
+                  seed: int,
+                  progress: OptimizationProgress) -> None:
+    progress_queue.put((seed, progress))
+
+
+def _relay_progress(progress_queue,
+                    progress_callback: Callable[[int, OptimizationProgress],
+                                                None]) -> None:
+    """Pass progress reports from a queue to a callback until None arrives."""
+    while True:
+        item = progress_queue.get()
+        if item is None:
+            return
+        progress_callback(*item)
+
+
+def _write_checkpoint(checkpoint_file,
+                      identifier: Hashable,
+                      result: OptimizationResult) -> None:
+    """Append a finished repetition to a checkpoint file."""
+    pickle.dump((identifier, result), checkpoint_file)
+    checkpoint_file.flush()
+
 
 def _run_optimization(args) -> OptimizationResult:
     """Perform an optimization run and return the result."""
@@ -536,22 +1383,50 @@ def _run_optimization(args) -> OptimizationResult:
             stateful,
             save_x_vals,
             seed,
-            default_initial_params
+            default_initial_params,
+            stop_event,
+            cancel_event,
+            stop_threshold,
+            progress_sink,
+            progress_interval,
+            seed_global_state
     ) = args
 
+    if any(event is not None and event.is_set()
+           for event in (stop_event, cancel_event)):
+        return OptimizationResult(optimal_value=numpy.nan,
+                                  optimal_parameters=None,
+                                  seed=seed,
+                                  status=SKIPPED,
+                                  message='Skipped because the run was '
+                                          'stopped early.')
+
+    budget_kwargs = {
+            'cost_of_evaluate': optimization_params.cost_of_evaluate,
+            'max_evaluations': optimization_params.max_evaluations,
+            'max_cost': optimization_params.max_cost,
+            'max_seconds': optimization_params.max_seconds,
+            'rng': _new_rng(seed)}
+    if seed_global_state:
+        # For code that does not use the generator of the black box
+        numpy.random.seed(seed)
+    stateful = stateful or progress_sink is not None
     if stateful:
         black_box = VariationalStatefulBlackBox(
                 ansatz=ansatz,
                 objective=objective,
                 preparation_circuit=preparation_circuit,
-                cost_of_evaluate=optimization_params.cost_of_evaluate,
-                save_x_vals=save_x_vals)
+                save_x_vals=save_x_vals,
+                progress_callback=functools.partial(progress_sink, seed)
+                if progress_sink is not None else None,
+                progress_interval=progress_interval,
+                **budget_kwargs)
     else:
         black_box = VariationalBlackBox(  # type: ignore
                 ansatz=ansatz,
                 objective=objective,
                 preparation_circuit=preparation_circuit,
-                cost_of_evaluate=optimization_params.cost_of_evaluate)
+                **budget_kwargs)
 
     initial_guess = optimization_params.initial_guess
     initial_guess_array = optimization_params.initial_guess_array
@@ -560,11 +1435,18 @@ def _run_optimization(args) -> OptimizationResult:
     if initial_guess_array is None:
         initial_guess_array = numpy.array([default_initial_params])
 
-    numpy.random.seed(seed)
     t0 = time.time()
-    result = optimization_params.algorithm.optimize(black_box,
-                                                    initial_guess,
-                                                    initial_guess_array)
+    try:
+        result = optimization_params.algorithm.optimize(black_box,
+                                                        initial_guess,
+                                                        initial_guess_array)
+    except BudgetExhausted as e:
+        result = OptimizationResult(optimal_value=e.optimal_value,
+                                    optimal_parameters=e.optimal_parameters,
+                                    num_evaluations=e.num_evaluations,
+                                    cost_spent=e.cost_spent,
+                                    status=BUDGET_EXHAUSTED,
+                                    message=str(e))
     t1 = time.time()
 
     result.seed = seed
@@ -574,10 +1456,13 @@ def _run_optimization(args) -> OptimizationResult:
         result.cost_spent = black_box.cost_spent
         result.function_values = black_box.function_values
         result.wait_times = black_box.wait_times
-    if reevaluate_final_params:
+    if reevaluate_final_params and result.optimal_parameters is not None:
         result.optimal_value = black_box.evaluate_noiseless(
                 result.optimal_parameters)
 
+    if stop_threshold is not None and result.optimal_value <= stop_threshold:
+        stop_event.set()
+
     return result
 
 
@@ -587,6 +1472,12 @@ class VariationalBlackBox(BlackBox):
     Attributes:
         ansatz: The variational ansatz circuit.
         objective: The objective function.
+        circuit: The circuit that is simulated, which is the preparation
+            circuit, if any, followed by the ansatz circuit.
+
+    The circuit, qubit order and simulator are set up once, when the black
+    box is constructed. The ansatz and objective are only read, so black
+    boxes in different threads can share them.
     """
 
     def __init__(self,
@@ -597,6 +1488,9 @@ class VariationalBlackBox(BlackBox):
         self.ansatz = ansatz
         self.objective = objective
         self.preparation_circuit = preparation_circuit or cirq.Circuit()
+        self.circuit = self.preparation_circuit + self.ansatz.circuit
+        self._qubit_order = self.ansatz.qubit_permutation(self.ansatz.qubits)
+        self._simulator = cirq.google.XmonSimulator()
         super().__init__(**kwargs)
 
     @property
@@ -613,11 +1507,10 @@ class VariationalBlackBox(BlackBox):
                            x: numpy.ndarray) -> float:
         """Evaluate parameters with a noiseless simulation."""
         # Default: evaluate using Xmon simulator
-        simulator = cirq.google.XmonSimulator()
-        result = simulator.simulate(
-                self.preparation_circuit + self.ansatz.circuit,
+        result = self._simulator.simulate(
+                self.circuit,
                 param_resolver=self.ansatz.param_resolver(x),
-                qubit_order=self.ansatz.qubit_permutation(self.ansatz.qubits))
+                qubit_order=self._qubit_order)
         return self.objective.value(result)
 
     def _evaluate(self,
@@ -631,7 +1524,7 @@ class VariationalBlackBox(BlackBox):
                             cost: float) -> float:
         """Evaluate parameters with a specified cost."""
         # Default: add artifical noise with the specified cost
-        return self._evaluate(x) + self.objective.noise(cost)
+        return self._evaluate(x) + self.objective.noise_with_rng(cost, self.rng)
 
     def noise_bounds(self,
                      cost: float,
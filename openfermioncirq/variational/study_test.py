@@ -10,7 +10,10 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import asyncio
+import concurrent.futures
 import os
+import threading
 
 import numpy
 import pytest
@@ -19,8 +22,13 @@ import cirq
 
 from openfermioncirq import VariationalStudy
 from openfermioncirq.optimization import (
+        BUDGET_EXHAUSTED,
+        COBYLA,
+        OptimizationAlgorithm,
         OptimizationParams,
+        OptimizationResult,
         OptimizationTrialResult,
+        SKIPPED,
         ScipyOptimizationAlgorithm)
 from openfermioncirq.variational.study import (
         VariationalBlackBox,
@@ -49,6 +57,15 @@ test_study_noisy = VariationalStudy('test_study_noisy',
                                     preparation_circuit=preparation_circuit)
 
 
+class GlobalNoiseObjective(ExampleVariationalObjective):
+    """An objective whose noise is drawn from numpy's global random state."""
+
+    def noise(self, cost=None):
+        if cost is None:
+            return 0.0  # coverage: ignore
+        return numpy.random.standard_normal() / cost
+
+
 def test_variational_study_circuit():
     assert (test_study.circuit.to_text_diagram().strip() == """
 0: ───X───X^theta0───@───X^theta0───M('all')───
@@ -60,7 +77,8 @@ def test_variational_study_circuit():
 def test_variational_study_optimize_and_extend_and_summary():
     numpy.random.seed(63351)
 
-    study = VariationalStudy('study', test_ansatz, test_objective, target=-10.5)
+    study = VariationalStudy('study', test_ansatz, test_objective, target=-10.5,
+                             seed=2018)
     assert len(study.trial_results) == 0
     assert study.target == -10.5
 
@@ -116,6 +134,221 @@ def test_variational_study_optimize_and_extend_and_summary():
     assert str(study).startswith('This study contains')
 
 
+def test_variational_study_optimize_budget():
+    study = VariationalStudy('study', test_ansatz, test_objective)
+    result = study.optimize(
+            OptimizationParams(
+                COBYLA,
+                initial_guess=numpy.array([0.5, 0.5]),
+                max_evaluations=3),
+            stateful=True)
+
+    assert result.results[0].status == BUDGET_EXHAUSTED
+    assert result.results[0].num_evaluations == 3
+    assert result.optimal_value == min(
+            val for val, _, _ in result.results[0].function_values)
+
+
+@pytest.mark.parametrize('use_multiprocessing', [False, True])
+def test_variational_study_stop_at_target(use_multiprocessing):
+    study = VariationalStudy('study', test_ansatz, test_objective, target=2.0)
+    result = study.optimize(OptimizationParams(test_algorithm),
+                            repetitions=3,
+                            use_multiprocessing=use_multiprocessing,
+                            num_processes=1,
+                            stop_at_target=True)
+
+    assert result.repetitions == 3
+    assert result.results[0].status != SKIPPED
+    assert [r.status for r in result.results[1:]] == [SKIPPED, SKIPPED]
+    assert result.optimal_value == result.results[0].optimal_value
+
+
+@pytest.mark.parametrize('use_multiprocessing', [False, True])
+def test_variational_study_stop_at_target_sweep(use_multiprocessing):
+    study = VariationalStudy('study', test_ansatz, test_objective, target=2.0)
+    study.optimize_sweep([OptimizationParams(test_algorithm)] * 2,
+                         ['a', 'b'],
+                         repetitions=3,
+                         use_multiprocessing=use_multiprocessing,
+                         num_processes=1,
+                         stop_at_target=True)
+
+    # Reaching the target in run 'a' does not stop run 'b'
+    for identifier in ['a', 'b']:
+        results = study.trial_results[identifier].results
+        assert results[0].status != SKIPPED
+        assert [r.status for r in results[1:]] == [SKIPPED, SKIPPED]
+
+
+def test_variational_study_use_threads():
+    study = VariationalStudy('study', test_ansatz, test_objective, target=2.0)
+    reports = []
+    study.optimize_sweep([OptimizationParams(test_algorithm)] * 2,
+                         ['a', 'b'],
+                         repetitions=4,
+                         use_threads=True,
+                         num_processes=3,
+                         progress_callback=lambda *args: reports.append(args))
+    assert [result.repetitions for result in study.trial_results.values()
+            ] == [4, 4]
+    assert len(reports) == 40
+
+    study.extend_result('a', repetitions=2, use_threads=True)
+    assert study.trial_results['a'].repetitions == 6
+
+    with pytest.raises(ValueError):
+        study.optimize(OptimizationParams(test_algorithm),
+                       use_multiprocessing=True,
+                       use_threads=True)
+    with pytest.raises(ValueError):
+        study.extend_result('a', use_multiprocessing=True, use_threads=True)
+
+
+def test_variational_study_stop_at_target_without_target_raises_error():
+    with pytest.raises(ValueError):
+        test_study.optimize(OptimizationParams(test_algorithm),
+                            stop_at_target=True)
+
+
+@pytest.mark.parametrize('use_multiprocessing', [False, True])
+def test_variational_study_seeded_repetitions_reproducible(
+        use_multiprocessing):
+    def run(**kwargs):
+        study = VariationalStudy('study', test_ansatz, test_objective_noisy,
+                                 seed=2018)
+        result = study.optimize(OptimizationParams(test_algorithm,
+                                                   cost_of_evaluate=10.0),
+                                repetitions=3,
+                                stateful=True,
+                                save_x_vals=True,
+                                **kwargs)
+        return ([r.seed for r in result.results],
+                [numpy.concatenate([x for _, _, x in r.function_values])
+                 .tolist()
+                 for r in result.results])
+
+    # The global random state does not affect the repetitions
+    numpy.random.seed(1)
+    seeds, values = run()
+    numpy.random.seed(2)
+    assert run(use_multiprocessing=use_multiprocessing,
+               num_processes=2) == (seeds, values)
+    assert run(use_threads=True, num_processes=3) == (seeds, values)
+    assert len(set(seeds)) == 3
+    assert values[0] != values[1]
+
+
+@pytest.mark.parametrize('use_multiprocessing', [False, True])
+def test_variational_study_seeds_global_random_state(use_multiprocessing):
+    def run():
+        study = VariationalStudy('study', test_ansatz, GlobalNoiseObjective())
+        result = study.optimize(OptimizationParams(test_algorithm,
+                                                   cost_of_evaluate=10.0),
+                                repetitions=2,
+                                seeds=[3, 4],
+                                use_multiprocessing=use_multiprocessing,
+                                num_processes=2)
+        return [r.optimal_value for r in result.results]
+
+    numpy.random.seed(1)
+    values = run()
+    numpy.random.seed(2)
+    assert run() == values
+    assert values[0] != values[1]
+
+
+def test_variational_study_seeds_without_seed_sequence(monkeypatch, tmpdir):
+    # numpy older than 1.17 has neither SeedSequence nor Generator
+    monkeypatch.delattr(numpy.random, 'SeedSequence')
+    monkeypatch.delattr(numpy.random, 'default_rng')
+
+    def run(study):
+        result = study.optimize(OptimizationParams(test_algorithm),
+                                repetitions=3)
+        return ([r.seed for r in result.results],
+                [r.optimal_value for r in result.results])
+
+    datadir = str(tmpdir)
+    study = VariationalStudy('study', test_ansatz, test_objective_noisy,
+                             datadir=datadir, seed=2018)
+    seeds, values = run(study)
+    assert run(VariationalStudy('study', test_ansatz, test_objective_noisy,
+                                seed=2018)) == (seeds, values)
+    assert len(set(seeds)) == 3
+
+    study.save(file_format='npz')
+    loaded_study = VariationalStudy.load('study',
+                                         datadir=datadir,
+                                         file_format='npz',
+                                         ansatz=test_ansatz,
+                                         objective=test_objective_noisy)
+    assert loaded_study._spawn_seeds(2) == study._spawn_seeds(2)
+    assert not set(study._spawn_seeds(2)) & set(seeds)
+
+
+@pytest.mark.parametrize('use_multiprocessing', [False, True])
+def test_variational_study_progress_callback(use_multiprocessing):
+    study = VariationalStudy('study', test_ansatz, test_objective)
+    reports = []
+    result = study.optimize(
+            OptimizationParams(test_algorithm),
+            'run',
+            repetitions=2,
+            seeds=[5, 6],
+            use_multiprocessing=use_multiprocessing,
+            progress_callback=lambda *args: reports.append(args),
+            progress_interval=2)
+
+    # ExampleAlgorithm makes 5 evaluations per repetition
+    assert sorted((identifier, seed, progress.num_evaluations)
+                  for identifier, seed, progress in reports) == [
+            ('run', 5, 2), ('run', 5, 4), ('run', 6, 2), ('run', 6, 4)]
+    assert [r.num_evaluations for r in result.results] == [5, 5]
+
+
+def test_variational_study_statistics_and_leaderboard():
+    study = VariationalStudy('study', test_ansatz, test_objective)
+    assert study.leaderboard() == []
+    assert str(study).startswith('This study contains 0 trial results.')
+
+    params = OptimizationParams(test_algorithm)
+    for identifier, values in [('a', [3.0, 1.0, 2.0]),
+                               ('b', [0.5]),
+                               ('c', [numpy.nan]),
+                               ('d', [4.0, 5.0])]:
+        study.trial_results[identifier] = OptimizationTrialResult(
+                [OptimizationResult(optimal_value=value,
+                                    optimal_parameters=numpy.zeros(2),
+                                    num_evaluations=10 * i,
+                                    time=0.1)
+                 for i, value in enumerate(values)],
+                params)
+
+    stats = study.statistics()
+    assert stats.identifiers == ['a', 'b', 'c', 'd']
+    assert list(stats.repetitions) == [3, 1, 1, 2]
+    numpy.testing.assert_allclose(stats.optimal_values,
+                                  [1.0, 0.5, numpy.nan, 4.0])
+    for identifier, result in study.trial_results.items():
+        i = stats.identifiers.index(identifier)
+        for name in ['optimal_value', 'num_evaluations', 'cost_spent', 'time']:
+            numpy.testing.assert_allclose(
+                    stats.quantile_values[name][i],
+                    result.data_frame[name].astype(float).quantile(
+                        [.25, .5, .75]))
+
+    assert study.statistics() is stats
+    assert study.leaderboard(2) == [('b', 0.5), ('a', 1.0)]
+    assert study.leaderboard() == [('b', 0.5), ('a', 1.0), ('d', 4.0)]
+    assert "identifier 'b'" in str(study)
+
+    study.trial_results['d'].extend([OptimizationResult(
+            optimal_value=0.1, optimal_parameters=numpy.zeros(2))])
+    assert study.statistics() is not stats
+    assert study.leaderboard(1) == [('d', 0.1)]
+
+
 def test_variational_study_run_too_few_seeds_raises_error():
     with pytest.raises(ValueError):
         test_study.optimize(OptimizationParams(test_algorithm),
@@ -170,6 +403,177 @@ def test_variational_study_save_load():
     os.rmdir(datadir)
 
 
+def test_variational_study_checkpoint_resume(tmpdir):
+    datadir = str(tmpdir)
+    study = VariationalStudy('study', test_ansatz, test_objective,
+                             datadir=datadir)
+    study.optimize(OptimizationParams(test_algorithm),
+                   'run',
+                   repetitions=2,
+                   seeds=[1, 2],
+                   checkpoint=True)
+    assert os.path.exists(os.path.join(datadir, 'study.checkpoint'))
+
+    # A new process resuming the study only runs the missing seed
+    resumed_study = VariationalStudy('study', test_ansatz, test_objective,
+                                     datadir=datadir)
+    result = resumed_study.optimize(OptimizationParams(test_algorithm),
+                                    'run',
+                                    repetitions=3,
+                                    seeds=[1, 2, 3],
+                                    resume=True)
+    assert result.repetitions == 3
+    assert [r.seed for r in result.results] == [1, 2, 3]
+    original = study.trial_results['run'].results
+    assert [r.time for r in result.results[:2]] == [r.time for r in original]
+
+    # The checkpoint now holds all three repetitions
+    assert len(resumed_study._load_checkpoint()['run']) == 3
+
+    resumed_study.save()
+    assert not os.path.exists(os.path.join(datadir, 'study.checkpoint'))
+
+
+def test_variational_study_checkpoint_resume_spawned_seeds(tmpdir):
+    datadir = str(tmpdir)
+    study = VariationalStudy('study', test_ansatz, test_objective,
+                             datadir=datadir, seed=123)
+    study.optimize(OptimizationParams(test_algorithm),
+                   'run',
+                   repetitions=2,
+                   checkpoint=True)
+
+    # The resumed repetitions continue the seed sequence
+    resumed_study = VariationalStudy('study', test_ansatz, test_objective,
+                                     datadir=datadir, seed=123)
+    result = resumed_study.optimize(OptimizationParams(test_algorithm),
+                                    'run',
+                                    repetitions=4,
+                                    resume=True)
+    seeds = [r.seed for r in result.results]
+    assert len(set(seeds)) == 4
+    assert seeds == VariationalStudy(
+            'study', test_ansatz, test_objective, seed=123)._spawn_seeds(4)
+
+
+class BlockingAlgorithm(OptimizationAlgorithm):
+    """Waits for an event before evaluating the initial guess."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        super().__init__()
+
+    def optimize(self, black_box, initial_guess=None,
+                 initial_guess_array=None):
+        self.started.set()
+        self.release.wait()
+        return test_algorithm.optimize(black_box)
+
+
+def test_variational_study_optimize_async():
+    study = VariationalStudy('study', test_ansatz, test_objective)
+    future = study.optimize_async(OptimizationParams(test_algorithm),
+                                  'run',
+                                  repetitions=2)
+    streamed = list(future.completed_results(timeout=10))
+    result = future.result(timeout=10)
+
+    assert future.done()
+    assert study.trial_results['run'] is result
+    assert [identifier for identifier, _ in streamed] == ['run', 'run']
+    assert [r for _, r in streamed] == result.results
+
+    future = study.optimize_sweep_async(
+            [OptimizationParams(test_algorithm)] * 2)
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(future)
+    finally:
+        loop.close()
+    assert len(results) == 2
+    assert len(study.trial_results) == 3
+
+    study.shutdown()
+
+
+def test_variational_study_optimize_async_cancel():
+    study = VariationalStudy('study', test_ansatz, test_objective)
+    algorithm = BlockingAlgorithm()
+    running = study.optimize_async(OptimizationParams(algorithm),
+                                   'running',
+                                   repetitions=3)
+    pending = study.optimize_async(OptimizationParams(test_algorithm),
+                                   'pending')
+    algorithm.started.wait(10)
+
+    pending.cancel()
+    running.cancel()
+    algorithm.release.set()
+
+    assert pending.cancelled()
+    assert list(pending.completed_results()) == []
+    with pytest.raises(concurrent.futures.CancelledError):
+        pending.result()
+
+    result = running.result(timeout=10)
+    assert result.results[0].status != SKIPPED
+    assert [r.status for r in result.results[1:]] == [SKIPPED, SKIPPED]
+    assert 'pending' not in study.trial_results
+
+    study.shutdown()
+
+
+def test_variational_study_save_load_npz(tmpdir):
+    datadir = str(tmpdir)
+    study = VariationalStudy('study', test_ansatz, test_objective,
+                             target=-1.0, datadir=datadir)
+    study.optimize(OptimizationParams(
+                       ScipyOptimizationAlgorithm(
+                           kwargs={'method': 'COBYLA'},
+                           options={'maxiter': 2}),
+                       initial_guess=numpy.array([7.9, 3.9]),
+                       cost_of_evaluate=1.0),
+                   'example',
+                   stateful=True,
+                   save_x_vals=True)
+    study.optimize(OptimizationParams(test_algorithm),
+                   ('tuple', 1),
+                   repetitions=3,
+                   seeds=[1, 2, 3])
+    study.save(file_format='npz')
+
+    with pytest.raises(ValueError):
+        VariationalStudy.load('study', datadir=datadir, file_format='npz')
+    with pytest.raises(ValueError):
+        study.save(file_format='yaml')
+
+    loaded_study = VariationalStudy.load('study',
+                                         datadir=datadir,
+                                         file_format='npz',
+                                         ansatz=test_ansatz,
+                                         objective=test_objective)
+    assert loaded_study.name == 'study'
+    assert loaded_study.target == -1.0
+    assert loaded_study._spawn_seeds(2) == study._spawn_seeds(2)
+    assert list(loaded_study.trial_results) == ['example', ('tuple', 1)]
+
+    result = loaded_study.trial_results['example']
+    original = study.trial_results['example']
+    assert result.optimal_value == original.optimal_value
+    assert result.params.algorithm.options == {'maxiter': 2}
+    assert result.params.cost_of_evaluate == 1.0
+    assert (len(result.results[0].function_values) ==
+            len(original.results[0].function_values))
+    numpy.testing.assert_allclose(result.results[0].function_values[-1][2],
+                                  original.results[0].function_values[-1][2])
+
+    result = loaded_study.trial_results[('tuple', 1)]
+    assert [r.seed for r in result.results] == [1, 2, 3]
+    assert isinstance(result.params.algorithm, type(test_algorithm))
+    assert str(loaded_study) == str(study)
+
+
 def test_variational_black_box_dimension():
     black_box = VariationalBlackBox(test_ansatz, test_objective)
     assert black_box.dimension == 2